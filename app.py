@@ -1,35 +1,54 @@
 import os
-import instructor
-import asyncio
 import json
-import glob
 import shutil
-from werkzeug.utils import secure_filename
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
-from openai import OpenAI
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify, Response, stream_with_context
 from dotenv import load_dotenv
 import zipfile
-from werkzeug.utils import secure_filename
 
 # --- IMPORTS FROM OUR FILES ---
-from models import IdealCandidateProfile, ATSValidationResult
-from config import CONFIG, JOB_ANALYSIS_PROMPT, WORK_EXPERIENCE_PROMPT, SKILLS_PROMPT, SUMMARY_PROMPT, ATS_PROMPT_TEXT
-from utils import create_session_directory, cleanup_old_sessions, transform_workopolis_url
-from utils import create_session_directory, cleanup_old_sessions, transform_workopolis_url, create_session_zip
+from config import CONFIG, JOB_ANALYSIS_PROMPT, WORK_EXPERIENCE_PROMPT
+from utils import create_session_directory, canonicalize_job_url, run_concurrently
 
 # Import services
 from services.job_analyzer import fetch_job_content, analyze_job_posting
 from services.resume_tailor import tailor_resume
-from services.pdf_generator import generate_pdf
+from services.pdf_generator import prepare_final_resume_data, render_pdf, render_preview_html
 from services.resume_scorer import score_resume
+from services.job_queue import get_job_queue, QueueFullError, ACTIVE_STATES
+from services.events import event_bus
+from services.metrics import registry as metrics_registry, render_metrics
+from services.session_store import get_session_store, SessionNotFoundError
+from services.bundle import session_bundle
+from services.session_sweeper import get_session_sweeper
+from services.event_loop import run_async
+from services.openai_client import get_openai_client
+from services.browser_pool import get_browser_pool
+from services.render_pool import get_render_pool
+from services.asset_cache import report_template_resources
 
 
 # --- APPLICATION SETUP ---
 load_dotenv()
-client = instructor.patch(OpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+client = get_openai_client()
 app = Flask(__name__)
 app.secret_key = os.urandom(24) 
 
+@app.errorhandler(SessionNotFoundError)
+def session_not_found(e):
+    """Malformed or missing session ids send the user back to the start."""
+    flash(f"Error: {e}")
+    return redirect(url_for('home'))
+
+@app.before_request
+def record_session_access():
+    """Feeds the sweeper's last-access index so recently used sessions are evicted last."""
+    sweeper = get_session_sweeper()
+    if sweeper is None:
+        return
+    session_id = (request.view_args or {}).get('session_id')
+    if session_id and get_session_store().exists(session_id):
+        sweeper.touch(session_id)
+
 # --- FLASK ROUTES ---
 @app.route('/')
 def home():
@@ -42,9 +61,9 @@ def generate():
     job_url = request.form.get('job_url', '').strip()
     job_description = request.form.get('job_description', '').strip()
     
-    # --- Transform Workopolis URL if necessary ---
+    # --- Canonicalize job board URLs (Workopolis search links, tracking params, ...) ---
     if job_url:
-        job_url = transform_workopolis_url(job_url)
+        job_url = canonicalize_job_url(job_url)
 
     if not (job_url or job_description):
         flash("Error: Please provide either a job URL or job description.")
@@ -52,7 +71,7 @@ def generate():
     
     # This route no longer handles resumes. It only sets up the session.
     session_id = create_session_directory(CONFIG["output_base_dir"], "job", "analysis")
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
+    session_path = get_session_store().session_path(session_id)
     
     if not session_path:
         flash("Error: Could not create session directory.")
@@ -68,7 +87,7 @@ def generate():
         return redirect(url_for('home'))
     
     try:
-        asyncio.run(fetch_job_content(source_config, session_path))
+        run_async(fetch_job_content(source_config, session_path))
         return redirect(url_for('review_joblisting', session_id=session_id))
     except Exception as e:
         flash(f"An error occurred during content scraping: {e}")
@@ -89,7 +108,7 @@ def upload_bundle():
     if file and file.filename.endswith('.zip'):
         # 1. Create a new session to extract the bundle into
         session_id = create_session_directory(CONFIG["output_base_dir"], "resumed", "session")
-        session_path = os.path.join(CONFIG["output_base_dir"], session_id)
+        session_path = get_session_store().session_path(session_id)
         
         try:
             # 2. Extract the zip file
@@ -97,17 +116,17 @@ def upload_bundle():
                 zip_ref.extractall(session_path)
             
             # 3. Determine which step to redirect to (Updated for Resume Builder)
-            extracted_files = os.listdir(session_path)
-            if 'tailored_resume_content.json' in extracted_files:
+            manifest = get_session_store().manifest(session_id)
+            if manifest.has('tailored_content'):
                 flash("✅ Session resumed at 'Review Built Resume' step.")
                 return redirect(url_for('review_tailoring', session_id=session_id))
-            elif 'ideal_candidate_profile.json' in extracted_files:
+            elif manifest.has('ideal_profile'):
                 flash("✅ Session resumed at 'Resume Builder' step.")
                 return redirect(url_for('review_jobanalysis', session_id=session_id))
-            elif 'structured_job_data.json' in extracted_files:  # Legacy support
+            elif manifest.has('legacy_analysis'):  # Legacy support
                 flash("✅ Session resumed at 'Job Analysis' step (Legacy).")
                 return redirect(url_for('review_jobanalysis', session_id=session_id))
-            elif 'job_posting.md' in extracted_files:
+            elif manifest.has('job_posting'):
                 flash("✅ Session resumed at 'Review Job Listing' step.")
                 return redirect(url_for('review_joblisting', session_id=session_id))
             else:
@@ -127,28 +146,21 @@ def upload_bundle():
 @app.route('/review/joblisting/<session_id>')
 def review_joblisting(session_id):
     """Displays the scraped markdown content for the user to review and edit."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    markdown_path = os.path.join(session_path, "job_posting.md")
-    try:
-        with open(markdown_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return render_template(
-            'review_joblisting.html', 
-            markdown_content=content, 
-            session_id=session_id, 
-            config=CONFIG, 
-            prompt=JOB_ANALYSIS_PROMPT  # Updated prompt
-        )
-    except FileNotFoundError:
+    content = get_session_store().job_posting(session_id)
+    if content is None:
         flash("Error: Could not find the scraped content. Please try again.")
         return redirect(url_for('home'))
+    return render_template(
+        'review_joblisting.html', 
+        markdown_content=content, 
+        session_id=session_id, 
+        config=CONFIG, 
+        prompt=JOB_ANALYSIS_PROMPT  # Updated prompt
+    )
 
 @app.route('/save/markdown/<session_id>', methods=['POST'])
 def save_markdown(session_id):
     """Saves the edited markdown content to the job_posting.md file."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    markdown_path = os.path.join(session_path, "job_posting.md")
-    
     try:
         edited_content = request.form.get('markdown_content', '').strip()
         
@@ -156,8 +168,7 @@ def save_markdown(session_id):
             flash("Error: Cannot save empty content.")
             return redirect(url_for('review_joblisting', session_id=session_id))
         
-        with open(markdown_path, "w", encoding="utf-8") as f:
-            f.write(edited_content)
+        get_session_store().write_text(session_id, "job_posting", edited_content)
         
         flash("✅ Changes saved successfully!")
         return redirect(url_for('review_joblisting', session_id=session_id))
@@ -174,45 +185,45 @@ def reset_markdown(session_id):
 
 @app.route('/run/analysis/<session_id>', methods=['POST'])
 def run_step2_analysis(session_id):
-    """Runs the AI job analysis (Step 2) and redirects to the next review page. UPDATED for Resume Builder."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
+    """Queues the AI job analysis (Step 2); the review page polls until it finishes. UPDATED for Resume Builder."""
+    session_path = get_session_store().session_path(session_id)
     try:
-        analyze_job_posting(session_path, client, CONFIG["openai_model"])  # Now creates ideal_candidate_profile.json
-        return redirect(url_for('review_jobanalysis', session_id=session_id))
-    except Exception as e:
-        flash(f"An error occurred during job analysis: {e}")
+        job = get_job_queue().submit(
+            session_id,
+            "analysis",
+            lambda: analyze_job_posting(session_path, client, CONFIG["openai_model"]),  # Creates ideal_candidate_profile.json
+            next_url=url_for('review_jobanalysis', session_id=session_id)
+        )
+        flash("⏳ Job analysis started...")
+        return redirect(url_for('review_joblisting', session_id=session_id, job=job.id))
+    except QueueFullError as e:
+        flash(f"Error: {e}")
         return redirect(url_for('review_joblisting', session_id=session_id))
 
 @app.route('/review/jobanalysis/<session_id>')
 def review_jobanalysis(session_id):
     """Displays the job analysis and handles user profile upload. UPDATED for Resume Builder."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    
-    # Try to load the new ideal_candidate_profile.json first, fall back to legacy
-    ideal_profile_path = os.path.join(session_path, "ideal_candidate_profile.json")
-    legacy_analysis_path = os.path.join(session_path, "structured_job_data.json")
-    markdown_path = os.path.join(session_path, "job_posting.md")
+    store = get_session_store()
     
     try:
-        # Load analysis data (prefer new format)
-        if os.path.exists(ideal_profile_path):
-            with open(ideal_profile_path, "r", encoding="utf-8") as f:
-                analysis_data = json.load(f)
-                pretty_json = json.dumps(analysis_data, indent=4)
-                # Extract keywords from the new format
-                keywords = analysis_data.get("top_technical_skills", []) + analysis_data.get("top_soft_skills", [])
-        elif os.path.exists(legacy_analysis_path):
-            with open(legacy_analysis_path, "r", encoding="utf-8") as f:
-                analysis_data = json.load(f)
-                pretty_json = json.dumps(analysis_data, indent=4)
-                keywords = analysis_data.get("keywords", [])
+        # Load analysis data (prefer new format, fall back to legacy)
+        analysis_data = store.ideal_profile(session_id)
+        if analysis_data is not None:
+            pretty_json = store.pretty_json(session_id, "ideal_profile")
+            # Extract keywords from the new format
+            keywords = analysis_data.get("top_technical_skills", []) + analysis_data.get("top_soft_skills", [])
         else:
-            flash("Error: Could not find analysis data. Please run analysis first.")
-            return redirect(url_for('review_joblisting', session_id=session_id))
+            analysis_data = store.analysis_data(session_id)
+            if analysis_data is None:
+                flash("Error: Could not find analysis data. Please run analysis first.")
+                return redirect(url_for('review_joblisting', session_id=session_id))
+            pretty_json = store.pretty_json(session_id, "legacy_analysis")
+            keywords = analysis_data.get("keywords", [])
             
         # Load markdown content
-        with open(markdown_path, "r", encoding="utf-8") as f:
-            markdown_content = f.read()
+        markdown_content = store.job_posting(session_id)
+        if markdown_content is None:
+            raise FileNotFoundError("job_posting.md")
         
         return render_template(
             'review_jobanalysis.html',
@@ -230,39 +241,55 @@ def review_jobanalysis(session_id):
 @app.route('/run/tailoring/<session_id>', methods=['POST'])
 def run_step3_tailoring(session_id):
     """Handles user profile upload and runs the Resume Builder pipeline. UPDATED for Resume Builder."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
+    session_path = get_session_store().session_path(session_id)
     user_profile_path = os.path.join(session_path, "user_profile.json")  # Changed from base_resume.json
     
     try:
-        # 1. Handle the user profile file
+        # 1. Read the user profile upload; it is only written once the job runs, so a
+        # request rejected by the queue never changes a running job's inputs
         profile_file = request.files.get('resume_file')  # Form field name stays the same for compatibility
-        if profile_file and profile_file.filename:
-            # User uploaded a new profile, save it
-            profile_file.save(user_profile_path)
-            flash("✅ New user profile uploaded and saved.")
-        elif not os.path.exists(user_profile_path):
-            # No new file uploaded AND no file exists, so copy the default
-            default_profile_src = "data/resume_assets/user_profile.json"  # Updated default location
-            if not os.path.exists(default_profile_src):
-                flash("Error: Default user profile not found on server.")
-                return redirect(url_for('review_jobanalysis', session_id=session_id))
-            shutil.copy(default_profile_src, user_profile_path)
-            flash("ℹ️ Using default user profile.")
+        profile_upload = profile_file.read() if profile_file and profile_file.filename else None
+        default_profile_src = "data/resume_assets/user_profile.json"  # Updated default location
+        if profile_upload is None and not os.path.exists(user_profile_path) and not os.path.exists(default_profile_src):
+            flash("Error: Default user profile not found on server.")
+            return redirect(url_for('review_jobanalysis', session_id=session_id))
+        use_default_profile = profile_upload is None and not os.path.exists(user_profile_path)
 
         # 2. Get the final list of keywords from the form
         final_keywords_str = request.form.get('final_keywords', '')
         keywords = [k.strip() for k in final_keywords_str.split(',') if k.strip()]
         
-        # 3. Run the Resume Builder pipeline
-        tailor_resume(
-            session_path=session_path, 
-            user_profile_path=user_profile_path,  # Updated parameter name
-            client=client, 
-            model_name=CONFIG["openai_model"], 
-            api_parameters=CONFIG["openai_parameters"],
-            keywords=keywords
+        def run_tailoring():
+            if profile_upload is not None:
+                with open(user_profile_path, "wb") as f:
+                    f.write(profile_upload)
+            elif use_default_profile:
+                shutil.copy(default_profile_src, user_profile_path)
+            tailor_resume(
+                session_path=session_path, 
+                user_profile_path=user_profile_path,  # Updated parameter name
+                client=client, 
+                model_name=CONFIG["openai_model"], 
+                api_parameters=CONFIG["openai_parameters"],
+                keywords=keywords
+            )
+
+        # 3. Queue the Resume Builder pipeline
+        job = get_job_queue().submit(
+            session_id,
+            "tailoring",
+            run_tailoring,
+            next_url=url_for('review_tailoring', session_id=session_id)
         )
-        return redirect(url_for('review_tailoring', session_id=session_id))
+        if profile_upload is not None:
+            flash("✅ New user profile uploaded and saved.")
+        elif use_default_profile:
+            flash("ℹ️ Using default user profile.")
+        flash("⏳ Resume building started...")
+        if CONFIG["tailoring_stream"]["enabled"]:
+            # Bullets are pushed to the review page as they are written
+            return redirect(url_for('review_tailoring', session_id=session_id, job=job.id))
+        return redirect(url_for('review_jobanalysis', session_id=session_id, job=job.id))
         
     except Exception as e:
         flash(f"An error occurred during resume building: {e}")
@@ -272,47 +299,39 @@ def run_step3_tailoring(session_id):
 @app.route('/review/tailoring/<session_id>')
 def review_tailoring(session_id):
     """Displays the built resume content for review. UPDATED labels for Resume Builder."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    tailored_path = os.path.join(session_path, "tailored_resume_content.json")
+    store = get_session_store()
     
-    # Try to load the ideal candidate profile, fall back to legacy job analysis
-    ideal_profile_path = os.path.join(session_path, "ideal_candidate_profile.json")
-    legacy_analysis_path = os.path.join(session_path, "structured_job_data.json")
-    
-    try:
-        with open(tailored_path, "r", encoding="utf-8") as f:
-            tailored_data = json.load(f)
-            pretty_tailored_json = json.dumps(tailored_data, indent=4)
-            
-        # Load analysis data (prefer new format)
-        if os.path.exists(ideal_profile_path):
-            with open(ideal_profile_path, "r", encoding="utf-8") as f:
-                analysis_data = json.load(f)
-        elif os.path.exists(legacy_analysis_path):
-            with open(legacy_analysis_path, "r", encoding="utf-8") as f:
-                analysis_data = json.load(f)
-        else:
-            analysis_data = {"error": "Analysis data not found"}
-            
-        pretty_job_json = json.dumps(analysis_data, indent=4)
-        
-        return render_template(
-            'review_tailoring.html',
-            tailored_content=pretty_tailored_json,
-            job_analysis_content=pretty_job_json,
-            session_id=session_id,
-            config=CONFIG
-        )
-    except FileNotFoundError:
+    # While the builder runs (including re-runs over existing content), show its draft
+    # rather than the previous finished resume; the page follows the draft as it streams
+    streaming = any(
+        job["kind"] == "tailoring" and job["state"] in ACTIVE_STATES
+        for job in get_job_queue().status(session_id)["jobs"]
+    )
+    if streaming:
+        pretty_tailored_json = store.pretty_json(session_id, "tailored_draft") or json.dumps({}, indent=4)
+    else:
+        pretty_tailored_json = store.pretty_json(session_id, "tailored_content")
+    if pretty_tailored_json is None:
         flash("Error: Could not find the built resume data.")
         return redirect(url_for('home'))
+        
+    # Load analysis data (prefer new format, fall back to legacy job analysis)
+    pretty_job_json = store.pretty_json(session_id, "ideal_profile") or store.pretty_json(session_id, "legacy_analysis")
+    if pretty_job_json is None:
+        pretty_job_json = json.dumps({"error": "Analysis data not found"}, indent=4)
+    
+    return render_template(
+        'review_tailoring.html',
+        tailored_content=pretty_tailored_json,
+        job_analysis_content=pretty_job_json,
+        session_id=session_id,
+        streaming=streaming,
+        config=CONFIG
+    )
 
 @app.route('/save/ideal_profile/<session_id>', methods=['POST'])
 def save_ideal_profile(session_id):
     """Saves the edited ideal candidate profile JSON content."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    json_path = os.path.join(session_path, "ideal_candidate_profile.json")
-    
     try:
         edited_content = request.form.get('ideal_profile_content', '').strip()
         if not edited_content:
@@ -323,8 +342,7 @@ def save_ideal_profile(session_id):
         try:
             parsed_json = json.loads(edited_content)
             # Re-serialize with indentation for clean storage
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(parsed_json, f, indent=4)
+            get_session_store().write_json(session_id, "ideal_profile", parsed_json)
             flash("✅ Ideal candidate profile saved successfully!")
         except json.JSONDecodeError:
             flash("Error: Invalid JSON format. Please correct the syntax and try again.")
@@ -343,9 +361,6 @@ def reset_ideal_profile(session_id):
 @app.route('/save/json/<session_id>', methods=['POST'])
 def save_json(session_id):
     """Saves the edited built resume JSON content."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    json_path = os.path.join(session_path, "tailored_resume_content.json")
-    
     try:
         edited_content = request.form.get('json_content', '').strip()
         if not edited_content:
@@ -356,8 +371,7 @@ def save_json(session_id):
         try:
             parsed_json = json.loads(edited_content)
             # Re-serialize with indentation for clean storage
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(parsed_json, f, indent=4)
+            get_session_store().write_json(session_id, "tailored_content", parsed_json)
             flash("✅ Changes saved successfully!")
         except json.JSONDecodeError:
             flash("Error: Invalid JSON format. Please correct the syntax and try again.")
@@ -373,48 +387,120 @@ def reset_json(session_id):
     flash("🔄 Content reset to saved version.")
     return redirect(url_for('review_tailoring', session_id=session_id))
 
+@app.route('/preview/<session_id>', methods=['POST'])
+def preview_resume(session_id):
+    """Renders the editor's unsaved JSON through the resume template as HTML; nothing is written, no PDF."""
+    if not request.is_json:
+        return Response("Expected an application/json body.", status=415, mimetype='text/plain')
+    tailored_content = request.get_json(silent=True)
+    if not isinstance(tailored_content, dict):
+        return Response("Resume content must be a JSON object.", status=400, mimetype='text/plain')
+    
+    store = get_session_store()
+    try:
+        user_profile = store.user_profile(session_id)
+    except SessionNotFoundError as e:
+        return Response(str(e), status=404, mimetype='text/plain')
+    if user_profile is None:
+        return Response("User profile not found for this session.", status=404, mimetype='text/plain')
+    
+    try:
+        html = render_preview_html(tailored_content, user_profile, store.analysis_data(session_id), CONFIG["pdf_config"])
+    except Exception as e:
+        return Response(f"Preview failed: {e}", status=422, mimetype='text/plain')
+    response = Response(html, mimetype='text/html')
+    # Rendered user content: never let it run script or load anything, even if opened directly
+    response.headers['Content-Security-Policy'] = "sandbox; default-src 'none'; style-src 'unsafe-inline'"
+    return response
+
 @app.route('/run/final_steps/<session_id>', methods=['POST'])
 def run_final_steps(session_id):
     """Generates the PDF and then runs the ATS validation score. UPDATED for Resume Builder."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
+    session_path = get_session_store().session_path(session_id)
     user_profile_path = os.path.join(session_path, "user_profile.json")  # Updated from base_resume.json
     
     if not os.path.exists(user_profile_path):
         flash("Error: User profile not found for this session.")
         return redirect(url_for('review_jobanalysis', session_id=session_id))
     
-    try:
-        # Step 4: Generate PDF
-        generate_pdf(session_path, user_profile_path, CONFIG["pdf_config"])  # Updated parameter
+    def final_steps():
+        final_resume_data = prepare_final_resume_data(session_path, user_profile_path, CONFIG["pdf_config"])
         
-        # Step 5: Run ATS Scorer
-        score_resume(session_path, client, CONFIG["openai_model"])
+        # Steps 4 & 5: Render the PDF and run the ATS scorer side by side; the scorer
+        # reads the structured resume data, so it does not wait for the PDF
+        run_concurrently(
+            lambda: render_pdf(final_resume_data, session_path, CONFIG["pdf_config"]),
+            lambda: score_resume(session_path, client, CONFIG["openai_model"], resume_data=final_resume_data)
+        )
 
-        flash("✅ Successfully generated PDF and ATS report!")
-        return redirect(url_for('review_final', session_id=session_id))
+    try:
+        job = get_job_queue().submit(
+            session_id,
+            "final_steps",
+            final_steps,
+            next_url=url_for('review_final', session_id=session_id)
+        )
+        flash("⏳ Generating PDF and ATS report...")
+        return redirect(url_for('review_tailoring', session_id=session_id, job=job.id))
         
-    except Exception as e:
-        flash(f"An error occurred during the final steps: {e}")
+    except QueueFullError as e:
+        flash(f"Error: {e}")
         return redirect(url_for('review_tailoring', session_id=session_id))
 
+@app.route('/metrics')
+def metrics():
+    """Exposes stage latency histograms, error counters and in-flight gauges for Prometheus."""
+    metrics_registry.gauge("roboresume_job_queue_pending", "Jobs waiting for a worker.").set(get_job_queue().pending_count())
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/status/<session_id>')
+def job_status(session_id):
+    """Returns the queued/running/finished pipeline jobs for a session as JSON for polling."""
+    return jsonify(get_job_queue().status(session_id))
+
+@app.route('/events/<session_id>')
+def session_events(session_id):
+    """Streams pipeline stage and job events for a session as Server-Sent Events."""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('after', '0')
+    after_id = int(last_event_id) if str(last_event_id).isdigit() else 0
+
+    def generate_events():
+        yield "retry: 2000\n\n"
+        for event in event_bus.stream(session_id, after_id=after_id):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(
+        stream_with_context(generate_events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/cancel/<session_id>', methods=['POST'])
+def cancel_job(session_id):
+    """Cancels any queued or running pipeline job for a session."""
+    cancelled = get_job_queue().cancel(session_id)
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({"session_id": session_id, "cancelled": cancelled})
+    flash("🛑 Job cancelled." if cancelled else "No job was running for this session.")
+    return redirect(request.referrer or url_for('home'))
+
 @app.route('/review/final/<session_id>')
 def review_final(session_id):
     """Displays the final ATS score and report."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    validation_path = os.path.join(session_path, "ats_validation.json")
-    
     try:
-        with open(validation_path, "r", encoding="utf-8") as f:
-            ats_result = ATSValidationResult.model_validate_json(f.read())
+        ats_result = get_session_store().ats_validation(session_id)
+        if ats_result is None:
+            flash("Error: Could not find the ATS validation report. Please try generating it again.")
+            return redirect(url_for('review_tailoring', session_id=session_id))
             
         return render_template(
             'review_final.html',
             session_id=session_id,
             ats_result=ats_result
         )
-    except FileNotFoundError:
-        flash("Error: Could not find the ATS validation report. Please try generating it again.")
-        return redirect(url_for('review_tailoring', session_id=session_id))
     except Exception as e:
         flash(f"An error occurred displaying the report: {e}")
         return redirect(url_for('home'))
@@ -422,32 +508,37 @@ def review_final(session_id):
 @app.route('/download/pdf/<session_id>')
 def download_pdf(session_id):
     """Downloads the generated PDF file."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
     try:
-        pdf_files = glob.glob(os.path.join(session_path, '*.pdf'))
-        if not pdf_files:
+        pdf_path = get_session_store().pdf_path(session_id)
+        if not pdf_path:
             flash("Error: PDF file not found for this session.")
             return redirect(url_for('home'))
-        return send_file(pdf_files[0], as_attachment=True)
+        return send_file(pdf_path, as_attachment=True)
     except Exception as e:
         flash(f"An error occurred while trying to download the file: {e}")
         return redirect(url_for('home'))
 
 @app.route('/download/bundle/<session_id>')
 def download_bundle(session_id):
-    """Creates and downloads a zip bundle of the session files."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
-    zip_name = f"{session_id}_bundle.zip"
-    zip_path = os.path.join(session_path, zip_name)
-
+    """Streams a zip bundle of the session files; unchanged sessions are served from cache."""
     try:
-        # Create the zip file using our utility function
-        created_zip_path = create_session_zip(session_path, zip_path)
-        if not created_zip_path:
+        bundle = session_bundle(session_id)
+        if bundle is None:
             flash("Error: Could not create session bundle, no files to zip.")
             return redirect(url_for('review_final', session_id=session_id))
 
-        return send_file(created_zip_path, as_attachment=True, download_name=zip_name)
+        etag, body = bundle
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+
+        return Response(
+            stream_with_context(body),
+            mimetype='application/zip',
+            headers={
+                'Content-Disposition': f'attachment; filename="{session_id}_bundle.zip"',
+                'ETag': f'"{etag}"',
+            }
+        )
     except Exception as e:
         flash(f"An error occurred while creating the bundle: {e}")
         return redirect(url_for('review_final', session_id=session_id))
@@ -455,24 +546,52 @@ def download_bundle(session_id):
 @app.route('/view/pdf/<session_id>')
 def view_pdf(session_id):
     """Serves the PDF file for iframe viewing or direct linking."""
-    session_path = os.path.join(CONFIG["output_base_dir"], session_id)
     try:
-        pdf_files = glob.glob(os.path.join(session_path, '*.pdf'))
-        if not pdf_files:
+        pdf_path = get_session_store().pdf_path(session_id)
+        if not pdf_path:
             flash("Error: PDF file not found for this session.")
             return redirect(url_for('home'))
-        return send_file(pdf_files[0], mimetype='application/pdf')
+        return send_file(pdf_path, mimetype='application/pdf')
     except Exception as e:
         flash(f"An error occurred while trying to view the file: {e}")
         return redirect(url_for('home'))
 
-# --- MAIN EXECUTION ---
-if __name__ == '__main__':
+# --- STARTUP ---
+def on_startup():
+    """One-time process setup shared by the development server and the ASGI entry point."""
     # Ensure required directories exist
     os.makedirs(CONFIG["output_base_dir"], exist_ok=True)
     os.makedirs("data/resume_assets", exist_ok=True) # Ensure resume assets dir exists
     
-    # Clean up old sessions
-    cleanup_old_sessions(CONFIG["output_base_dir"], days=30)
-    
-    app.run(debug=True)
\ No newline at end of file
+    # Clean up old sessions in the background (age and disk quotas, least recently used first)
+    sweeper = get_session_sweeper()
+    if sweeper is not None:
+        sweeper.start()
+
+    # Start the PDF render workers now so their fonts and templates are warm for the first request
+    render_pool = get_render_pool()
+    if render_pool is not None:
+        render_pool.start()
+
+    # Warn about template resources that PDF renders will have to skip
+    missing_assets = report_template_resources(CONFIG["pdf_config"])["missing"]
+    if missing_assets:
+        print(f"⚠️ {len(missing_assets)} external resource(s) are not vendored; run `python -m services.asset_cache --populate`")
+
+def on_shutdown():
+    """Closes pooled browsers, render workers and background threads before the process exits."""
+    get_browser_pool().shutdown()
+    sweeper = get_session_sweeper()
+    if sweeper is not None:
+        sweeper.stop()
+    render_pool = get_render_pool()
+    if render_pool is not None:
+        render_pool.shutdown()
+
+# --- MAIN EXECUTION ---
+if __name__ == '__main__':
+    # The debug reloader runs this module twice: a file-watching parent and the child that
+    # serves requests (WERKZEUG_RUN_MAIN set). Only the child starts the background services.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        on_startup()
+    app.run(debug=True)
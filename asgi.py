@@ -0,0 +1,36 @@
+"""
+ASGI entry point for production serving
+Run a single process (job queue, event bus and caches are in-process):
+    uvicorn asgi:application --host 0.0.0.0 --port 8000
+"""
+
+from a2wsgi import WSGIMiddleware
+
+# Local imports
+from config import CONFIG
+from app import app, on_startup, on_shutdown
+
+# Flask views run on this thread pool; scraping and OpenAI calls are multiplexed on the shared app loop.
+# That loop (services/event_loop.py) runs in its own daemon thread next to uvicorn's loop on purpose:
+# the sync Flask views hand it work from worker threads, which uvicorn's loop must never block on.
+_flask = WSGIMiddleware(app, workers=CONFIG["serving"]["http_threads"])
+
+
+async def application(scope, receive, send):
+    if scope["type"] != "lifespan":
+        await _flask(scope, receive, send)
+        return
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                on_startup()
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            on_shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
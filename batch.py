@@ -0,0 +1,221 @@
+"""
+Batch runner - tailors one user profile against many job postings
+Runs fetch -> analysis -> tailoring -> PDF -> ATS score for each posting and writes a summary CSV
+
+Usage:
+    python batch.py postings.jsonl --profile data/resume_assets/user_profile.json
+    python batch.py postings_dir/ --profile my_profile.json --workers 6
+
+Inputs are either a JSONL file with one {"url": ...} or {"text": ...} object per line
+(optional "name"), or a directory where each .md/.txt file is one posting; a file
+containing only a URL is scraped instead of used as text.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+# Local imports
+from config import CONFIG
+from utils import create_session_directory, canonicalize_job_url, run_concurrently
+from services.job_analyzer import fetch_job_content, analyze_job_posting
+from services.resume_tailor import tailor_resume
+from services.pdf_generator import prepare_final_resume_data, render_pdf
+from services.resume_scorer import score_resume
+from services.session_store import get_session_store
+from services.event_loop import run_async
+from services.openai_client import get_openai_client
+from services.render_pool import RenderPool, create_render_pool
+
+STAGES = ["fetch", "analysis", "tailoring", "prepare", "pdf", "ats_score"]
+POSTING_FILE_EXTENSIONS = (".md", ".txt")
+
+
+# ============================================================================
+# INPUTS
+# ============================================================================
+
+def load_postings(source: str) -> List[dict]:
+    """Reads postings from a JSONL file or a directory into {"name", "source_config"} dicts."""
+    postings = []
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            if not file_name.lower().endswith(POSTING_FILE_EXTENSIONS):
+                continue
+            with open(os.path.join(source, file_name), "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            if content:
+                postings.append({"name": os.path.splitext(file_name)[0], "source_config": _source_config(content)})
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry.get("url"):
+                    source_config = {"type": "url", "url": canonicalize_job_url(entry["url"].strip())}
+                elif entry.get("text"):
+                    source_config = {"type": "string", "text": entry["text"]}
+                else:
+                    raise ValueError(f"Line {line_number} of {source} has neither 'url' nor 'text'.")
+                postings.append({"name": entry.get("name") or f"posting_{line_number}", "source_config": source_config})
+    return postings
+
+
+def _source_config(content: str) -> dict:
+    if "\n" not in content and content.lower().startswith(("http://", "https://")):
+        return {"type": "url", "url": canonicalize_job_url(content)}
+    return {"type": "string", "text": content}
+
+
+# ============================================================================
+# CONCURRENCY HELPERS
+# ============================================================================
+
+class _BoundedCompletions:
+    """Forwards chat.completions.create while holding a shared semaphore slot."""
+
+    def __init__(self, completions, semaphore: threading.Semaphore):
+        self._completions = completions
+        self._semaphore = semaphore
+
+    def create(self, **kwargs):
+        with self._semaphore:
+            return self._completions.create(**kwargs)
+
+
+def bounded_client(client, max_concurrent_calls: int):
+    """
+    Wraps an instructor-patched client so at most `max_concurrent_calls` LLM requests are
+    in flight across all postings, including the parallel builder steps inside tailoring.
+    """
+    completions = _BoundedCompletions(client.chat.completions, threading.Semaphore(max(1, max_concurrent_calls)))
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def run_posting(posting: dict, profile_path: str, client, pdf_pool: RenderPool) -> dict:
+    """Runs the full pipeline for one posting and returns its summary row."""
+    row = {"name": posting["name"], "status": "ok", "error": "", "session_id": "", "match_score": ""}
+    source_config = posting["source_config"]
+    row["source"] = source_config.get("url") or "text"
+    started = time.perf_counter()
+
+    def timed(stage_name, func):
+        stage_started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            row[f"{stage_name}_s"] = round(time.perf_counter() - stage_started, 2)
+
+    try:
+        session_id = create_session_directory(CONFIG["output_base_dir"], "batch", posting["name"])
+        session_path = get_session_store().session_path(session_id)
+        row["session_id"] = session_id
+        user_profile_path = os.path.join(session_path, "user_profile.json")
+        shutil.copy(profile_path, user_profile_path)
+
+        timed("fetch", lambda: run_async(fetch_job_content(source_config, session_path)))
+        timed("analysis", lambda: analyze_job_posting(session_path, client, CONFIG["openai_model"]))
+
+        # Same default keywords the review page pre-fills from the ideal candidate profile
+        with open(os.path.join(session_path, "ideal_candidate_profile.json"), "r", encoding="utf-8") as f:
+            ideal_profile = json.load(f)
+        keywords = ideal_profile.get("top_technical_skills", []) + ideal_profile.get("top_soft_skills", [])
+
+        timed("tailoring", lambda: tailor_resume(
+            session_path=session_path,
+            user_profile_path=user_profile_path,
+            client=client,
+            model_name=CONFIG["openai_model"],
+            api_parameters=CONFIG["openai_parameters"],
+            keywords=keywords
+        ))
+        final_resume_data = timed("prepare", lambda: prepare_final_resume_data(session_path, user_profile_path, CONFIG["pdf_config"]))
+
+        # The PDF renders in a worker process while the ATS score runs here
+        run_concurrently(
+            lambda: timed("pdf", lambda: render_pdf(final_resume_data, session_path, CONFIG["pdf_config"], pool=pdf_pool)),
+            lambda: timed("ats_score", lambda: score_resume(session_path, client, CONFIG["openai_model"], resume_data=final_resume_data))
+        )
+
+        with open(os.path.join(session_path, "ats_validation.json"), "r", encoding="utf-8") as f:
+            row["match_score"] = json.load(f).get("match_score", "")
+
+    except Exception as e:
+        traceback.print_exc()
+        row["status"] = "failed"
+        row["error"] = str(e)
+
+    row["total_s"] = round(time.perf_counter() - started, 2)
+    return row
+
+
+def write_summary(rows: List[dict], summary_path: str) -> None:
+    fieldnames = ["name", "source", "session_id", "status", "match_score"] + [f"{stage_name}_s" for stage_name in STAGES] + ["total_s", "error"]
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_batch(postings: List[dict], profile_path: str, workers: int, llm_concurrency: int, pdf_processes: int, summary_path: Optional[str] = None) -> List[dict]:
+    """Runs every posting with `workers` postings in flight and returns the summary rows in input order."""
+    load_dotenv()
+    client = bounded_client(get_openai_client(), llm_concurrency)
+
+    print(f"🚀 Batch: {len(postings)} posting(s), {workers} worker(s), {llm_concurrency} concurrent LLM call(s), {pdf_processes} PDF process(es)")
+    pdf_pool = create_render_pool(processes=pdf_processes)
+    pdf_pool.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch") as executor:
+            futures = [executor.submit(run_posting, posting, profile_path, client, pdf_pool) for posting in postings]
+            rows = []
+            for posting, future in zip(postings, futures):
+                row = future.result()
+                print(f"{'✅' if row['status'] == 'ok' else '❌'} {posting['name']}: score={row['match_score'] or '-'} in {row['total_s']}s")
+                rows.append(row)
+    finally:
+        pdf_pool.shutdown()
+
+    if summary_path:
+        write_summary(rows, summary_path)
+        print(f"📊 Summary written to: {summary_path}")
+    return rows
+
+
+if __name__ == "__main__":
+    batch_config = CONFIG.get("batch", {})
+    parser = argparse.ArgumentParser(description="Tailor one user profile against many job postings.")
+    parser.add_argument("postings", help="JSONL file of {\"url\"|\"text\", \"name\"} objects, or a directory of .md/.txt postings")
+    parser.add_argument("--profile", default="data/resume_assets/user_profile.json", help="Path to user_profile.json")
+    parser.add_argument("--workers", type=int, default=batch_config.get("workers", 4), help="Postings processed at the same time")
+    parser.add_argument("--llm-concurrency", type=int, default=batch_config.get("llm_concurrency", 4), help="Max LLM requests in flight")
+    parser.add_argument("--pdf-processes", type=int, default=batch_config.get("pdf_processes", 2), help="PDF render worker processes")
+    parser.add_argument("--summary", default=None, help="Summary CSV path (default: <output_base_dir>/batch_<timestamp>.csv)")
+    args = parser.parse_args()
+
+    summary_path = args.summary or os.path.join(CONFIG["output_base_dir"], f"batch_{datetime.now().strftime('%y%m%d%H%M%S')}.csv")
+    run_batch(
+        load_postings(args.postings),
+        args.profile,
+        workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        pdf_processes=args.pdf_processes,
+        summary_path=summary_path
+    )
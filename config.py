@@ -7,10 +7,104 @@ CONFIG = {
     "pdf_config": {
         "template_path": "./data/resume_assets/resume_template.html",
         "css_path": "./data/resume_assets/resume_styles.css",
+        "write_debug_html": False,      # Also save rendered_resume.html into the session folder
+        "asset_cache_dir": "./data/resume_assets/vendor",   # Vendored fonts/assets; renders never fetch from the network
         "layout": {
             "contact_info_fields": ["location", "email", "phone_number", "linkedin_url"],
             "section_order": ["summary", "work_experience", "education", "skills"]
         }
+    },
+    "scraper": {
+        "pool_size": 2,                 # Max warm browsers kept alive across requests
+        "max_concurrency": 2,           # Max scrapes navigating at the same time
+        "max_pages_per_browser": 50,    # Recycle a browser after this many pages
+        "max_rss_mb": 1024,             # Recycle browsers when the process tree grows past this
+        "max_browser_age_minutes": 30,  # Recycle a browser once it has been running this long
+        "acquire_timeout": 60.0         # Seconds to wait for a free browser before failing
+    },
+    "scrape_cache": {
+        "enabled": True,
+        "cache_dir": "./data/cache/scrape",
+        "ttl_hours": 24,                # Re-scrape postings older than this
+        "max_entries": 500              # Least recently used postings are evicted past this
+    },
+    "llm_cache": {
+        "enabled": True,
+        "cache_dir": "./data/cache/llm",
+        "ttl_hours": None,              # Identical inputs give reusable outputs, so no expiry by default
+        "max_entries": 2000
+    },
+    "render_cache": {
+        "enabled": True,
+        "cache_dir": "./data/cache/pdf",
+        "max_entries": 500              # Least recently used PDFs are evicted past this
+    },
+    "job_queue": {
+        "workers": 2,                   # Background threads running analysis/tailoring/PDF jobs
+        "max_jobs_per_session": 1,      # Queued + running jobs allowed per session
+        "history_per_session": 10       # Finished jobs kept for /status responses
+    },
+    "ats_scoring": {
+        "mode": "llm",                  # "llm" (full LLM analysis), "local" (no network) or "hybrid" (local score + LLM summary)
+        "top_keywords": 30              # Weighted keywords extracted from the posting for local scoring
+    },
+    "incremental": {
+        "enabled": True                 # Skip pipeline steps whose input content hashes are unchanged
+    },
+    "session_store": {
+        "max_cached_artifacts": 256,    # Parsed session files kept in memory for the review pages
+        "shard_prefix_length": 2        # Sessions live in <output_base_dir>/<first N hex chars of sha256(id)>/; 0 = flat
+    },
+    "bundle_cache": {
+        "max_mb": 64                    # Finished session bundles kept in memory for repeat downloads
+    },
+    "openai_client": {
+        "requests_per_minute": 500,     # RPM quota for the account/model tier; None disables pacing
+        "tokens_per_minute": 200000,    # TPM quota; requests are charged ~prompt chars / 4 + max_tokens
+        "initial_concurrency": 8,       # Starting limit on concurrent OpenAI requests...
+        "min_concurrency": 1,           # ...halved on each 429 burst, never below this...
+        "max_concurrency": 32,          # ...and raised by ~1 per window of successes up to this
+        "max_retries": 5,               # Retries for 429/5xx/connection errors, with jittered exponential backoff
+        "backoff_base": 0.5,            # Seconds; the backoff window doubles per attempt
+        "backoff_max": 30.0,            # Cap on a single backoff (and on honoured Retry-After)
+        "max_connections": 32,          # Pooled HTTP connections to the API
+        "max_keepalive_connections": 16,
+        "keepalive_expiry": 60.0,       # Seconds an idle connection is kept open for reuse
+        "timeout": 120.0,               # Per-request read timeout in seconds
+        "connect_timeout": 10.0
+    },
+    "serving": {
+        "async_openai": True,           # Run OpenAI calls through AsyncOpenAI on the shared event loop
+        "http_threads": 64              # Request threads for the ASGI entry point (SSE streams hold one each)
+    },
+    "session_sweeper": {
+        "enabled": True,                # Delete old sessions from a background thread
+        "max_age_days": 30,             # Sessions not accessed for this long are deleted
+        "max_total_mb": 2048,           # Least recently used sessions are deleted above this total size
+        "interval_seconds": 60,         # Pause between sweeps once the tree has been scanned
+        "batch_size": 200,              # Directory entries scanned / sessions deleted per tick
+        "min_idle_minutes": 10          # Never delete sessions used more recently than this
+    },
+    "tailoring_stream": {
+        "enabled": False,               # Stream builder responses and show bullets on the review page as they arrive
+        "flush_interval_ms": 500        # Minimum gap between draft saves / "draft" events
+    },
+    "achievement_selection": {
+        "enabled": True,                # Send only the best-matching achievements per role to the work experience step
+        "top_k_per_employer": 4         # Achievements kept per role (the prompt asks the model to pick 2-3)
+    },
+    "render_pool": {
+        "enabled": True,                # Render PDFs in warm worker processes instead of the calling thread
+        "processes": 2,                 # Warm render workers kept running
+        "max_renders_per_worker": 100,  # Restart a worker after this many renders
+        "max_rss_mb": 512,              # ...or once its resident memory passes this
+        "render_timeout_seconds": 60,   # Kill and replace a worker whose render takes longer
+        "startup_timeout_seconds": 60   # Time allowed for a new worker to import and warm up
+    },
+    "batch": {
+        "workers": 4,                   # Postings processed at the same time by batch.py
+        "llm_concurrency": 4,           # Max LLM requests in flight across the whole batch
+        "pdf_processes": 2              # Worker processes rendering PDFs
     }
 }
 
@@ -69,3 +163,9 @@ ATS_PROMPT_TEXT = (
     "List the top 5-7 matching keywords and the top 5-7 most important missing keywords. "
     "Finally, provide a brief summary explaining your reasoning for the score."
 )
+
+ATS_NARRATIVE_PROMPT = (
+    "You are an advanced Applicant Tracking System (ATS). A deterministic keyword scorer has already compared the resume to the job description. "
+    "You are given the job description, the resume text, the match score, and the matching and missing keywords. "
+    "Do not change the score. Write a brief 2-3 sentence summary explaining the score and the most important gaps to address."
+)
@@ -0,0 +1,126 @@
+"""
+Artifact graph service - incremental recomputation of session artifacts
+Each pipeline step records content hashes of its inputs and output; a step whose inputs and output are unchanged is skipped
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+# Local imports
+from config import CONFIG
+
+STATE_DIR = ".pipeline"   # Hidden, so it never ends up in session bundles
+
+
+@dataclass(frozen=True)
+class Node:
+    output: str
+    inputs: Sequence[str]
+
+
+# job_posting.md -> ideal_candidate_profile.json -> tailored content -> final_resume_data -> PDF / ATS
+NODES: Dict[str, Node] = {
+    "analysis": Node("ideal_candidate_profile.json", ["job_posting.md"]),
+    "tailoring": Node("tailored_resume_content.json", ["ideal_candidate_profile.json", "job_posting.md", "user_profile.json"]),
+    "final_resume_data": Node("final_resume_data.json", ["tailored_resume_content.json", "user_profile.json", "ideal_candidate_profile.json", "structured_job_data.json"]),
+    "pdf": Node("tailored_resume.pdf", ["final_resume_data.json"]),
+    "ats": Node("ats_validation.json", ["final_resume_data.json", "job_posting.md"]),
+}
+
+
+class StepInputs:
+    """
+    Content hashes of everything a node's output depends on: its session input files,
+    any external files (e.g. the PDF template) and a JSON-serializable `params` dict
+    (model, prompts, keywords, layout...). Missing files hash to None.
+
+    The output's own hash is recorded alongside, so an output edited by hand since the
+    last build counts as stale and is rebuilt rather than silently kept.
+    """
+
+    def __init__(self, session_path: str, node: str, params: Optional[Any] = None, extra_files: Sequence[str] = ()):
+        self.session_path = session_path
+        self.node = node
+        self.hashes: Dict[str, Optional[str]] = {}
+        for file_name in NODES[node].inputs:
+            self.hashes[file_name] = _hash_file(os.path.join(session_path, file_name))
+        for path in extra_files:
+            self.hashes[os.path.abspath(path)] = _hash_file(path)
+        self.hashes["params"] = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def changed(self) -> List[str]:
+        """
+        Names of inputs that differ from the last recorded build. Empty means the output
+        is up to date; ["output"] means it was never built, has been deleted or was
+        modified after it was built.
+        """
+        if not CONFIG.get("incremental", {}).get("enabled", True):
+            return ["incremental builds disabled"]
+        output_hash = self._output_hash()
+        if output_hash is None:
+            return ["output"]
+        recorded = _load_state(self.session_path, self.node)
+        if recorded is None:
+            return ["output"]
+        current = {**self.hashes, "output": output_hash}
+        return [name for name in sorted(set(current) | set(recorded)) if current.get(name) != recorded.get(name)]
+
+    def is_up_to_date(self) -> bool:
+        return not self.changed()
+
+    def record(self) -> None:
+        """Stores these input hashes, plus the hash of the output just written, as the current build."""
+        _save_state(self.session_path, self.node, {**self.hashes, "output": self._output_hash()})
+
+    def _output_hash(self) -> Optional[str]:
+        return _hash_file(os.path.join(self.session_path, NODES[self.node].output))
+
+
+def invalidate(session_path: str, node: Optional[str] = None) -> None:
+    """Forgets recorded builds for one node (or all), forcing them to run again."""
+    for name in ([node] if node else NODES):
+        try:
+            os.remove(_state_path(session_path, name))
+        except FileNotFoundError:
+            pass
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _hash_file(path: str) -> Optional[str]:
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _state_path(session_path: str, node: str) -> str:
+    return os.path.join(session_path, STATE_DIR, f"{node}.json")
+
+
+def _load_state(session_path: str, node: str) -> Optional[Dict[str, Optional[str]]]:
+    try:
+        with open(_state_path(session_path, node), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_state(session_path: str, node: str, hashes: Dict[str, Optional[str]]) -> None:
+    # One file per node, so steps finishing side by side (even in other processes) never clash
+    path = _state_path(session_path, node)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(hashes, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,231 @@
+"""
+Asset cache service - serves external fonts/stylesheets to WeasyPrint from a vendored local copy
+Renders never touch the network; the cache is populated once with `python -m services.asset_cache --populate`
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+# Local imports
+from config import CONFIG
+
+EXTERNAL_URL_PATTERNS = [
+    re.compile(r"""(?:href|src)\s*=\s*["'](https?://[^"']+)["']""", re.IGNORECASE),
+    re.compile(r"""url\(\s*["']?(https?://[^"')\s]+)["']?\s*\)""", re.IGNORECASE),
+    re.compile(r"""@import\s+["'](https?://[^"']+)["']""", re.IGNORECASE),
+]
+CSS_URL_PATTERN = re.compile(r"""url\(\s*["']?([^"')\s]+)["']?\s*\)""", re.IGNORECASE)
+
+
+class OfflineResourceError(Exception):
+    """Raised when a render asks for an external resource that has not been vendored."""
+
+
+class AssetCache:
+    """
+    A directory of vendored external resources plus a `manifest.json` mapping each URL
+    to its file and MIME type.
+
+    `url_fetcher` is a drop-in replacement for WeasyPrint's default fetcher: local and
+    data: URLs are delegated to it, http(s) URLs are only ever served from the cache.
+    Uncached URLs raise OfflineResourceError, which WeasyPrint logs and skips, so a
+    missing font degrades to the CSS fallback instead of stalling the render.
+
+    WeasyPrint is only imported when a URL is actually fetched, so importing this module
+    (the app does at startup to report unvendored resources) does not need Pango.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.missing: set = set()
+        self._manifest: Dict[str, dict] = self._load_manifest()
+        self._contents: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def url_fetcher(self, url: str, timeout: int = 10, ssl_context=None, **kwargs) -> dict:
+        if not url.lower().startswith(("http://", "https://")):
+            from weasyprint import default_url_fetcher
+            return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context, **kwargs)
+
+        entry = self._manifest.get(url)
+        if entry is None:
+            with self._lock:
+                self.missing.add(url)
+            raise OfflineResourceError(f"{url} is not in the vendored asset cache (run `python -m services.asset_cache --populate`)")
+
+        with self._lock:
+            content = self._contents.get(url)
+        if content is None:
+            with open(os.path.join(self.cache_dir, entry["file"]), "rb") as f:
+                content = f.read()
+            with self._lock:
+                self._contents[url] = content
+
+        result = {"string": content, "mime_type": entry.get("mime_type"), "redirected_url": url}
+        if entry.get("encoding"):
+            result["encoding"] = entry["encoding"]
+        return result
+
+    def is_cached(self, url: str) -> bool:
+        return url in self._manifest
+
+    def populate(self, urls: List[str], refresh: bool = False) -> Dict[str, str]:
+        """
+        Downloads `urls` (and any url() they reference, e.g. font files inside a
+        Google Fonts stylesheet) into the cache. Returns a url -> status report.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        report: Dict[str, str] = {}
+        pending = list(urls)
+        while pending:
+            url = pending.pop(0)
+            if url in report:
+                continue
+            if self.is_cached(url) and not refresh:
+                report[url] = "cached"
+                continue
+            try:
+                content, mime_type, encoding = self._download(url)
+            except Exception as e:
+                report[url] = f"failed: {e}"
+                continue
+
+            self._store(url, content, mime_type, encoding)
+            report[url] = "downloaded"
+            if mime_type == "text/css":
+                css_text = content.decode(encoding or "utf-8", errors="replace")
+                pending.extend(
+                    urljoin(url, ref) for ref in CSS_URL_PATTERN.findall(css_text)
+                    if not ref.startswith("data:")
+                )
+
+        self._save_manifest()
+        with self._lock:
+            self.missing.difference_update(self._manifest)
+        return report
+
+    # ------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------
+
+    def _download(self, url: str):
+        from weasyprint import default_url_fetcher
+        print(f"🌐 Downloading asset: {url}")
+        result = default_url_fetcher(url, timeout=30)
+        if "string" in result:
+            content = result["string"]
+        else:
+            with result["file_obj"] as f:
+                content = f.read()
+        mime_type = result.get("mime_type") or mimetypes.guess_type(url)[0] or "application/octet-stream"
+        return content, mime_type, result.get("encoding")
+
+    def _store(self, url: str, content: bytes, mime_type: str, encoding: Optional[str]) -> None:
+        extension = mimetypes.guess_extension(mime_type) or ""
+        file_name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + extension
+        tmp_path = os.path.join(self.cache_dir, file_name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, os.path.join(self.cache_dir, file_name))
+        with self._lock:
+            self._manifest[url] = {
+                "file": file_name,
+                "mime_type": mime_type,
+                "encoding": encoding,
+                "fetched_at": time.time(),
+            }
+            self._contents.pop(url, None)
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        with self._lock:
+            manifest = dict(self._manifest)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+
+# ============================================================================
+# TEMPLATE INSPECTION
+# ============================================================================
+
+def find_external_resources(*paths: str) -> List[str]:
+    """Returns the http(s) URLs referenced by the given template/stylesheet files, in order."""
+    urls: List[str] = []
+    for path in paths:
+        if not path or not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        for pattern in EXTERNAL_URL_PATTERNS:
+            for match in pattern.findall(source):
+                url = html.unescape(match)
+                if url not in urls:
+                    urls.append(url)
+    return urls
+
+
+def report_template_resources(pdf_config: dict) -> Dict[str, List[str]]:
+    """Lists the external resources the configured template and stylesheet reference, split by cache status."""
+    cache = get_asset_cache()
+    referenced = find_external_resources(pdf_config["template_path"], pdf_config["css_path"])
+    return {
+        "referenced": referenced,
+        "cached": [url for url in referenced if cache.is_cached(url)],
+        "missing": [url for url in referenced if not cache.is_cached(url)],
+    }
+
+
+# ============================================================================
+# MODULE-LEVEL CACHE
+# ============================================================================
+
+_asset_cache: Optional[AssetCache] = None
+_asset_cache_lock = threading.Lock()
+
+
+def get_asset_cache() -> AssetCache:
+    """Returns the process-wide asset cache configured in CONFIG["pdf_config"]."""
+    global _asset_cache
+    if _asset_cache is None:
+        with _asset_cache_lock:
+            if _asset_cache is None:
+                _asset_cache = AssetCache(CONFIG["pdf_config"].get("asset_cache_dir", "./data/resume_assets/vendor"))
+    return _asset_cache
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or populate the vendored WeasyPrint asset cache.")
+    parser.add_argument("--populate", action="store_true", help="Download missing external resources into the cache")
+    parser.add_argument("--refresh", action="store_true", help="Re-download resources that are already cached")
+    args = parser.parse_args()
+
+    pdf_config = CONFIG["pdf_config"]
+    if args.populate or args.refresh:
+        referenced = find_external_resources(pdf_config["template_path"], pdf_config["css_path"])
+        for url, status in get_asset_cache().populate(referenced, refresh=args.refresh).items():
+            print(f"{'❌' if status.startswith('failed') else '✅'} {status}: {url}")
+    else:
+        report = report_template_resources(pdf_config)
+        print(f"📦 Template references {len(report['referenced'])} external resource(s)")
+        for url in report["cached"]:
+            print(f"✅ cached: {url}")
+        for url in report["missing"]:
+            print(f"⚠️ missing: {url}")
@@ -0,0 +1,249 @@
+"""
+Browser pool service - keeps warm headless browsers alive across scrape requests
+Used by job_analyzer so each scrape only pays for page navigation
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Third-party imports
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+# Local imports
+from config import CONFIG
+from services.event_loop import get_app_loop
+
+
+@dataclass
+class _PooledCrawler:
+    """A started crawler plus the bookkeeping needed to decide when to recycle it."""
+    crawler: AsyncWebCrawler
+    created_at: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+
+
+class BrowserPool:
+    """
+    A size-bounded pool of warm AsyncWebCrawler instances.
+
+    Playwright objects are bound to the event loop that created them, so the pool
+    lives on the process-wide app loop (services.event_loop). `crawl` can also be
+    awaited from any other loop and is bridged onto the app loop transparently.
+    """
+
+    def __init__(self, pool_size: int = 2, max_concurrency: int = 2, max_pages_per_browser: int = 50,
+                 max_rss_mb: Optional[int] = 1024, acquire_timeout: float = 60.0, max_age_seconds: Optional[float] = 1800):
+        self.pool_size = max(1, pool_size)
+        self.max_concurrency = max(1, min(max_concurrency, self.pool_size))
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_rss_mb = max_rss_mb
+        self.acquire_timeout = acquire_timeout
+        self.max_age_seconds = max_age_seconds
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Created lazily on the app loop
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._total = 0
+        self._closed = False
+
+    # ------------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------------
+
+    async def crawl(self, url: str, crawl_config: CrawlerRunConfig):
+        """Navigates to `url` on a pooled browser and returns the crawl4ai result."""
+        loop = self._ensure_loop()
+        if _running_loop() is loop:
+            return await self._crawl(url, crawl_config)
+        future = asyncio.run_coroutine_threadsafe(self._crawl(url, crawl_config), loop)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Returns a snapshot of pool occupancy for diagnostics."""
+        return {
+            "pool_size": self.pool_size,
+            "max_concurrency": self.max_concurrency,
+            "browsers": self._total,
+            "idle": self._idle.qsize() if self._idle else 0,
+        }
+
+    def shutdown(self) -> None:
+        """Closes every idle browser. The shared app loop itself keeps running."""
+        if not self._loop or self._closed:
+            return
+        self._closed = True
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+            future.result(timeout=30)
+        except Exception as e:
+            print(f"⚠️ Error shutting down browser pool: {e}")
+
+    # ------------------------------------------------------------------------
+    # Pool internals (always executed on the app loop)
+    # ------------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = get_app_loop().loop
+        return self._loop
+
+    def _ensure_primitives(self) -> None:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def _crawl(self, url: str, crawl_config: CrawlerRunConfig):
+        self._ensure_primitives()
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down.")
+
+        await asyncio.wait_for(self._slots.acquire(), timeout=self.acquire_timeout)
+        try:
+            pooled = await self._acquire()
+            try:
+                result = await pooled.crawler.arun(url=url, config=crawl_config)
+            except BaseException:
+                # A browser that raised or was cancelled mid-navigation is not trusted again.
+                # BaseException, so a cancelled caller can never leak a leased browser.
+                await self._discard(pooled)
+                raise
+            pooled.pages_served += 1
+            await self._release(pooled)
+            return result
+        finally:
+            self._slots.release()
+
+    async def _acquire(self) -> _PooledCrawler:
+        """Returns a healthy idle crawler, starting a new one if the pool has room."""
+        while not self._idle.empty():
+            pooled = self._idle.get_nowait()
+            if self._is_healthy(pooled):
+                return pooled
+            await self._discard(pooled)
+
+        if self._total < self.pool_size:
+            return await self._launch()
+
+        # Pool is full and every browser is leased; wait for one to come back
+        pooled = await asyncio.wait_for(self._idle.get(), timeout=self.acquire_timeout)
+        if self._is_healthy(pooled):
+            return pooled
+        await self._discard(pooled)
+        return await self._launch()
+
+    async def _release(self, pooled: _PooledCrawler) -> None:
+        if self._closed or self._should_recycle(pooled):
+            await self._discard(pooled)
+            return
+        self._idle.put_nowait(pooled)
+
+    async def _launch(self) -> _PooledCrawler:
+        self._total += 1
+        try:
+            crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+            await crawler.start()
+        except BaseException:
+            self._total -= 1
+            raise
+        print(f"🌐 Browser pool: launched browser ({self._total}/{self.pool_size})")
+        return _PooledCrawler(crawler=crawler)
+
+    async def _discard(self, pooled: _PooledCrawler) -> None:
+        self._total -= 1
+        try:
+            await pooled.crawler.close()
+        except Exception as e:
+            print(f"⚠️ Browser pool: error closing browser: {e}")
+
+    async def _drain(self) -> None:
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    # ------------------------------------------------------------------------
+    # Health and recycling checks
+    # ------------------------------------------------------------------------
+
+    def _is_healthy(self, pooled: _PooledCrawler) -> bool:
+        """A crawler is healthy if it started and its Playwright browser is still connected."""
+        crawler = pooled.crawler
+        if not getattr(crawler, "ready", False):
+            return False
+        manager = getattr(crawler.crawler_strategy, "browser_manager", None)
+        browser = getattr(manager, "browser", None)
+        if browser is None:
+            return False
+        try:
+            return browser.is_connected()
+        except Exception:
+            return False
+
+    def _should_recycle(self, pooled: _PooledCrawler) -> bool:
+        if self.max_pages_per_browser and pooled.pages_served >= self.max_pages_per_browser:
+            print(f"♻️ Browser pool: recycling browser after {pooled.pages_served} pages")
+            return True
+        if self.max_age_seconds and time.monotonic() - pooled.created_at > self.max_age_seconds:
+            print(f"♻️ Browser pool: recycling browser after {self.max_age_seconds / 60:.0f} minutes")
+            return True
+        if self.max_rss_mb and _process_tree_rss_mb() > self.max_rss_mb:
+            print(f"♻️ Browser pool: recycling browser, RSS above {self.max_rss_mb} MB")
+            return True
+        return False
+
+
+# ============================================================================
+# MODULE-LEVEL POOL
+# ============================================================================
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Returns the process-wide browser pool, creating it from CONFIG on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                scraper_config = CONFIG.get("scraper", {})
+                _pool = BrowserPool(
+                    pool_size=scraper_config.get("pool_size", 2),
+                    max_concurrency=scraper_config.get("max_concurrency", 2),
+                    max_pages_per_browser=scraper_config.get("max_pages_per_browser", 50),
+                    max_rss_mb=scraper_config.get("max_rss_mb", 1024),
+                    acquire_timeout=scraper_config.get("acquire_timeout", 60.0),
+                    max_age_seconds=scraper_config.get("max_browser_age_minutes", 30) * 60,
+                )
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _process_tree_rss_mb() -> float:
+    """Resident memory of this process plus its children (Playwright driver and Chromium)."""
+    try:
+        process = psutil.Process(os.getpid())
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / (1024 * 1024)
+    except psutil.Error:
+        return 0.0
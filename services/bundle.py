@@ -0,0 +1,144 @@
+"""
+Session bundle service - streams session .zip bundles without temp files
+Finished bundles are cached in memory by a fingerprint of the files they contain
+"""
+
+import hashlib
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Local imports
+from config import CONFIG
+from services.session_store import get_session_store, ArtifactInfo
+
+# Formats that are already compressed; deflating them again only costs CPU
+STORED_EXTENSIONS = (".pdf", ".zip", ".png", ".jpg", ".jpeg", ".woff2")
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkSink(io.RawIOBase):
+    """A write-only, non-seekable file that collects what ZipFile writes until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(files: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """
+    Yields a zip archive of `(archive name, path)` pairs as it is built. ZipFile writes
+    data descriptors when the target cannot seek, so nothing is buffered beyond one chunk.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w") as zip_file:
+        for arcname, path in files:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = zipfile.ZIP_STORED if arcname.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+            with open(path, "rb") as source, zip_file.open(info, "w") as target:
+                for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                    target.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+class BundleCache:
+    """LRU of finished bundle bytes keyed by fingerprint, bounded by total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._bundles: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._bundles.get(key)
+            if data is not None:
+                self._bundles.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._bundles:
+                return
+            self._bundles[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._bundles.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def bundle_fingerprint(session_id: str, files: List[Tuple[str, ArtifactInfo]]) -> str:
+    digest = hashlib.sha256(session_id.encode("utf-8"))
+    for file_name, info in files:
+        digest.update(f"\x00{file_name}\x00{info.size}\x00{info.mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def session_bundle(session_id: str) -> Optional[Tuple[str, Iterable[bytes]]]:
+    """
+    Returns (fingerprint, body) for a session's bundle, or None if it has no bundle files.
+    The body is the cached archive when the session is unchanged since the last download,
+    otherwise a stream that fills the cache once it completes.
+    """
+    files = get_session_store().bundle_files(session_id)
+    if not files:
+        return None
+
+    fingerprint = bundle_fingerprint(session_id, files)
+    cache = get_bundle_cache()
+    cached = cache.get(fingerprint)
+    if cached is not None:
+        return fingerprint, [cached]
+
+    def generate():
+        chunks = []
+        size = 0
+        for chunk in iter_zip((file_name, info.path) for file_name, info in files):
+            size += len(chunk)
+            if size <= cache.max_bytes:
+                chunks.append(chunk)
+            yield chunk
+        if size <= cache.max_bytes:
+            cache.put(fingerprint, b"".join(chunks))
+
+    return fingerprint, generate()
+
+
+# ============================================================================
+# MODULE-LEVEL CACHE
+# ============================================================================
+
+_bundle_cache: Optional[BundleCache] = None
+_bundle_cache_lock = threading.Lock()
+
+
+def get_bundle_cache() -> BundleCache:
+    global _bundle_cache
+    if _bundle_cache is None:
+        with _bundle_cache_lock:
+            if _bundle_cache is None:
+                _bundle_cache = BundleCache(int(CONFIG.get("bundle_cache", {}).get("max_mb", 64) * 1024 * 1024))
+    return _bundle_cache
@@ -0,0 +1,174 @@
+"""
+Disk cache service - small persistent key/value store with TTL and LRU eviction
+Shared by the scrape cache and other memoization layers
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+# Local imports
+from services.metrics import registry
+
+CACHE_REQUESTS = registry.counter("roboresume_cache_requests_total", "Cache lookups by cache (scrape, llm, pdf) and result (hit, miss).", ["cache", "result"])
+
+
+class DiskCache:
+    """
+    Stores JSON-serializable values as one file per key under `cache_dir`.
+
+    Recency is tracked through file mtimes (touched on every hit), so eviction
+    survives restarts without a separate index. Entries older than `ttl_seconds`
+    are treated as misses and removed on access.
+
+    Raw bytes (e.g. rendered PDFs) can be stored instead with `get_bytes`/`set_bytes`,
+    using an `extension` that matches the payload. Bytes entries carry no creation
+    time, so they require `ttl_seconds=None`.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 500, ttl_seconds: Optional[float] = None, name: str = "cache",
+                 extension: str = ".json"):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self._entry_count: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Builds a stable SHA-256 key from strings or JSON-serializable parts."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if not isinstance(part, str):
+                part = json.dumps(part, sort_keys=True, default=str)
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for `key`, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._record(hit=False)
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            self._record(hit=False)
+            return None
+
+        self._touch(path)
+        self._record(hit=True)
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores `value` under `key`, evicting least recently used entries if needed."""
+        self._write(key, json.dumps({"created_at": time.time(), "value": value}).encode("utf-8"))
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Returns the bytes stored under `key` with `set_bytes`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._record(hit=False)
+            return None
+        self._touch(path)
+        self._record(hit=True)
+        return data
+
+    def set_bytes(self, key: str, data: bytes) -> None:
+        """Stores raw `data` under `key`, evicting least recently used entries if needed."""
+        if self.ttl_seconds is not None:
+            raise ValueError("Bytes entries have no creation time; use a cache with ttl_seconds=None")
+        self._write(key, data)
+
+    def delete(self, key: str) -> None:
+        self._remove(self._path(key))
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for diagnostics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    # ------------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        is_new = not os.path.exists(path)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._entry_count is None:
+                self._entry_count = len(self._entry_files())
+            elif is_new:
+                self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._evict()
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path, None)  # Mark as recently used
+        except OSError:
+            pass
+
+    def _entry_files(self) -> list:
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith(self.extension)
+        ]
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until the cache fits. Caller holds the lock."""
+        entries = []
+        for path in self._entry_files():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        entries.sort()
+        overflow = len(entries) - self.max_entries
+        for _, path in entries[:max(overflow, 0)]:
+            self._remove(path)
+        self._entry_count = min(len(entries), self.max_entries)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        CACHE_REQUESTS.inc(cache=self.name, result="hit" if hit else "miss")
@@ -0,0 +1,85 @@
+"""
+Event loop service - one long-lived asyncio loop shared by the whole process
+Scraping, async OpenAI calls and async file IO all run here instead of a fresh asyncio.run per request
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class AppLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    Long-lived async resources (browser pool, AsyncOpenAI connection pool) are bound to the
+    loop that created them, so they all live on this one. Synchronous code - Flask views,
+    job queue workers, batch threads - hands coroutines to it with `run` and blocks only its
+    own thread while the loop keeps serving every other in-flight pipeline.
+    """
+
+    def __init__(self, name: str = "app-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        """Schedules `coro` on the loop and returns a concurrent.futures.Future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Runs `coro` on the loop and blocks the calling thread until it finishes."""
+        if self.in_loop_thread():
+            raise RuntimeError("AppLoop.run() would deadlock when called from the loop thread; await the coroutine instead.")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+# ============================================================================
+# MODULE-LEVEL LOOP
+# ============================================================================
+
+_app_loop: Optional[AppLoop] = None
+_app_loop_lock = threading.Lock()
+
+
+def get_app_loop() -> AppLoop:
+    """Returns the process-wide loop, starting its thread on first use."""
+    global _app_loop
+    if _app_loop is None:
+        with _app_loop_lock:
+            if _app_loop is None:
+                _app_loop = AppLoop()
+    return _app_loop
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> Any:
+    """Runs a coroutine on the shared loop from synchronous code (replaces `asyncio.run`)."""
+    return get_app_loop().run(coro, timeout=timeout)
@@ -0,0 +1,163 @@
+"""
+Event bus service - per-session pipeline progress events
+Services publish stage start/finish/error events here; app.py streams them to the browser as SSE
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Local imports
+from services.metrics import track
+
+
+class EventBus:
+    """
+    Fan-out of pipeline events per session.
+
+    Every event gets a monotonically increasing id and is kept in a bounded per-session
+    history, so a browser that connects late (or reconnects with Last-Event-ID) can
+    replay what it missed before receiving live events.
+    """
+
+    def __init__(self, history_per_session: int = 200, max_sessions: int = 500):
+        self.history_per_session = history_per_session
+        self.max_sessions = max_sessions
+        self._history: "OrderedDict[str, deque]" = OrderedDict()
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, session_id: str, event_type: str, **data) -> dict:
+        event = {"id": 0, "type": event_type, "session_id": session_id, "timestamp": time.time(), **data}
+        with self._lock:
+            event["id"] = next(self._ids)
+            history = self._history.get(session_id)
+            if history is None:
+                history = self._history[session_id] = deque(maxlen=self.history_per_session)
+                while len(self._history) > self.max_sessions:
+                    self._history.popitem(last=False)
+            else:
+                self._history.move_to_end(session_id)
+            history.append(event)
+            subscribers = list(self._subscribers.get(session_id, []))
+        for subscriber in subscribers:
+            subscriber.put(event)
+        return event
+
+    def history(self, session_id: str, after_id: int = 0) -> List[dict]:
+        with self._lock:
+            return [event for event in self._history.get(session_id, []) if event["id"] > after_id]
+
+    def stream(self, session_id: str, after_id: int = 0, heartbeat: float = 15.0) -> Iterator[Optional[dict]]:
+        """
+        Yields replayed then live events for a session. Yields None every `heartbeat`
+        seconds of silence so the caller can send a keep-alive and detect disconnects.
+        """
+        subscriber: queue.Queue = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(session_id, []).append(subscriber)
+            replay = [event for event in self._history.get(session_id, []) if event["id"] > after_id]
+        try:
+            last_id = after_id
+            for event in replay:
+                last_id = event["id"]
+                yield event
+            while True:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+                    continue
+                if event["id"] <= last_id:
+                    continue  # Already delivered during replay
+                last_id = event["id"]
+                yield event
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(session_id, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(session_id, None)
+
+
+event_bus = EventBus()
+
+
+# ============================================================================
+# PUBLISHING HELPERS FOR SERVICES
+# ============================================================================
+
+def session_id_from_path(session_path: str) -> str:
+    """Session ids are the session directory name."""
+    return os.path.basename(os.path.normpath(session_path))
+
+
+def publish(session_path: str, event_type: str, message: Optional[str] = None, **data) -> None:
+    """Publishes an event for the session at `session_path`, echoing `message` to the console."""
+    if message:
+        print(message)
+    event_bus.publish(session_id_from_path(session_path), event_type, message=message, **data)
+
+
+class StepCancelled(Exception):
+    """Raised in a concurrent step whose sibling failed (see utils.run_concurrently)."""
+
+
+_step_scope = threading.local()
+
+
+@contextmanager
+def cancel_scope(cancel_event: threading.Event):
+    """Runs the block as a step that `checkpoint` abandons once `cancel_event` is set."""
+    previous = getattr(_step_scope, "cancel_event", None)
+    _step_scope.cancel_event = cancel_event
+    try:
+        yield
+    finally:
+        _step_scope.cancel_event = previous
+
+
+def checkpoint(session_path: str) -> None:
+    """
+    Raises JobCancelled if the session's running job has been cancelled, or StepCancelled
+    if this step's concurrent sibling has failed. Called when a stage starts and before a
+    step writes its output, so abandoned work stops there without writing anything.
+    """
+    cancel_event = getattr(_step_scope, "cancel_event", None)
+    if cancel_event is not None and cancel_event.is_set():
+        raise StepCancelled()
+
+    # Imported here: the job queue itself publishes through this module
+    from services.job_queue import get_job_queue, JobCancelled
+    if get_job_queue().cancel_requested(session_id_from_path(session_path)):
+        publish(session_path, "log", "🛑 Job cancelled; stopping before the next step")
+        raise JobCancelled()
+
+
+@contextmanager
+def stage(session_path: str, name: str, label: Optional[str] = None):
+    """
+    Wraps a pipeline stage, publishing stage_start, then stage_finish with its duration,
+    or stage_error (and re-raising) if the block fails. Latency and errors are also
+    recorded in the stage metrics. A cancelled job stops before the stage starts.
+    """
+    checkpoint(session_path)
+    label = label or name
+    started = time.perf_counter()
+    publish(session_path, "stage_start", f"🔄 {label}...", stage=name, label=label)
+    try:
+        with track(name):
+            yield
+    except Exception as e:
+        duration_ms = round((time.perf_counter() - started) * 1000)
+        publish(session_path, "stage_error", f"❌ {label} failed after {duration_ms} ms", stage=name, label=label, duration_ms=duration_ms, error=str(e))
+        raise
+    duration_ms = round((time.perf_counter() - started) * 1000)
+    publish(session_path, "stage_finish", f"⏱️ {label} finished in {duration_ms} ms", stage=name, label=label, duration_ms=duration_ms)
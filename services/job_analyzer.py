@@ -6,33 +6,47 @@ Updated for Resume Builder architecture
 import os
 import json
 import asyncio
+import threading
 from typing import Dict, Any, Optional
 from openai import OpenAI
 
 # Third-party imports
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai import CrawlerRunConfig
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
 # Local imports
 from models import JobListing, IdealCandidateProfile
-from config import ANALYSIS_PROMPT_TEXT, JOB_ANALYSIS_PROMPT
+from config import CONFIG, ANALYSIS_PROMPT_TEXT, JOB_ANALYSIS_PROMPT
+from services.browser_pool import get_browser_pool
+from services.disk_cache import DiskCache
+from services.llm_cache import cached_completion
+from services.events import publish, stage, checkpoint
+from services.artifact_graph import StepInputs
+from utils import canonicalize_job_url
+
+_scrape_cache: Optional[DiskCache] = None
+_scrape_cache_lock = threading.Lock()
 
 
 async def fetch_job_content(source_config: dict, session_path: str) -> str:
     """
     Fetches job content and saves it as job_posting.md in the session folder.
-    UNCHANGED - works with both old and new architecture
+    URL sources are served from the scrape cache when the canonical URL was fetched recently.
     """
-    print("\n=== Step 1: Loading Job Posting ===")
-    content = await _get_job_content_from_source(source_config)
-    if not content:
-        raise ValueError("Failed to load job posting content.")
-    
-    output_path = os.path.join(session_path, "job_posting.md")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    with stage(session_path, "scrape", "Step 1: Loading Job Posting"):
+        # File IO goes to a worker thread so it never blocks the shared event loop
+        content = await asyncio.to_thread(_get_cached_job_content, session_path, source_config)
+        if content is None:
+            content = await _get_job_content_from_source(session_path, source_config)
+            if content:
+                await asyncio.to_thread(_store_cached_job_content, session_path, source_config, content)
+        if not content:
+            raise ValueError("Failed to load job posting content.")
+        
+        output_path = os.path.join(session_path, "job_posting.md")
+        await asyncio.to_thread(_write_text, output_path, content)
     
-    print(f"📄 Job content saved to: {output_path}")
+    publish(session_path, "log", f"📄 Job content saved to: {output_path}")
     return output_path
 
 
@@ -40,23 +54,31 @@ def analyze_job_posting(session_path: str, client: OpenAI, model_name: str) -> s
     """
     Reads job_posting.md, analyzes it, and saves the result as ideal_candidate_profile.json.
     UPDATED for Resume Builder - creates IdealCandidateProfile instead of JobListing
+    Skipped when the posting, model and prompt are unchanged since the last analysis.
     """
-    print("\n=== Step 2: Analyzing Job Posting (Resume Builder) ===")
-    markdown_path = os.path.join(session_path, "job_posting.md")
-    with open(markdown_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    with stage(session_path, "analysis", "Step 2: Analyzing Job Posting (Resume Builder)"):
+        output_path = os.path.join(session_path, "ideal_candidate_profile.json")
+        inputs = StepInputs(session_path, "analysis", {"model": model_name, "prompt": JOB_ANALYSIS_PROMPT})
+        if inputs.is_up_to_date():
+            publish(session_path, "log", "♻️ Job posting unchanged; reusing ideal_candidate_profile.json")
+            return output_path
 
-    # Create the IdealCandidateProfile using new analysis
-    ideal_profile = _run_job_analysis_for_builder(content, client, model_name)
-    if not ideal_profile:
-        raise ValueError("Failed to analyze job posting for resume builder.")
+        markdown_path = os.path.join(session_path, "job_posting.md")
+        with open(markdown_path, "r", encoding="utf-8") as f:
+            content = f.read()
 
-    # Save as ideal_candidate_profile.json
-    output_path = os.path.join(session_path, "ideal_candidate_profile.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(ideal_profile.model_dump_json(indent=4))
+        # Create the IdealCandidateProfile using new analysis
+        ideal_profile = _run_job_analysis_for_builder(session_path, content, client, model_name)
+        if not ideal_profile:
+            raise ValueError("Failed to analyze job posting for resume builder.")
+
+        # Save as ideal_candidate_profile.json
+        checkpoint(session_path)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(ideal_profile.model_dump_json(indent=4))
+        inputs.record()
     
-    print(f"🎯 Ideal candidate profile saved to: {output_path}")
+    publish(session_path, "log", f"🎯 Ideal candidate profile saved to: {output_path}")
     return output_path
 
 
@@ -65,12 +87,12 @@ def analyze_job_posting_legacy(session_path: str, client: OpenAI, model_name: st
     Legacy function - creates JobListing for backward compatibility if needed.
     Reads job_posting.md, analyzes it, and saves the result as structured_job_data.json.
     """
-    print("\n=== Step 2: Analyzing Job Posting (Legacy) ===")
+    publish(session_path, "log", "\n=== Step 2: Analyzing Job Posting (Legacy) ===")
     markdown_path = os.path.join(session_path, "job_posting.md")
     with open(markdown_path, "r", encoding="utf-8") as f:
         content = f.read()
 
-    structured_data = _run_job_analysis_legacy(content, client, model_name)
+    structured_data = _run_job_analysis_legacy(session_path, content, client, model_name)
     if not structured_data:
         raise ValueError("Failed to analyze job posting.")
 
@@ -78,7 +100,7 @@ def analyze_job_posting_legacy(session_path: str, client: OpenAI, model_name: st
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(structured_data.model_dump_json(indent=4))
     
-    print(f"📊 Job analysis saved to: {output_path}")
+    publish(session_path, "log", f"📊 Job analysis saved to: {output_path}")
     return output_path
 
 
@@ -86,7 +108,55 @@ def analyze_job_posting_legacy(session_path: str, client: OpenAI, model_name: st
 # HELPER FUNCTIONS
 # ============================================================================
 
-async def _get_job_content_from_source(source_config: dict) -> Optional[str]:
+def get_scrape_cache() -> Optional[DiskCache]:
+    """Returns the shared scrape cache, or None when caching is disabled in CONFIG."""
+    global _scrape_cache
+    cache_config = CONFIG.get("scrape_cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+    if _scrape_cache is None:
+        with _scrape_cache_lock:
+            if _scrape_cache is None:
+                ttl_hours = cache_config.get("ttl_hours")
+                _scrape_cache = DiskCache(
+                    cache_config.get("cache_dir", "./data/cache/scrape"),
+                    max_entries=cache_config.get("max_entries", 500),
+                    ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+                    name="scrape",
+                )
+    return _scrape_cache
+
+
+def _write_text(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _get_cached_job_content(session_path: str, source_config: dict) -> Optional[str]:
+    """Looks up previously scraped content for a URL source by its canonical form."""
+    cache = get_scrape_cache()
+    if cache is None or source_config.get("type") != "url" or not source_config.get("url"):
+        return None
+    canonical_url = canonicalize_job_url(source_config["url"])
+    entry = cache.get(DiskCache.make_key(canonical_url))
+    if not entry:
+        return None
+    publish(session_path, "log", f"⚡ Scrape cache hit for: {canonical_url}")
+    return entry.get("content")
+
+
+def _store_cached_job_content(session_path: str, source_config: dict, content: str) -> None:
+    cache = get_scrape_cache()
+    if cache is None or source_config.get("type") != "url" or not source_config.get("url"):
+        return
+    canonical_url = canonicalize_job_url(source_config["url"])
+    try:
+        cache.set(DiskCache.make_key(canonical_url), {"url": canonical_url, "content": content})
+    except OSError as e:
+        publish(session_path, "log", f"⚠️ Could not write scrape cache entry: {e}")
+
+
+async def _get_job_content_from_source(session_path: str, source_config: dict) -> Optional[str]:
     """
     Retrieves job content from URL or string source.
     UNCHANGED - works with both architectures
@@ -96,34 +166,29 @@ async def _get_job_content_from_source(source_config: dict) -> Optional[str]:
     if source_type == "url":
         url = source_config.get("url")
         if not url:
-            print("❌ Error: No URL provided.")
+            publish(session_path, "log", "❌ Error: No URL provided.")
             return None
-        return await _scrape_job_posting_from_url(url)
+        return await _scrape_job_posting_from_url(session_path, url)
     
     elif source_type == "string":
         text = source_config.get("text")
         if not text:
-            print("❌ Error: No text provided.")
+            publish(session_path, "log", "❌ Error: No text provided.")
             return None
         return text.strip()
     
     else:
-        print(f"❌ Error: Unsupported source type: {source_type}")
+        publish(session_path, "log", f"❌ Error: Unsupported source type: {source_type}")
         return None
 
 
-async def _scrape_job_posting_from_url(url: str) -> Optional[str]:
+async def _scrape_job_posting_from_url(session_path: str, url: str) -> Optional[str]:
     """
     Scrapes job posting content from a URL using Crawl4AI.
-    UNCHANGED - works with both architectures
+    Runs on a warm browser from the shared pool instead of launching Chromium per call.
     """
     try:
-        print(f"🌐 Scraping job posting from: {url}")
-        
-        browser_config = BrowserConfig(
-            headless=True,
-            verbose=False
-        )
+        publish(session_path, "log", f"🌐 Scraping job posting from: {url}")
         
         crawl_config = CrawlerRunConfig(
             markdown_generator=DefaultMarkdownGenerator(),
@@ -132,29 +197,29 @@ async def _scrape_job_posting_from_url(url: str) -> Optional[str]:
             remove_overlay_elements=True,
         )
         
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(url=url, config=crawl_config)
-            
-            if result.success and result.markdown:
-                print("✅ Successfully scraped job posting.")
-                return result.markdown.strip()
-            else:
-                print(f"❌ Failed to scrape content. Status: {result.status_code}")
-                return None
+        result = await get_browser_pool().crawl(url, crawl_config)
+        
+        if result.success and result.markdown:
+            publish(session_path, "log", "✅ Successfully scraped job posting.")
+            return result.markdown.strip()
+        else:
+            publish(session_path, "log", f"❌ Failed to scrape content. Status: {result.status_code}")
+            return None
                 
     except Exception as e:
-        print(f"❌ Error during scraping: {str(e)}")
+        publish(session_path, "log", f"❌ Error during scraping: {str(e)}")
         return None
 
 
-def _run_job_analysis_for_builder(content: str, client: OpenAI, model_name: str) -> Optional[IdealCandidateProfile]:
+def _run_job_analysis_for_builder(session_path: str, content: str, client: OpenAI, model_name: str) -> Optional[IdealCandidateProfile]:
     """
     NEW: Runs AI analysis to create an IdealCandidateProfile for the Resume Builder.
     """
     try:
-        print("🤖 Running AI analysis for Resume Builder...")
+        publish(session_path, "log", "🤖 Running AI analysis for Resume Builder...")
         
-        response = client.chat.completions.create(
+        response = cached_completion(
+            client,
             model=model_name,
             response_model=IdealCandidateProfile,
             messages=[
@@ -171,20 +236,20 @@ def _run_job_analysis_for_builder(content: str, client: OpenAI, model_name: str)
             temperature=0.2
         )
         
-        print("✅ Job analysis for Resume Builder completed successfully.")
+        publish(session_path, "log", "✅ Job analysis for Resume Builder completed successfully.")
         return response
         
     except Exception as e:
-        print(f"❌ Error during job analysis: {str(e)}")
+        publish(session_path, "log", f"❌ Error during job analysis: {str(e)}")
         return None
 
 
-def _run_job_analysis_legacy(content: str, client: OpenAI, model_name: str) -> Optional[JobListing]:
+def _run_job_analysis_legacy(session_path: str, content: str, client: OpenAI, model_name: str) -> Optional[JobListing]:
     """
     Legacy AI analysis - creates JobListing for backward compatibility.
     """
     try:
-        print("🤖 Running legacy AI analysis...")
+        publish(session_path, "log", "🤖 Running legacy AI analysis...")
         
         response = client.chat.completions.create(
             model=model_name,
@@ -203,9 +268,9 @@ def _run_job_analysis_legacy(content: str, client: OpenAI, model_name: str) -> O
             temperature=0.2
         )
         
-        print("✅ Legacy job analysis completed successfully.")
+        publish(session_path, "log", "✅ Legacy job analysis completed successfully.")
         return response
         
     except Exception as e:
-        print(f"❌ Error during legacy job analysis: {str(e)}")
+        publish(session_path, "log", f"❌ Error during legacy job analysis: {str(e)}")
         return None
@@ -0,0 +1,211 @@
+"""
+Job queue service - runs long pipeline steps on background worker threads
+Lets Flask routes return immediately while review pages poll for status
+"""
+
+import itertools
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Local imports
+from config import CONFIG
+from services.events import event_bus
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class QueueFullError(Exception):
+    """Raised when a session already has the maximum number of queued or running jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job at its next stage boundary once the job has been cancelled."""
+
+
+@dataclass
+class Job:
+    id: str
+    session_id: str
+    kind: str
+    func: Callable[[], None]
+    next_url: Optional[str] = None
+    state: str = QUEUED
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "kind": self.kind,
+            "state": self.state,
+            "error": self.error,
+            "next_url": self.next_url,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """
+    An in-process FIFO job queue served by a fixed number of daemon worker threads.
+
+    Each session may have at most `max_jobs_per_session` queued or running jobs.
+    Queued jobs can be cancelled outright. A running job is flagged: pipeline steps
+    cannot be interrupted mid-call, so the job stops at its next stage boundary or
+    write checkpoint (services.events.checkpoint) with JobCancelled, before any later
+    stage writes its output.
+    """
+
+    def __init__(self, workers: int = 2, max_jobs_per_session: int = 1, history_per_session: int = 10):
+        self.workers = max(1, workers)
+        self.max_jobs_per_session = max(1, max_jobs_per_session)
+        self.history_per_session = history_per_session
+
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._jobs_by_session: Dict[str, List[Job]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, session_id: str, kind: str, func: Callable[[], None], next_url: Optional[str] = None) -> Job:
+        """Enqueues `func` for `session_id`, raising QueueFullError if the session is at its cap."""
+        with self._lock:
+            jobs = self._jobs_by_session.setdefault(session_id, [])
+            active = [job for job in jobs if job.state in ACTIVE_STATES]
+            if len(active) >= self.max_jobs_per_session:
+                raise QueueFullError(f"A '{active[0].kind}' job is already in progress for this session.")
+
+            job = Job(id=f"{int(time.time())}-{next(self._ids)}", session_id=session_id, kind=kind, func=func, next_url=next_url)
+            jobs.append(job)
+            # Keep only recent history, never dropping active jobs
+            while len(jobs) > self.history_per_session and jobs[0].state not in ACTIVE_STATES:
+                jobs.pop(0)
+
+        self._ensure_workers()
+        self._queue.put(job)
+        event_bus.publish(session_id, "job", job=job.to_dict())
+        return job
+
+    def cancel(self, session_id: str) -> bool:
+        """Cancels every queued or running job for a session. Returns True if any were active."""
+        cancelled_any = False
+        with self._lock:
+            for job in self._jobs_by_session.get(session_id, []):
+                if job.state == QUEUED:
+                    job.state = CANCELLED
+                    job.finished_at = time.time()
+                    cancelled_any = True
+                    event_bus.publish(session_id, "job", job=job.to_dict())
+                elif job.state == RUNNING:
+                    job.cancel_requested = True
+                    cancelled_any = True
+        return cancelled_any
+
+    def cancel_requested(self, session_id: str) -> bool:
+        """True while a running job of this session has been asked to stop."""
+        with self._lock:
+            return any(job.state == RUNNING and job.cancel_requested for job in self._jobs_by_session.get(session_id, []))
+
+    def status(self, session_id: str) -> dict:
+        """Returns the recent jobs for a session, newest first."""
+        with self._lock:
+            jobs = [job.to_dict() for job in reversed(self._jobs_by_session.get(session_id, []))]
+        return {
+            "session_id": session_id,
+            "active": any(job["state"] in ACTIVE_STATES for job in jobs),
+            "jobs": jobs,
+        }
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    # ------------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        with self._lock:
+            if job.state == CANCELLED:
+                return
+            job.state = RUNNING
+            job.started_at = time.time()
+
+        print(f"⚙️ Job {job.id} ({job.kind}) started for session {job.session_id}")
+        event_bus.publish(job.session_id, "job", job=job.to_dict())
+        try:
+            job.func()
+            error = None
+        except JobCancelled:
+            error = None
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e)
+
+        with self._lock:
+            job.finished_at = time.time()
+            if job.cancel_requested:
+                job.state = CANCELLED
+            elif error is not None:
+                job.state = FAILED
+                job.error = error
+            else:
+                job.state = SUCCEEDED
+        print(f"⚙️ Job {job.id} ({job.kind}) {job.state} in {job.finished_at - job.started_at:.1f}s")
+        event_bus.publish(job.session_id, "job", job=job.to_dict())
+
+
+# ============================================================================
+# MODULE-LEVEL QUEUE
+# ============================================================================
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Returns the process-wide job queue, creating it from CONFIG on first use."""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                queue_config = CONFIG.get("job_queue", {})
+                _job_queue = JobQueue(
+                    workers=queue_config.get("workers", 2),
+                    max_jobs_per_session=queue_config.get("max_jobs_per_session", 1),
+                    history_per_session=queue_config.get("history_per_session", 10),
+                )
+    return _job_queue
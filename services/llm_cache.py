@@ -0,0 +1,130 @@
+"""
+LLM cache service - memoizes structured OpenAI responses by their exact inputs
+Wraps client.chat.completions.create (and streamed create_partial) for instructor response models
+"""
+
+import json
+import threading
+from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar
+
+from openai import OpenAI
+from pydantic import BaseModel, ValidationError
+
+# Local imports
+from config import CONFIG
+from services.disk_cache import DiskCache
+from services.metrics import track
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_llm_cache: Optional[DiskCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """Returns the shared LLM response cache, or None when caching is disabled in CONFIG."""
+    global _llm_cache
+    cache_config = CONFIG.get("llm_cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                ttl_hours = cache_config.get("ttl_hours")
+                _llm_cache = DiskCache(
+                    cache_config.get("cache_dir", "./data/cache/llm"),
+                    max_entries=cache_config.get("max_entries", 2000),
+                    ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+                    name="llm",
+                )
+    return _llm_cache
+
+
+def cached_completion(client: OpenAI, model: str, response_model: Type[ModelT], messages: List[dict], **api_parameters) -> ModelT:
+    """
+    Calls client.chat.completions.create unless a byte-identical request was answered before.
+
+    The key covers the model, every API parameter (temperature, max_tokens, ...), each
+    message's role and content, and the response model's JSON schema, so a prompt or
+    schema change always produces a fresh call. Only validated results are stored.
+    """
+    key, cached = _lookup(model, response_model, messages, api_parameters)
+    if cached is not None:
+        return cached
+
+    with track("llm_request"):
+        response = client.chat.completions.create(
+            model=model,
+            response_model=response_model,
+            messages=messages,
+            **api_parameters
+        )
+
+    _store(key, response)
+    return response
+
+
+def streamed_completion(client: OpenAI, model: str, response_model: Type[ModelT], messages: List[dict],
+                        on_partial: Callable[[Any], None], **api_parameters) -> ModelT:
+    """
+    Like cached_completion, but streams the response with instructor's create_partial and
+    calls `on_partial` with each partial object (fields fill in as tokens arrive). The final
+    object is validated against `response_model`; if the stream cannot be completed or
+    validated, it falls back to a regular call. Cache hits call `on_partial` once.
+    """
+    key, cached = _lookup(model, response_model, messages, api_parameters)
+    if cached is not None:
+        on_partial(cached)
+        return cached
+
+    create_partial = getattr(client.chat.completions, "create_partial", None)
+    if create_partial is None:
+        return cached_completion(client, model, response_model, messages, **api_parameters)
+
+    last = None
+    with track("llm_request"):
+        try:
+            for partial in create_partial(model=model, response_model=response_model, messages=messages, **api_parameters):
+                last = partial
+                on_partial(partial)
+            response = response_model.model_validate(last.model_dump() if last is not None else {})
+        except ValidationError as e:
+            print(f"⚠️ Streamed {response_model.__name__} did not validate ({e.error_count()} errors); retrying without streaming")
+            response = None
+
+    if response is None:
+        return cached_completion(client, model, response_model, messages, **api_parameters)
+    _store(key, response)
+    return response
+
+
+def _lookup(model: str, response_model: Type[ModelT], messages: List[dict], api_parameters: dict) -> Tuple[Optional[str], Optional[ModelT]]:
+    """Returns (cache key, cached result); the key is None when caching is disabled."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None
+    key = DiskCache.make_key(
+        model,
+        api_parameters,
+        [(message["role"], message["content"]) for message in messages],
+        json.dumps(response_model.model_json_schema(), sort_keys=True),
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        try:
+            result = response_model.model_validate(cached)
+            print(f"⚡ LLM cache hit ({response_model.__name__})")
+            return key, result
+        except ValidationError:
+            cache.delete(key)
+    return key, None
+
+
+def _store(key: Optional[str], response: BaseModel) -> None:
+    cache = get_llm_cache()
+    if cache is None or key is None:
+        return
+    try:
+        cache.set(key, response.model_dump(mode="json"))
+    except OSError as e:
+        print(f"⚠️ Could not write LLM cache entry: {e}")
@@ -0,0 +1,186 @@
+"""
+Local ATS scoring service - deterministic keyword coverage scoring without an LLM
+Extracts weighted n-gram keywords from the job posting and measures how many the resume covers
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from models import ATSValidationResult
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc every few for from
+further get had has have having he her here hers him his how i if in into is it its itself just least
+less like may me might more most must my no nor not now of off on once one only or other our ours out
+over own per please plus same shall she should so some such than that the their theirs them then there
+these they this those through to too under until up upon us very via was we were what when where which
+while who whom why will with within without would you your yours
+monday tuesday wednesday thursday friday saturday sunday
+ability able applicant applicants apply candidate candidates company etc experience
+including job jobs join looking new opportunity opportunities position preferred required requirement
+requirements responsibilities role roles strong team teams work working year years well
+e.g i.e and/or based include time month week day hour
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+SENTENCE_SPLIT = re.compile(r"(?:\n\s*[-*•]\s*|\n{2,}|(?<=[.!?;:])\s+|\n)")
+PHRASE_SPLIT = re.compile(r"[,;:()\[\]|]")
+
+
+def score_text(job_text: str, resume_text: str, top_keywords: int = 30, extra_keywords: Optional[List[str]] = None) -> ATSValidationResult:
+    """
+    Scores `resume_text` against `job_text` and returns an ATSValidationResult.
+
+    The score is the TF-IDF weighted share of the posting's top keywords that appear in
+    the resume. `extra_keywords` (e.g. skills from the ideal candidate profile) are added
+    with the weight of the strongest extracted keyword.
+    """
+    keywords = extract_keywords(job_text, top_k=top_keywords)
+    if extra_keywords:
+        top_weight = max(keywords.values(), default=1.0)
+        for keyword in extra_keywords:
+            normalized = " ".join(_tokens(keyword))
+            if normalized:
+                keywords[normalized] = max(keywords.get(normalized, 0.0), top_weight)
+
+    if not keywords:
+        return ATSValidationResult(
+            match_score=0,
+            matching_keywords=[],
+            missing_keywords=[],
+            summary="No scoreable keywords could be extracted from the job description."
+        )
+
+    terms = list(keywords.keys())
+    weights = np.array([keywords[term] for term in terms], dtype=float)
+    resume_ngrams = _ngram_set(_tokens(resume_text), max_n=3)
+    present = np.array([term in resume_ngrams for term in terms], dtype=bool)
+
+    coverage = float(weights[present].sum() / weights.sum())
+    match_score = int(round(coverage * 100))
+
+    order = np.argsort(-weights, kind="stable")
+    matching = [terms[i] for i in order if present[i]][:7]
+    missing = [terms[i] for i in order if not present[i]][:7]
+
+    return ATSValidationResult(
+        match_score=match_score,
+        matching_keywords=matching,
+        missing_keywords=missing,
+        summary=_summarize(match_score, int(present.sum()), len(terms), matching, missing)
+    )
+
+
+def extract_keywords(job_text: str, top_k: int = 30, max_n: int = 3) -> Dict[str, float]:
+    """
+    Returns the top `top_k` normalized 1-3 gram keywords of a job posting mapped to weights.
+
+    Each sentence/bullet of the posting is treated as a document, so terms repeated across
+    many bullets are rewarded by term frequency while boilerplate spread everywhere is damped
+    by IDF. Multi-word phrases get a small bonus, and n-grams overlapping a stronger
+    selected phrase (contained in it or containing it) are dropped.
+    """
+    # N-grams never cross phrase punctuation, so "decks, Excel models" is not a phrase
+    sentence_grams = [
+        [gram for phrase in PHRASE_SPLIT.split(sentence) for gram in _candidate_ngrams(_tokens(phrase), max_n)]
+        for sentence in SENTENCE_SPLIT.split(job_text or "")
+    ]
+    sentence_grams = [grams for grams in sentence_grams if grams]
+    if not sentence_grams:
+        return {}
+
+    vocabulary = sorted({gram for grams in sentence_grams for gram in grams})
+    if not vocabulary:
+        return {}
+    index = {gram: i for i, gram in enumerate(vocabulary)}
+
+    # Document-term count matrix: one row per sentence
+    counts = np.zeros((len(sentence_grams), len(vocabulary)), dtype=float)
+    for row, grams in enumerate(sentence_grams):
+        for gram, count in Counter(grams).items():
+            counts[row, index[gram]] = count
+
+    term_frequency = counts.sum(axis=0)
+    document_frequency = (counts > 0).sum(axis=0)
+    n_documents = counts.shape[0]
+    idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1.0
+    lengths = np.array([gram.count(" ") + 1 for gram in vocabulary], dtype=float)
+    scores = (1.0 + np.log(term_frequency)) * idf * (1.0 + 0.25 * (lengths - 1))
+
+    # Phrases that occur only once are usually incidental wording, not requirements
+    scores[(lengths > 1) & (term_frequency < 2)] *= 0.3
+
+    selected: List[Tuple[str, float]] = []
+    for i in np.argsort(-scores, kind="stable"):
+        gram = vocabulary[i]
+        if any(_contains(chosen, gram) or _contains(gram, chosen) for chosen, _ in selected):
+            continue
+        selected.append((gram, float(scores[i])))
+        if len(selected) >= top_k:
+            break
+    return dict(selected)
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _tokens(text: str) -> List[str]:
+    text = re.sub(r"['’]\w*", "", (text or "").lower())  # Drop contractions and possessives
+    return [_normalize_token(token) for token in TOKEN_PATTERN.findall(text)]
+
+
+def _normalize_token(token: str) -> str:
+    """Lightweight, deterministic normalization: trims punctuation and folds simple plurals."""
+    token = token.strip(".-/")
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is", "ics")):
+        return token[:-1]
+    return token
+
+
+def _candidate_ngrams(tokens: List[str], max_n: int) -> List[str]:
+    """N-grams free of stopwords, letterless tokens (e.g. "5+") and single characters."""
+    grams = []
+    for n in range(1, max_n + 1):
+        for start in range(len(tokens) - n + 1):
+            window = tokens[start:start + n]
+            if any(token in STOPWORDS or len(token) < 2 or not any(c.isalpha() for c in token) for token in window):
+                continue
+            grams.append(" ".join(window))
+    return grams
+
+
+def _ngram_set(tokens: List[str], max_n: int) -> set:
+    return {
+        " ".join(tokens[start:start + n])
+        for n in range(1, max_n + 1)
+        for start in range(len(tokens) - n + 1)
+    }
+
+
+def _contains(phrase: str, gram: str) -> bool:
+    return f" {gram} " in f" {phrase} "
+
+
+def _summarize(match_score: int, matched: int, total: int, matching: List[str], missing: List[str]) -> str:
+    if match_score >= 75:
+        verdict = "The resume is a strong keyword match for this posting."
+    elif match_score >= 50:
+        verdict = "The resume covers many of the posting's key terms but has notable gaps."
+    else:
+        verdict = "The resume misses many of the posting's most heavily weighted terms."
+    details = f" It covers {matched} of {total} weighted keywords"
+    if matching:
+        details += f", including {', '.join(matching[:3])}"
+    details += "."
+    if missing:
+        details += f" Consider addressing: {', '.join(missing[:3])}."
+    return verdict + details
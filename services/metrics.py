@@ -0,0 +1,210 @@
+"""
+Metrics service - in-process latency histograms, error counters and in-flight gauges
+Rendered in the Prometheus text exposition format by the /metrics route
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from template renders (ms) up to slow LLM calls (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(label, "")) for label in self.label_names)
+
+    def _format_labels(self, values: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.label_names, values)) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)} {_format_number(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            bucket_counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[i] += 1
+            self._values[key] = (bucket_counts, total + value, count + 1)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(buckets), total, count)) for key, (buckets, total, count) in self._values.items())
+        lines = []
+        for key, (bucket_counts, total, count) in values:
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{self.name}_bucket{self._format_labels(key, [('le', _format_number(upper_bound))])} {bucket_count}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds named metrics; asking for an existing name returns the same metric."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, label_names)
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, metric_class, name: str, help_text: str, label_names: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help_text, label_names, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} is already registered as a {metric.metric_type}")
+            return metric
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ============================================================================
+# INSTRUMENTATION API FOR SERVICES
+# ============================================================================
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram("roboresume_stage_duration_seconds", "Latency of pipeline stages and render/scoring steps.", ["stage"])
+STAGE_ERRORS = registry.counter("roboresume_stage_errors_total", "Stages that raised an exception.", ["stage"])
+STAGE_IN_FLIGHT = registry.gauge("roboresume_stage_in_flight", "Stages currently running.", ["stage"])
+
+
+_capture = threading.local()
+
+
+@contextmanager
+def track(stage_name: str):
+    """
+    Times a block as `stage_name`: counts it as in flight while it runs, records its
+    latency when it ends (successfully or not) and counts an error if it raises.
+    """
+    STAGE_IN_FLIGHT.inc(stage=stage_name)
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        STAGE_ERRORS.inc(stage=stage_name)
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        STAGE_DURATION.observe(seconds, stage=stage_name)
+        STAGE_IN_FLIGHT.dec(stage=stage_name)
+        timings = getattr(_capture, "timings", None)
+        if timings is not None:
+            timings.append((stage_name, seconds, failed))
+
+
+def observe(stage_name: str, seconds: float) -> None:
+    """Records an externally measured duration for `stage_name`."""
+    STAGE_DURATION.observe(seconds, stage=stage_name)
+
+
+@contextmanager
+def capture_timings():
+    """
+    Also collects (stage, seconds, failed) for every `track` block run by this thread
+    inside the `with`, so a worker process can send them back to be recorded by the
+    parent's registry with `record_timings`.
+    """
+    previous = getattr(_capture, "timings", None)
+    timings: List[Tuple[str, float, bool]] = []
+    _capture.timings = timings
+    try:
+        yield timings
+    finally:
+        _capture.timings = previous
+
+
+def record_timings(timings: Sequence[Tuple[str, float, bool]]) -> None:
+    """Records timings captured elsewhere (see `capture_timings`) in this process's registry."""
+    for stage_name, seconds, failed in timings:
+        STAGE_DURATION.observe(seconds, stage=stage_name)
+        if failed:
+            STAGE_ERRORS.inc(stage=stage_name)
+
+
+def render_metrics() -> str:
+    """Renders every registered metric in the Prometheus text exposition format, for /metrics."""
+    return registry.render()
@@ -0,0 +1,348 @@
+"""
+OpenAI client service - the instructor-patched client shared by every pipeline step
+Pooled keep-alive connections, RPM/TPM pacing, AIMD concurrency and jittered retries for all OpenAI traffic
+In async mode requests run through AsyncOpenAI on the shared event loop, behind the usual sync interface
+"""
+
+import asyncio
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Optional
+
+# Third-party imports
+import httpx
+import instructor
+from openai import AsyncOpenAI, OpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient
+
+# Local imports
+from config import CONFIG
+from services.event_loop import get_app_loop
+from services.rate_limiter import RateLimiter, backoff_delay, OK, THROTTLED, ERROR
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_COMPLETION_TOKENS = 1024   # Assumed output size when a request sets no max_tokens
+
+
+class _LoopBoundCompletions:
+    def __init__(self, async_completions):
+        self._async_completions = async_completions
+
+    def create(self, **kwargs) -> Any:
+        return get_app_loop().run(self._async_completions.create(**kwargs))
+
+    def create_partial(self, **kwargs) -> Iterator[Any]:
+        """Yields instructor partial objects as the streamed response arrives."""
+        return _iterate_on_loop(self._async_completions.create_partial(**kwargs))
+
+
+class _LoopBoundChat:
+    def __init__(self, async_chat):
+        self.completions = _LoopBoundCompletions(async_chat.completions)
+
+
+class LoopBoundClient:
+    """
+    Exposes an async instructor client through the synchronous `chat.completions.create`
+    interface the services use. Each call is scheduled on the shared app loop, so all
+    in-flight pipelines share one AsyncOpenAI connection pool and the calling worker
+    thread only waits for its own result. Async code can use `async_client` directly.
+    """
+
+    def __init__(self, async_client):
+        self.async_client = async_client
+        self.chat = _LoopBoundChat(async_client.chat)
+
+
+def _iterate_on_loop(async_iterator: AsyncIterator[Any]) -> Iterator[Any]:
+    """Drives an async iterator on the app loop and hands its items to the calling thread."""
+    items: "queue.Queue" = queue.Queue()
+    finished = object()
+
+    async def pump():
+        try:
+            async for item in async_iterator:
+                items.put((item, None))
+        except Exception as e:
+            items.put((finished, e))
+            return
+        items.put((finished, None))
+
+    future = get_app_loop().submit(pump())
+    try:
+        while True:
+            item, error = items.get()
+            if item is finished:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        future.cancel()   # The consumer stopped early; stop reading the stream
+
+
+# ============================================================================
+# RATE-LIMITED HTTP TRANSPORTS
+# ============================================================================
+
+class _RetryPolicy:
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        return backoff_delay(attempt, self.backoff_base, self.backoff_max, _retry_after(response))
+
+
+class _ReleasingAsyncStream(httpx.AsyncByteStream):
+    """Response body that hands its limiter slot back (once) when the stream is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                await release()
+
+
+class _ReleasingSyncStream(httpx.SyncByteStream):
+    """The same for the synchronous client."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class RateLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pooled transport so every HTTP request to OpenAI passes the shared rate
+    limiter, and 429/5xx responses or connection errors are retried with jittered backoff.
+    The OpenAI SDK's own retries are disabled so a request is never retried twice over.
+    """
+
+    def __init__(self, limiter: RateLimiter, transport: httpx.AsyncBaseTransport, retry: _RetryPolicy):
+        self.limiter = limiter
+        self.transport = transport
+        self.retry = retry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        estimated_tokens = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(estimated_tokens)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                await self.limiter.release(ERROR)
+                if attempt >= self.retry.max_retries:
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            outcome = _outcome(response)
+            if outcome == OK or attempt >= self.retry.max_retries:
+                # The slot stays taken until the body is read; streamed completions hold
+                # the connection long after the headers arrive
+                release = functools.partial(self.limiter.release, outcome, *_remaining_quota(response))
+                if response.is_closed:
+                    await release()
+                else:
+                    response.stream = _ReleasingAsyncStream(response.stream, release)
+                return response
+            await self.limiter.release(outcome, *_remaining_quota(response))
+            delay = self.retry.delay(attempt, response)
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RateLimitedSyncTransport(httpx.BaseTransport):
+    """The same policy for the synchronous client; limiter bookkeeping still runs on the app loop."""
+
+    def __init__(self, limiter: RateLimiter, transport: httpx.BaseTransport, retry: _RetryPolicy):
+        self.limiter = limiter
+        self.transport = transport
+        self.retry = retry
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        loop = get_app_loop()
+        estimated_tokens = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            loop.run(self.limiter.acquire(estimated_tokens))
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                loop.run(self.limiter.release(ERROR))
+                if attempt >= self.retry.max_retries:
+                    raise
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+                continue
+
+            outcome = _outcome(response)
+            if outcome == OK or attempt >= self.retry.max_retries:
+                release = functools.partial(self.limiter.release, outcome, *_remaining_quota(response))
+                if response.is_closed:
+                    loop.run(release())
+                else:
+                    response.stream = _ReleasingSyncStream(response.stream, lambda: loop.run(release()))
+                return response
+            loop.run(self.limiter.release(outcome, *_remaining_quota(response)))
+            delay = self.retry.delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+def estimate_request_tokens(request: httpx.Request) -> float:
+    """Rough token cost of a chat completion request: ~4 characters per prompt token plus max_tokens."""
+    try:
+        body = json.loads(request.content or b"{}")
+    except (ValueError, httpx.RequestNotRead):
+        return DEFAULT_COMPLETION_TOKENS
+    prompt_chars = 0
+    for message in body.get("messages", []):
+        content = message.get("content")
+        prompt_chars += len(content) if isinstance(content, str) else len(json.dumps(content))
+    for schema_key in ("tools", "functions", "response_format"):
+        if body.get(schema_key):
+            prompt_chars += len(json.dumps(body[schema_key]))
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens") or DEFAULT_COMPLETION_TOKENS
+    return prompt_chars / 4 + max_tokens
+
+
+def _outcome(response: httpx.Response) -> str:
+    if response.status_code == 429:
+        return THROTTLED
+    if response.status_code in RETRYABLE_STATUS_CODES:
+        return ERROR
+    return OK
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    if response is None:
+        return None
+    try:
+        if "retry-after-ms" in response.headers:
+            return float(response.headers["retry-after-ms"]) / 1000
+        if "retry-after" in response.headers:
+            return float(response.headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+def _remaining_quota(response: httpx.Response):
+    """The x-ratelimit-remaining-requests/-tokens headers OpenAI sends back, when present."""
+    values = []
+    for header in ("x-ratelimit-remaining-requests", "x-ratelimit-remaining-tokens"):
+        try:
+            values.append(float(response.headers[header]))
+        except (KeyError, ValueError):
+            values.append(None)
+    return values
+
+
+# ============================================================================
+# CLIENT FACTORY
+# ============================================================================
+
+def create_openai_client(api_key: Optional[str] = None, async_mode: Optional[bool] = None, limiter: Optional[RateLimiter] = None):
+    """
+    Builds an instructor-patched client over a keep-alive connection pool and the shared
+    rate limiter. `async_mode` defaults to CONFIG["serving"]["async_openai"].
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if async_mode is None:
+        async_mode = CONFIG.get("serving", {}).get("async_openai", True)
+    client_config = CONFIG.get("openai_client", {})
+    limiter = limiter or get_rate_limiter()
+    retry = _RetryPolicy(
+        max_retries=client_config.get("max_retries", 5),
+        backoff_base=client_config.get("backoff_base", 0.5),
+        backoff_max=client_config.get("backoff_max", 30.0),
+    )
+    limits = httpx.Limits(
+        max_connections=client_config.get("max_connections", 32),
+        max_keepalive_connections=client_config.get("max_keepalive_connections", 16),
+        keepalive_expiry=client_config.get("keepalive_expiry", 60.0),
+    )
+    timeout = httpx.Timeout(client_config.get("timeout", 120.0), connect=client_config.get("connect_timeout", 10.0))
+
+    if async_mode:
+        transport = RateLimitedAsyncTransport(limiter, httpx.AsyncHTTPTransport(limits=limits, http2=False), retry)
+        http_client = DefaultAsyncHttpxClient(transport=transport, timeout=timeout)
+        return LoopBoundClient(instructor.from_openai(AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)))
+
+    transport = RateLimitedSyncTransport(limiter, httpx.HTTPTransport(limits=limits), retry)
+    http_client = DefaultHttpxClient(transport=transport, timeout=timeout)
+    return instructor.from_openai(OpenAI(api_key=api_key, http_client=http_client, max_retries=0))
+
+
+# ============================================================================
+# MODULE-LEVEL CLIENT
+# ============================================================================
+
+_rate_limiter: Optional[RateLimiter] = None
+_openai_client = None
+_openai_client_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide limiter sized to CONFIG["openai_client"] quotas."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _openai_client_lock:
+            if _rate_limiter is None:
+                client_config = CONFIG.get("openai_client", {})
+                _rate_limiter = RateLimiter(
+                    requests_per_minute=client_config.get("requests_per_minute"),
+                    tokens_per_minute=client_config.get("tokens_per_minute"),
+                    initial_concurrency=client_config.get("initial_concurrency", 8),
+                    min_concurrency=client_config.get("min_concurrency", 1),
+                    max_concurrency=client_config.get("max_concurrency", 32),
+                )
+    return _rate_limiter
+
+
+def get_openai_client():
+    """Returns the process-wide client, created on first use (after .env has been loaded)."""
+    global _openai_client
+    if _openai_client is None:
+        limiter = get_rate_limiter()
+        with _openai_client_lock:
+            if _openai_client is None:
+                _openai_client = create_openai_client(limiter=limiter)
+    return _openai_client
@@ -5,12 +5,16 @@ UPDATED for Resume Builder architecture compatibility
 
 import os
 import json
+import threading
 from typing import Dict, Any, Optional
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML as WeasyHTML, CSS as WeasyCSS
 
 # Local imports
 from models import JobListing, TailoredResumeContent, IdealCandidateProfile
+from services.events import publish, stage, checkpoint
+from services.render_engine import get_render_engine
+from services.artifact_graph import StepInputs
+from services.render_pool import RenderPool, get_render_pool
+from services.render_cache import get_render_cache
 
 
 def generate_pdf(session_path: str, user_profile_path: str, pdf_config: dict) -> str:
@@ -18,8 +22,22 @@ def generate_pdf(session_path: str, user_profile_path: str, pdf_config: dict) ->
     Reads all intermediate files and generates the final PDF.
     UPDATED for Resume Builder architecture - now works with both new and legacy formats.
     """
-    print("\n=== Step 4: Generating PDF ===")
-    
+    final_resume_data = prepare_final_resume_data(session_path, user_profile_path, pdf_config)
+    return render_pdf(final_resume_data, session_path, pdf_config)
+
+
+def prepare_final_resume_data(session_path: str, user_profile_path: str, pdf_config: dict) -> dict:
+    """
+    Assembles final_resume_data.json from the tailored content, user profile and job analysis.
+    This is everything the PDF and the ATS scorer need, so both can start from its result.
+    The saved file is reused when the tailored content, profile and layout are unchanged.
+    """
+    final_resume_path = os.path.join(session_path, "final_resume_data.json")
+    inputs = StepInputs(session_path, "final_resume_data", {"pdf_config": pdf_config}, extra_files=[user_profile_path])
+    if inputs.is_up_to_date():
+        with open(final_resume_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
     # Load the tailored resume content (this file name stays the same)
     tailored_content_path = os.path.join(session_path, "tailored_resume_content.json")
     with open(tailored_content_path, "r", encoding="utf-8") as f:
@@ -36,17 +54,73 @@ def generate_pdf(session_path: str, user_profile_path: str, pdf_config: dict) ->
     final_resume_data = _assemble_final_resume_builder(user_profile, tailored_content_data, job_data, pdf_config)
     
     # Save final resume data
-    final_resume_path = os.path.join(session_path, "final_resume_data.json")
+    checkpoint(session_path)
     with open(final_resume_path, "w", encoding="utf-8") as f:
         json.dump(final_resume_data, f, indent=4)
+    inputs.record()
     
-    # Generate PDF
-    pdf_output_path = _create_pdf_from_data(final_resume_data, session_path, pdf_config)
+    return final_resume_data
+
+
+def render_pdf(final_resume_data: dict, session_path: str, pdf_config: dict, pool: Optional[RenderPool] = None) -> str:
+    """
+    Renders already assembled resume data to tailored_resume.pdf in the session folder.
+    Skipped when the data, template, stylesheet and PDF settings match the existing PDF,
+    and copied from the render cache when any session rendered identical inputs before.
+    Otherwise the render runs in a warm worker of `pool` (default: the shared render
+    pool, unless disabled in CONFIG) so WeasyPrint never holds the GIL of this process.
+    """
+    pool = pool or get_render_pool()
+    pdf_output_path = os.path.join(session_path, "tailored_resume.pdf")
+    with stage(session_path, "pdf_render", "Step 4: Generating PDF"):
+        inputs = StepInputs(
+            session_path, "pdf",
+            {"pdf_config": pdf_config, "resume": final_resume_data},
+            extra_files=[pdf_config["template_path"], pdf_config["css_path"]]
+        )
+        if inputs.is_up_to_date():
+            publish(session_path, "log", f"♻️ Resume unchanged; reusing {pdf_output_path}")
+            return pdf_output_path
+
+        cache = get_render_cache()
+        cache_key = cache.render_key(final_resume_data, pdf_config) if cache else None
+        checkpoint(session_path)
+        if cache and cache.copy_to(cache_key, pdf_output_path):
+            inputs.record()
+            publish(session_path, "log", f"♻️ Identical resume rendered before; copied cached PDF to {pdf_output_path}")
+            return pdf_output_path
+
+        # Rendered to a temporary file and moved into place, so a killed or abandoned
+        # render never leaves a truncated tailored_resume.pdf behind
+        tmp_path = f"{pdf_output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if pool is not None:
+                pool.render(final_resume_data, session_path, pdf_config, tmp_path)
+            else:
+                _create_pdf_from_data(final_resume_data, session_path, pdf_config, tmp_path)
+            checkpoint(session_path)
+            os.replace(tmp_path, pdf_output_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if cache:
+            cache.store(cache_key, pdf_output_path)
+        inputs.record()
     
-    print(f"📄 PDF generated successfully: {pdf_output_path}")
+    publish(session_path, "log", f"📄 PDF generated successfully: {pdf_output_path}")
     return pdf_output_path
 
 
+def render_preview_html(tailored_content: dict, user_profile: dict, analysis_data: Optional[dict], pdf_config: dict) -> str:
+    """
+    Renders the resume template as standalone HTML straight from in-memory data, for the
+    live preview. Nothing is written and no PDF is laid out, so this takes milliseconds.
+    """
+    job_data = _job_data_from_analysis(analysis_data)
+    resume_data = _assemble_final_resume_builder(user_profile, tailored_content, job_data, pdf_config)
+    return get_render_engine().render_standalone_html(resume_data, pdf_config)
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -58,36 +132,46 @@ def _load_job_analysis_data(session_path: str) -> dict:
     # Try new Resume Builder format first
     ideal_profile_path = os.path.join(session_path, "ideal_candidate_profile.json")
     if os.path.exists(ideal_profile_path):
-        print("📊 Loading job analysis from ideal_candidate_profile.json (Resume Builder format)")
+        publish(session_path, "log", "📊 Loading job analysis from ideal_candidate_profile.json (Resume Builder format)")
         with open(ideal_profile_path, "r", encoding="utf-8") as f:
-            ideal_profile = json.load(f)
-        
-        # Convert to a format compatible with PDF generation
-        return {
-            "company_name": "Target Company",  # Default since new format doesn't store this
-            "position_title": "Target Position",  # Default since new format doesn't store this
-            "experience_summary": ideal_profile.get("experience_summary", ""),
-            "top_technical_skills": ideal_profile.get("top_technical_skills", []),
-            "top_soft_skills": ideal_profile.get("top_soft_skills", []),
-            "format": "ideal_candidate_profile"
-        }
+            return _job_data_from_analysis(json.load(f))
     
     # Fall back to legacy format
     legacy_path = os.path.join(session_path, "structured_job_data.json")
     if os.path.exists(legacy_path):
-        print("📊 Loading job analysis from structured_job_data.json (Legacy format)")
+        publish(session_path, "log", "📊 Loading job analysis from structured_job_data.json (Legacy format)")
         with open(legacy_path, "r", encoding="utf-8") as f:
-            legacy_data = json.load(f)
-        legacy_data["format"] = "legacy"
-        return legacy_data
+            return _job_data_from_analysis(json.load(f))
     
     # If neither exists, return minimal data
-    print("⚠️ No job analysis data found, using minimal defaults")
-    return {
-        "company_name": "Target Company",
-        "position_title": "Target Position", 
-        "format": "none"
-    }
+    publish(session_path, "log", "⚠️ No job analysis data found, using minimal defaults")
+    return _job_data_from_analysis(None)
+
+
+def _job_data_from_analysis(analysis_data: Optional[dict]) -> dict:
+    """
+    Converts an ideal candidate profile or legacy structured job data into the job data
+    used for PDF generation. None gives minimal defaults.
+    """
+    if analysis_data is None:
+        return {
+            "company_name": "Target Company",
+            "position_title": "Target Position", 
+            "format": "none"
+        }
+    
+    if "top_technical_skills" in analysis_data:
+        # Convert to a format compatible with PDF generation
+        return {
+            "company_name": "Target Company",  # Default since new format doesn't store this
+            "position_title": "Target Position",  # Default since new format doesn't store this
+            "experience_summary": analysis_data.get("experience_summary", ""),
+            "top_technical_skills": analysis_data.get("top_technical_skills", []),
+            "top_soft_skills": analysis_data.get("top_soft_skills", []),
+            "format": "ideal_candidate_profile"
+        }
+    
+    return {**analysis_data, "format": "legacy"}
 
 
 def _assemble_final_resume_builder(user_profile: dict, tailored_content: dict, job_data: dict, pdf_config: dict) -> dict:
@@ -148,41 +232,30 @@ def _assemble_final_resume_legacy(base_resume: dict, tailored_content: TailoredR
     return final_resume
 
 
-def _create_pdf_from_data(resume_data: dict, session_path: str, pdf_config: dict) -> str:
+def _create_pdf_from_data(resume_data: dict, session_path: str, pdf_config: dict, pdf_output_path: str) -> str:
     """
-    Creates PDF from resume data using HTML template.
-    UNCHANGED - works with both architectures.
+    Creates PDF from resume data using HTML template, writing it to `pdf_output_path`.
+    Uses the shared render engine, so the template and stylesheet are compiled/parsed once.
     """
     try:
-        # Setup Jinja2 environment
-        template_dir = os.path.dirname(pdf_config["template_path"])
-        template_name = os.path.basename(pdf_config["template_path"])
-        
-        env = Environment(loader=FileSystemLoader(template_dir))
-        template = env.get_template(template_name)
+        engine = get_render_engine()
         
-        # Render HTML
-        html_content = template.render(resume=resume_data, pdf_config=pdf_config)
+        # Render HTML (the stylesheet is supplied pre-parsed, not via <link>)
+        html_content = engine.render_html(resume_data, pdf_config)
         
-        # Save rendered HTML for debugging
-        html_output_path = os.path.join(session_path, "rendered_resume.html")
-        with open(html_output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Save rendered HTML for debugging, only when asked for
+        if pdf_config.get("write_debug_html"):
+            html_output_path = os.path.join(session_path, "rendered_resume.html")
+            with open(html_output_path, "w", encoding="utf-8") as f:
+                f.write(engine.render_html(resume_data, pdf_config, link_stylesheet=True))
         
         # Generate PDF
-        pdf_output_path = os.path.join(session_path, "tailored_resume.pdf")
-        
-        html_doc = WeasyHTML(string=html_content, base_url=template_dir)
-        css_doc = WeasyCSS(filename=pdf_config["css_path"])
-        
-        html_doc.write_pdf(pdf_output_path, stylesheets=[css_doc])
+        engine.write_pdf(html_content, pdf_config, pdf_output_path)
         
-        print(f"✅ PDF created successfully: {pdf_output_path}")
         return pdf_output_path
         
     except Exception as e:
-        error_msg = f"❌ Error creating PDF: {str(e)}"
-        print(error_msg)
-        raise ValueError(error_msg)
+        # May run in a render worker, which has no event subscribers; the calling stage publishes the error
+        raise ValueError(f"❌ Error creating PDF: {str(e)}")
 
 
@@ -0,0 +1,129 @@
+"""
+Rate limiter service - keeps OpenAI traffic inside our RPM/TPM quotas
+Token buckets pace requests and tokens; AIMD concurrency backs off on 429s and creeps back up on success
+"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+# Local imports
+from services.metrics import registry
+
+LLM_CONCURRENCY_LIMIT = registry.gauge("roboresume_llm_concurrency_limit", "Current adaptive limit on concurrent OpenAI requests.")
+LLM_RESPONSES = registry.counter("roboresume_llm_responses_total", "OpenAI HTTP requests by outcome (ok, throttled, error).", ["outcome"])
+
+OK = "ok"
+THROTTLED = "throttled"
+ERROR = "error"
+
+
+class TokenBucket:
+    """
+    Refills continuously at `rate_per_minute`, holding at most one minute's worth, which
+    mirrors how OpenAI meters RPM/TPM. `take` waits until enough tokens are available.
+    Must only be used from one event loop.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.rate_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    async def take(self, amount: float) -> None:
+        amount = min(amount, self.capacity)   # An oversized request still goes through, at full-bucket cost
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate_per_second)
+
+    def sync_remaining(self, remaining: float) -> None:
+        """Adopts the server's view of the remaining quota when it is lower than ours."""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """
+    Process-wide admission control for OpenAI requests, living on the shared app loop.
+
+    A request first takes one token from the request bucket and its estimated token count
+    from the token bucket, then waits for a concurrency slot. The concurrency limit follows
+    AIMD: each successful response adds 1/limit (about +1 per full window), a 429 halves
+    it (at most once per `cooldown_seconds`, so one burst of 429s counts once).
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 initial_concurrency: int = 8, min_concurrency: int = 1, max_concurrency: int = 32,
+                 decrease_factor: float = 0.5, cooldown_seconds: float = 5.0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._slot_freed: Optional[asyncio.Condition] = None
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+
+    async def acquire(self, estimated_tokens: float) -> None:
+        if self.requests is not None:
+            await self.requests.take(1)
+        if self.tokens is not None:
+            await self.tokens.take(estimated_tokens)
+        async with self._condition():
+            await self._slot_freed.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, outcome: str, remaining_requests: Optional[float] = None, remaining_tokens: Optional[float] = None) -> None:
+        async with self._condition():
+            self.in_flight -= 1
+            if outcome == THROTTLED:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown_seconds:
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    print(f"🚦 OpenAI rate limited; concurrency limit lowered to {int(self.limit)}")
+            elif outcome == OK:
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self._slot_freed.notify_all()
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+        LLM_RESPONSES.inc(outcome=outcome)
+
+        if remaining_requests is not None and self.requests is not None:
+            self.requests.sync_remaining(remaining_requests)
+        if remaining_tokens is not None and self.tokens is not None:
+            self.tokens.sync_remaining(remaining_tokens)
+
+    def stats(self) -> dict:
+        return {
+            "concurrency_limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "request_tokens": round(self.requests.tokens, 1) if self.requests else None,
+            "token_tokens": round(self.tokens.tokens, 1) if self.tokens else None,
+        }
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the loop the limiter is actually used on
+        if self._slot_freed is None:
+            self._slot_freed = asyncio.Condition()
+        return self._slot_freed
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
@@ -0,0 +1,70 @@
+"""
+Render cache service - content-addressed store of rendered PDFs
+Identical resume data, template, stylesheet and layout always give the same PDF, so it is rendered once
+"""
+
+import os
+import threading
+from typing import Optional
+
+# Local imports
+from config import CONFIG
+from services.disk_cache import DiskCache
+
+
+class RenderCache(DiskCache):
+    """
+    A DiskCache of `<key>.pdf` files holding the raw bytes of each distinct render.
+    Rendered PDFs never go stale for a given key, so entries have no TTL.
+
+    Cached PDFs are only ever copied out, never linked, so a later render writing
+    into a session's PDF can not change a cache entry.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 500):
+        super().__init__(cache_dir, max_entries=max_entries, ttl_seconds=None, name="pdf", extension=".pdf")
+
+    @staticmethod
+    def render_key(resume_data: dict, pdf_config: dict) -> str:
+        """Hashes the resume data, the template and stylesheet sources, and the layout settings."""
+        with open(pdf_config["template_path"], "r", encoding="utf-8") as f:
+            template_source = f.read()
+        with open(pdf_config["css_path"], "r", encoding="utf-8") as f:
+            css_source = f.read()
+        return DiskCache.make_key(resume_data, template_source, css_source, pdf_config.get("layout", {}))
+
+    def copy_to(self, key: str, target: str) -> bool:
+        """Writes the cached PDF for `key` to `target`. Returns False on a miss."""
+        data = self.get_bytes(key)
+        if data is None:
+            return False
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+        return True
+
+    def store(self, key: str, pdf_path: str) -> None:
+        """Adds a freshly rendered PDF under `key`, evicting least recently used entries if needed."""
+        with open(pdf_path, "rb") as f:
+            self.set_bytes(key, f.read())
+
+
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """Returns the shared PDF render cache, or None when it is disabled in CONFIG."""
+    global _render_cache
+    cache_config = CONFIG.get("render_cache", {})
+    if not cache_config.get("enabled", True):
+        return None
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache(
+                    cache_config.get("cache_dir", "./data/cache/pdf"),
+                    max_entries=cache_config.get("max_entries", 500),
+                )
+    return _render_cache
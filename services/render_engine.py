@@ -0,0 +1,139 @@
+"""
+Render engine service - long-lived Jinja/WeasyPrint state shared across PDF renders
+Caches compiled templates and parsed stylesheets, invalidated by file mtime
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+# Third-party imports
+from jinja2 import Environment, FileSystemLoader
+
+# Local imports
+from services.metrics import track
+
+if TYPE_CHECKING:
+    from weasyprint import CSS as WeasyCSS
+
+
+class RenderEngine:
+    """
+    Owns one Jinja Environment per template directory and one parsed WeasyPrint CSS
+    object per stylesheet, plus a shared FontConfiguration.
+
+    Jinja's `auto_reload` already re-checks template mtimes; stylesheets are re-parsed
+    only when their mtime changes. The stylesheet is passed to WeasyPrint pre-parsed,
+    so the template must not also link it (see `link_stylesheet` in the template).
+    External resources (e.g. web fonts) are served from the vendored asset cache.
+
+    WeasyPrint (which needs the native Pango libraries) is only imported on first layout,
+    so HTML-only callers such as the ATS resume text and the live preview work without it.
+
+    PDF renders keep the template's original unescaped output; only the standalone HTML
+    shown in the browser preview is autoescaped.
+    """
+
+    def __init__(self):
+        self._font_config: Optional[Any] = None
+        self._environments: Dict[Tuple[str, bool], Environment] = {}
+        self._stylesheets: Dict[str, Tuple[float, "WeasyCSS"]] = {}
+        self._stylesheet_sources: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def render_html(self, resume_data: dict, pdf_config: dict, autoescape: bool = False, **context) -> str:
+        """Renders the resume template to an HTML string using the cached compiled template."""
+        template_dir, template_name = os.path.split(os.path.abspath(pdf_config["template_path"]))
+        with track("jinja_render"):
+            template = self._environment(template_dir, autoescape).get_template(template_name)
+            return template.render(resume=resume_data, pdf_config=pdf_config, **context)
+
+    def render_standalone_html(self, resume_data: dict, pdf_config: dict) -> str:
+        """Renders the template with the stylesheet inlined, for display in a browser without a PDF."""
+        html_content = self.render_html(resume_data, pdf_config, autoescape=True)
+        style = f"<style>\n{self.stylesheet_source(pdf_config['css_path'])}\n</style>\n"
+        head_end = html_content.find("</head>")
+        if head_end < 0:
+            return style + html_content
+        return html_content[:head_end] + style + html_content[head_end:]
+
+    def write_pdf(self, html_content: str, pdf_config: dict, target: Optional[str] = None) -> Optional[bytes]:
+        """Lays out `html_content` with the cached stylesheet and writes it to `target` (or returns bytes)."""
+        from weasyprint import HTML as WeasyHTML
+        from services.asset_cache import get_asset_cache
+        template_dir = os.path.dirname(os.path.abspath(pdf_config["template_path"]))
+        html_doc = WeasyHTML(string=html_content, base_url=template_dir, url_fetcher=get_asset_cache().url_fetcher)
+        with track("weasyprint_layout"):
+            document = html_doc.render(
+                stylesheets=[self.stylesheet(pdf_config["css_path"])],
+                font_config=self.font_config
+            )
+        with track("weasyprint_write"):
+            return document.write_pdf(target)
+
+    def warm_up(self, pdf_config: dict) -> None:
+        """Compiles the template, parses the stylesheet (registering its fonts) and lays out one page."""
+        template_dir, template_name = os.path.split(os.path.abspath(pdf_config["template_path"]))
+        self._environment(template_dir).get_template(template_name)
+        self.write_pdf("<p>RoboResume</p>", pdf_config)
+
+    @property
+    def font_config(self):
+        """The FontConfiguration shared by every stylesheet and layout, created on first use."""
+        if self._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+            with self._lock:
+                if self._font_config is None:
+                    self._font_config = FontConfiguration()
+        return self._font_config
+
+    def stylesheet(self, css_path: str) -> "WeasyCSS":
+        """Returns the parsed stylesheet, re-parsing only if the file changed on disk."""
+        from weasyprint import CSS as WeasyCSS
+        from services.asset_cache import get_asset_cache
+        css_path = os.path.abspath(css_path)
+        mtime = os.path.getmtime(css_path)
+        with self._lock:
+            cached = self._stylesheets.get(css_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        css = WeasyCSS(filename=css_path, font_config=self.font_config, url_fetcher=get_asset_cache().url_fetcher)
+        with self._lock:
+            self._stylesheets[css_path] = (mtime, css)
+        return css
+
+    def stylesheet_source(self, css_path: str) -> str:
+        """Returns the stylesheet text, re-reading it only if the file changed on disk."""
+        css_path = os.path.abspath(css_path)
+        mtime = os.path.getmtime(css_path)
+        with self._lock:
+            cached = self._stylesheet_sources.get(css_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(css_path, "r", encoding="utf-8") as f:
+            source = f.read()
+        with self._lock:
+            self._stylesheet_sources[css_path] = (mtime, source)
+        return source
+
+    def _environment(self, template_dir: str, autoescape: bool = False) -> Environment:
+        with self._lock:
+            env = self._environments.get((template_dir, autoescape))
+            if env is None:
+                env = Environment(loader=FileSystemLoader(template_dir), auto_reload=True, autoescape=autoescape)
+                self._environments[(template_dir, autoescape)] = env
+            return env
+
+
+_engine: Optional[RenderEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_render_engine() -> RenderEngine:
+    """Returns the process-wide render engine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RenderEngine()
+    return _engine
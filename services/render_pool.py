@@ -0,0 +1,269 @@
+"""
+Render pool service - warm worker processes that run WeasyPrint off the request threads
+Workers preload fonts, the template and the stylesheet, and are recycled after N renders, an RSS ceiling or a timeout
+"""
+
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+# Local imports
+from config import CONFIG
+from services.metrics import registry, capture_timings, record_timings
+
+RENDER_WORKERS = registry.gauge("roboresume_render_workers", "Warm PDF render worker processes.")
+RENDER_RECYCLES = registry.counter("roboresume_render_worker_recycles_total", "Render workers replaced, by reason (renders, rss, timeout, crashed).", ["reason"])
+
+READY = "ready"
+
+
+class RenderTimeoutError(RuntimeError):
+    """Raised when a render (or waiting for a free worker) takes longer than the pool allows."""
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, initializer: Optional[Callable], initargs: Tuple):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, initargs), name="render-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.renders = 0
+
+    def stop(self) -> None:
+        """Asks the worker to exit after its current task; it is never joined."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class RenderPool:
+    """
+    A fixed number of long-lived render processes. CPU-bound, GIL-holding WeasyPrint layout
+    runs in these instead of on Flask or job queue threads; the calling thread only waits
+    on a pipe.
+
+    Each worker runs `initializer(*initargs)` once at start (warming fonts, the compiled
+    template and the parsed stylesheet) and only then joins the idle queue, so startup
+    cost never counts against a render's timeout. A worker is replaced after
+    `max_renders_per_worker` tasks, when its RSS passes `max_rss_mb`, or when a task
+    runs past `render_timeout` (the process is killed - WeasyPrint cannot be interrupted).
+    Replacements start in the background.
+    """
+
+    def __init__(self, processes: int = 2, max_renders_per_worker: Optional[int] = 100, max_rss_mb: Optional[float] = 512,
+                 render_timeout: float = 60.0, startup_timeout: float = 60.0,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.processes = max(1, processes)
+        self.max_renders_per_worker = max_renders_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.render_timeout = render_timeout
+        self.startup_timeout = startup_timeout
+        self.initializer = initializer
+        self.initargs = initargs
+
+        # "spawn" keeps workers free of the parent's threads and locks
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._starting = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Starts any missing workers in the background (also done lazily by `run`)."""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.processes - len(self._workers) - self._starting
+            self._starting += max(0, missing)
+        for _ in range(max(0, missing)):
+            threading.Thread(target=self._start_worker, name="render-pool-start", daemon=True).start()
+
+    def run(self, func: Callable, *args) -> Any:
+        """Runs `func(*args)` in a warm worker and returns its result, re-raising its exception."""
+        self.start()
+        try:
+            worker = self._idle.get(timeout=self.render_timeout)
+        except queue.Empty:
+            raise RenderTimeoutError(f"No render worker became free within {self.render_timeout:.0f}s")
+
+        try:
+            worker.conn.send((func, args))
+            if not worker.conn.poll(self.render_timeout):
+                self._replace(worker, "timeout")
+                raise RenderTimeoutError(f"Render did not finish within {self.render_timeout:.0f}s; worker restarted")
+            ok, value, rss_mb, timings = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            self._replace(worker, "crashed")
+            raise RuntimeError(f"Render worker exited unexpectedly: {e!r}")
+
+        record_timings(timings)   # Template/layout/write timings measured in the worker
+        worker.renders += 1
+        if self.max_renders_per_worker and worker.renders >= self.max_renders_per_worker:
+            self._replace(worker, "renders")
+        elif self.max_rss_mb and rss_mb > self.max_rss_mb:
+            print(f"♻️ Render worker at {rss_mb:.0f} MB RSS (limit {self.max_rss_mb} MB); restarting it")
+            self._replace(worker, "rss")
+        else:
+            self._idle.put(worker)
+
+        if not ok:
+            raise value
+        return value
+
+    def render(self, resume_data: dict, session_path: str, pdf_config: dict, pdf_output_path: str) -> str:
+        """Renders a session's resume to `pdf_output_path` in a worker and returns the path."""
+        return self.run(_create_pdf_in_worker, resume_data, session_path, pdf_config, pdf_output_path)
+
+    def worker_count(self) -> int:
+        with self._lock:
+            return len(self._workers)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+        RENDER_WORKERS.set(0)
+
+    # ------------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------------
+
+    def _start_worker(self) -> None:
+        worker = None
+        ready = False
+        try:
+            worker = _Worker(self._context, self.initializer, self.initargs)
+            ready = worker.conn.poll(self.startup_timeout) and worker.conn.recv() == READY
+        except (EOFError, OSError) as e:
+            print(f"❌ Render worker failed to start: {e!r}")
+
+        with self._lock:
+            self._starting -= 1
+            if ready and not self._closed:
+                self._workers.append(worker)
+                self._idle.put(worker)
+                RENDER_WORKERS.set(len(self._workers))
+                return
+        if worker is not None:
+            if not ready:
+                print(f"❌ Render worker did not become ready within {self.startup_timeout:.0f}s")
+            worker.kill()
+
+    def _replace(self, worker: _Worker, reason: str) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            RENDER_WORKERS.set(len(self._workers))
+        RENDER_RECYCLES.inc(reason=reason)
+        if reason in ("timeout", "crashed"):
+            worker.kill()
+        else:
+            worker.stop()
+        self.start()
+
+
+# ============================================================================
+# WORKER PROCESS
+# ============================================================================
+
+def _worker_main(conn, initializer: Optional[Callable], initargs: Tuple) -> None:
+    """Worker loop: warm up, report ready, then run tasks until told to stop."""
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+        conn.send(READY)
+        while True:
+            task = conn.recv()
+            if task is None:
+                return
+            func, args = task
+            with capture_timings() as timings:
+                try:
+                    result = (True, func(*args))
+                except Exception as e:
+                    result = (False, e)
+            try:
+                conn.send(result + (_rss_mb(), timings))
+            except Exception as e:
+                # The exception itself could not be pickled; send its description instead
+                conn.send((False, RuntimeError(f"{type(e).__name__}: {e}"), _rss_mb(), timings))
+    except (EOFError, KeyboardInterrupt):
+        return
+
+
+def warm_render_worker(pdf_config: dict) -> None:
+    """Pool initializer: builds the worker's render engine and renders once to load fonts."""
+    from services.render_engine import get_render_engine
+    try:
+        get_render_engine().warm_up(pdf_config)
+    except Exception as e:
+        print(f"⚠️ Render worker warm-up failed ({e}); the first render will load everything")
+
+
+def _create_pdf_in_worker(resume_data: dict, session_path: str, pdf_config: dict, pdf_output_path: str) -> str:
+    from services.pdf_generator import _create_pdf_from_data
+    return _create_pdf_from_data(resume_data, session_path, pdf_config, pdf_output_path)
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ============================================================================
+# MODULE-LEVEL POOL
+# ============================================================================
+
+_render_pool: Optional[RenderPool] = None
+_render_pool_lock = threading.Lock()
+
+
+def create_render_pool(processes: Optional[int] = None) -> RenderPool:
+    """Builds a pool of warm render workers from CONFIG["render_pool"]."""
+    pool_config = CONFIG.get("render_pool", {})
+    return RenderPool(
+        processes=processes or pool_config.get("processes", 2),
+        max_renders_per_worker=pool_config.get("max_renders_per_worker", 100),
+        max_rss_mb=pool_config.get("max_rss_mb", 512),
+        render_timeout=pool_config.get("render_timeout_seconds", 60),
+        startup_timeout=pool_config.get("startup_timeout_seconds", 60),
+        initializer=warm_render_worker,
+        initargs=(CONFIG["pdf_config"],),
+    )
+
+
+def get_render_pool() -> Optional[RenderPool]:
+    """Returns the process-wide pool, or None when CONFIG["render_pool"]["enabled"] is off."""
+    global _render_pool
+    if not CONFIG.get("render_pool", {}).get("enabled", True):
+        return None
+    if _render_pool is None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                _render_pool = create_render_pool()
+    return _render_pool
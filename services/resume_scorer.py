@@ -1,48 +1,167 @@
 """
 Resume scoring service - handles ATS validation
+Supports a local deterministic scorer, the LLM scorer, or a local score with an LLM-written summary
 """
 
 import os
 import glob
+import json
+from html.parser import HTMLParser
 from typing import Optional
 from openai import OpenAI
 from pypdf import PdfReader
 
 # Local imports
-from models import ATSValidationResult
-from config import ATS_PROMPT_TEXT
+from models import ATSValidationResult, ATSNarrative
+from config import CONFIG, ATS_PROMPT_TEXT, ATS_NARRATIVE_PROMPT
+from services.llm_cache import cached_completion
+from services.local_scorer import score_text
+from services.events import publish, stage, checkpoint
+from services.metrics import track
+from services.artifact_graph import StepInputs
+from services.render_engine import get_render_engine
 
-def score_resume(session_path: str, client: OpenAI, model_name: str) -> str:
+def score_resume(session_path: str, client: OpenAI, model_name: str, resume_data: Optional[dict] = None) -> str:
     """
-    Finds the generated PDF, extracts its text, and runs an AI-powered ATS
-    analysis against the original job posting.
+    Scores the resume against the original job posting using the mode configured in
+    CONFIG["ats_scoring"]["mode"]. The resume text is built from the structured
+    `resume_data` (or final_resume_data.json), so scoring does not need to wait for
+    the PDF; sessions without structured data fall back to extracting the PDF text.
+    The previous report is reused when the resume, posting and scoring settings are unchanged.
     """
-    print("\n=== Step 5: Validating Resume (ATS Score) ===")
-    
-    try:
-        # 1. Find the generated PDF
-        pdf_files = glob.glob(os.path.join(session_path, '*.pdf'))
-        if not pdf_files:
-            raise FileNotFoundError("Could not find the generated PDF in the session directory.")
-        pdf_path = pdf_files[0]
-        
-        # 2. Extract text from the PDF
-        reader = PdfReader(pdf_path)
+    with stage(session_path, "ats_score", "Step 5: Validating Resume (ATS Score)"):
+        try:
+            scoring_config = CONFIG.get("ats_scoring", {})
+            mode = scoring_config.get("mode", "llm")
+            output_path = os.path.join(session_path, "ats_validation.json")
+
+            inputs = StepInputs(session_path, "ats", {
+                "scoring": scoring_config,
+                "model": model_name,
+                "prompts": [ATS_PROMPT_TEXT, ATS_NARRATIVE_PROMPT],
+                "resume": resume_data,
+            }, extra_files=[CONFIG["pdf_config"]["template_path"]])   # The resume text is rendered from the template
+            if inputs.is_up_to_date():
+                publish(session_path, "log", f"♻️ Resume and posting unchanged; reusing {output_path}")
+                return output_path
+
+            # 1. Build the resume text from structured data, falling back to the PDF
+            if resume_data is None:
+                resume_data = _load_final_resume_data(session_path)
+            if resume_data is not None:
+                resume_text = build_resume_text(resume_data, CONFIG["pdf_config"])
+            else:
+                resume_text = _extract_pdf_text(session_path)
+
+            if not resume_text.strip():
+                raise ValueError("Extracted resume text is empty.")
+            
+            # 2. Read the original job posting markdown
+            markdown_path = os.path.join(session_path, "job_posting.md")
+            with open(markdown_path, "r", encoding="utf-8") as f:
+                job_description_text = f.read()
+
+            # 3. Run the analysis
+            if mode == "llm":
+                response = _run_llm_ats_analysis(session_path, job_description_text, resume_text, client, model_name)
+            elif mode in ("local", "hybrid"):
+                publish(session_path, "log", "📐 Running local ATS keyword scoring...")
+                with track("ats_local_score"):
+                    response = score_text(job_description_text, resume_text, top_keywords=scoring_config.get("top_keywords", 30))
+                if mode == "hybrid":
+                    response.summary = _run_llm_ats_narrative(session_path, job_description_text, resume_text, response, client, model_name)
+            else:
+                raise ValueError(f"Unsupported ATS scoring mode: {mode}")
+
+            # 4. Save the result
+            checkpoint(session_path)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(response.model_dump_json(indent=4))
+            inputs.record()
+
+            publish(session_path, "log", f"✅ ATS analysis complete ({mode}). Results saved to: {output_path}")
+            return output_path
+
+        except Exception as e:
+            publish(session_path, "log", f"❌ Error during ATS validation: {str(e)}")
+            raise  # Re-raise the exception to be caught by the Flask route
+
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def build_resume_text(resume_data: dict, pdf_config: dict) -> str:
+    """
+    Flattens final resume data into the plain text a reader (or ATS) sees in the PDF.
+    The text comes from the same HTML template the PDF is rendered from, so headings,
+    contact fields and section order always match it.
+    """
+    parser = _ResumeTextParser()
+    parser.feed(get_render_engine().render_html(resume_data, pdf_config))
+    parser.close()
+    return parser.text()
+
+
+class _ResumeTextParser(HTMLParser):
+    """Collects the visible text of rendered resume HTML, one line per block element."""
+
+    BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "br", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+    HIDDEN_TAGS = {"head", "style", "script"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._lines = [[]]
+        self._hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.HIDDEN_TAGS:
+            self._hidden += 1
+        elif tag in self.BLOCK_TAGS:
+            self._lines.append([])
+
+    def handle_endtag(self, tag):
+        if tag in self.HIDDEN_TAGS:
+            self._hidden = max(0, self._hidden - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._lines.append([])
+
+    def handle_data(self, data):
+        if not self._hidden:
+            self._lines[-1].append(data)
+
+    def text(self) -> str:
+        lines = (" ".join("".join(parts).split()) for parts in self._lines)
+        return "\n".join(line for line in lines if line)
+
+
+def _load_final_resume_data(session_path: str) -> Optional[dict]:
+    final_resume_path = os.path.join(session_path, "final_resume_data.json")
+    if not os.path.exists(final_resume_path):
+        return None
+    with open(final_resume_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _extract_pdf_text(session_path: str) -> str:
+    """Legacy path: finds the generated PDF and extracts its text."""
+    pdf_files = glob.glob(os.path.join(session_path, '*.pdf'))
+    if not pdf_files:
+        raise FileNotFoundError("Could not find the generated PDF in the session directory.")
+    with track("pdf_text_extraction"):
+        reader = PdfReader(pdf_files[0])
         resume_text = ""
         for page in reader.pages:
             resume_text += page.extract_text() or ""
-        
-        if not resume_text.strip():
-            raise ValueError("Extracted resume text is empty.")
-            
-        # 3. Read the original job posting markdown
-        markdown_path = os.path.join(session_path, "job_posting.md")
-        with open(markdown_path, "r", encoding="utf-8") as f:
-            job_description_text = f.read()
-            
-        # 4. Run the AI analysis
-        print("🤖 Running AI-powered ATS analysis...")
-        response = client.chat.completions.create(
+    return resume_text
+
+
+def _run_llm_ats_analysis(session_path: str, job_description_text: str, resume_text: str, client: OpenAI, model_name: str) -> ATSValidationResult:
+    """Full LLM-based ATS analysis: score, keywords and summary."""
+    publish(session_path, "log", "🤖 Running AI-powered ATS analysis...")
+    with track("ats_llm_call"):
+        return cached_completion(
+            client,
             model=model_name,
             response_model=ATSValidationResult,
             messages=[
@@ -58,17 +177,32 @@ def score_resume(session_path: str, client: OpenAI, model_name: str) -> str:
             max_tokens=2048,
             temperature=0.1
         )
-        
-        # 5. Save the result
-        output_path = os.path.join(session_path, "ats_validation.json")
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(response.model_dump_json(indent=4))
-        
-        print(f"✅ ATS analysis complete. Results saved to: {output_path}")
-        return output_path
-
-    except Exception as e:
-        error_msg = f"❌ Error during ATS validation: {str(e)}"
-        print(error_msg)
-        raise  # Re-raise the exception to be caught by the Flask route
 
+
+def _run_llm_ats_narrative(session_path: str, job_description_text: str, resume_text: str, local_result: ATSValidationResult, client: OpenAI, model_name: str) -> str:
+    """Asks the LLM only for a narrative summary of an already computed local score."""
+    publish(session_path, "log", "🤖 Writing ATS summary for local score...")
+    with track("ats_llm_call"):
+        response = cached_completion(
+            client,
+            model=model_name,
+            response_model=ATSNarrative,
+            messages=[
+                {
+                    "role": "system",
+                    "content": ATS_NARRATIVE_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Match score: {local_result.match_score}/100\n"
+                        f"Matching keywords: {', '.join(local_result.matching_keywords)}\n"
+                        f"Missing keywords: {', '.join(local_result.missing_keywords)}\n\n"
+                        f"Here is the job description:\n\n{job_description_text}\n\n---\n\nHere is the resume text:\n\n{resume_text}"
+                    )
+                }
+            ],
+            max_tokens=512,
+            temperature=0.1
+        )
+    return response.summary
@@ -4,13 +4,22 @@ COMPLETELY REWRITTEN for Resume Builder architecture
 """
 
 import os
+import re
 import json
-from typing import Dict, Any, Optional, Tuple, List
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple, List
 from openai import OpenAI
 
 # Local imports
 from models import IdealCandidateProfile, GeneratedResume, GeneratedWorkExperience, GeneratedSkill
-from config import WORK_EXPERIENCE_PROMPT, SKILLS_PROMPT, SUMMARY_PROMPT
+from config import CONFIG, WORK_EXPERIENCE_PROMPT, SKILLS_PROMPT, SUMMARY_PROMPT
+from services.llm_cache import cached_completion, streamed_completion
+from services.events import publish, stage, checkpoint
+from services.artifact_graph import StepInputs
+from utils import run_concurrently
 
 
 def tailor_resume(session_path: str, user_profile_path: str, client: OpenAI, model_name: str, api_parameters: dict, keywords: List[str] = None) -> str:
@@ -29,7 +38,20 @@ def tailor_resume(session_path: str, user_profile_path: str, client: OpenAI, mod
     Returns:
         Path to generated resume content file
     """
-    print("\n=== Resume Builder Pipeline ===")
+    publish(session_path, "log", "\n=== Resume Builder Pipeline ===")
+    
+    # Skip the whole pipeline when its inputs are unchanged since the last build
+    output_path = os.path.join(session_path, "tailored_resume_content.json")
+    inputs = StepInputs(session_path, "tailoring", {
+        "model": model_name,
+        "api_parameters": api_parameters,
+        "keywords": keywords or [],
+        "prompts": [WORK_EXPERIENCE_PROMPT, SKILLS_PROMPT, SUMMARY_PROMPT],
+        "achievement_selection": CONFIG.get("achievement_selection", {}),
+    }, extra_files=[user_profile_path])
+    if inputs.is_up_to_date():
+        publish(session_path, "log", f"♻️ Inputs unchanged; reusing {output_path}")
+        return output_path
     
     # Load the ideal candidate profile from job analysis
     ideal_profile_path = os.path.join(session_path, "ideal_candidate_profile.json")
@@ -45,33 +67,50 @@ def tailor_resume(session_path: str, user_profile_path: str, client: OpenAI, mod
     with open(job_posting_path, "r", encoding="utf-8") as f:
         job_description = f.read()
     
+    # In streaming mode, sections are saved to a draft and pushed to the review page as they arrive
+    stream_config = CONFIG.get("tailoring_stream", {})
+    draft = DraftWriter(session_path, stream_config.get("flush_interval_ms", 500) / 1000) if stream_config.get("enabled", False) else None
+
     # Execute the 4-step pipeline
-    print("🔄 Step 1: Building Work Experience...")
-    work_experience = _build_work_experience(user_profile, ideal_profile, job_description, client, model_name, api_parameters, keywords)
-    
-    print("🔄 Step 2: Building Skills Section...")
-    skills = _build_skills(user_profile, ideal_profile, client, model_name, api_parameters)
-    
-    print("🔄 Step 3: Writing Summary...")
-    summary = _build_summary(work_experience, skills, ideal_profile, client, model_name, api_parameters)
+    # Steps 1 and 2 are independent, so both LLM calls run at the same time
+    def build_work_experience():
+        with stage(session_path, "work_experience", "Step 1: Building Work Experience"):
+            return _build_work_experience(session_path, user_profile, ideal_profile, job_description, client, model_name, api_parameters, keywords,
+                                          on_partial=draft.section("work_experience") if draft else None)
+
+    def build_skills():
+        with stage(session_path, "skills", "Step 2: Building Skills Section"):
+            return _build_skills(session_path, user_profile, ideal_profile, client, model_name, api_parameters,
+                                 on_partial=draft.section("skills") if draft else None)
+
+    work_experience, skills = run_concurrently(build_work_experience, build_skills)
+    if draft:
+        draft.flush()
     
-    print("🔄 Step 4: Assembling Final Resume...")
-    # Assemble the final resume content
-    final_resume_content = {
-        "summary": summary,
-        "work_experience": [exp.model_dump() for exp in work_experience],
-        "education": user_profile.get("education", []),  # Pull education directly from profile
-        "skills": [skill.model_dump() for skill in skills],
-        "projects": user_profile.get("projects", []),  # Pull projects directly from profile
-        "target_role": ideal_profile.experience_summary
-    }
+    with stage(session_path, "summary", "Step 3: Writing Summary"):
+        summary = _build_summary(session_path, work_experience, skills, ideal_profile, client, model_name, api_parameters,
+                                 on_partial=draft.section("summary") if draft else None)
     
-    # Save the generated content
-    output_path = os.path.join(session_path, "tailored_resume_content.json")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(final_resume_content, f, indent=4)
+    with stage(session_path, "assemble", "Step 4: Assembling Final Resume"):
+        # Assemble the final resume content
+        final_resume_content = {
+            "summary": summary,
+            "work_experience": [exp.model_dump() for exp in work_experience],
+            "education": user_profile.get("education", []),  # Pull education directly from profile
+            "skills": [skill.model_dump() for skill in skills],
+            "projects": user_profile.get("projects", []),  # Pull projects directly from profile
+            "target_role": ideal_profile.experience_summary
+        }
+        
+        # Save the generated content
+        checkpoint(session_path)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(final_resume_content, f, indent=4)
+        inputs.record()
+        if draft:
+            draft.discard()
     
-    print(f"✅ Resume Builder Pipeline Complete! Saved to: {output_path}")
+    publish(session_path, "log", f"✅ Resume Builder Pipeline Complete! Saved to: {output_path}")
     return output_path
 
 
@@ -79,7 +118,8 @@ def tailor_resume(session_path: str, user_profile_path: str, client: OpenAI, mod
 # RESUME BUILDER PIPELINE STEPS
 # ============================================================================
 
-def _build_work_experience(user_profile: dict, ideal_profile: IdealCandidateProfile, job_description: str, client: OpenAI, model_name: str, api_parameters: dict, keywords: List[str] = None) -> List[GeneratedWorkExperience]:
+def _build_work_experience(session_path: str, user_profile: dict, ideal_profile: IdealCandidateProfile, job_description: str, client: OpenAI, model_name: str, api_parameters: dict, keywords: List[str] = None,
+                           on_partial: Optional[Callable[[Any], None]] = None) -> List[GeneratedWorkExperience]:
     """
     Step 1: Intelligently selects and rewrites work experience from user profile.
     """
@@ -90,31 +130,47 @@ def _build_work_experience(user_profile: dict, ideal_profile: IdealCandidateProf
             keyword_list = ", ".join(keywords)
             keyword_injection = f"\n\n**Additional Keywords to Prioritize:** {keyword_list}"
         
+        # Send only the most relevant achievements per employer, when preselection is enabled
+        selection_config = CONFIG.get("achievement_selection", {})
+        if selection_config.get("enabled", True):
+            index = get_achievement_index(user_profile)
+            query = _extract_keywords_from_profile(ideal_profile) + list(keywords or [])
+            work_history = index.select(query, top_k=selection_config.get("top_k_per_employer", 4))
+            profile_section = f"**User's Work History (most relevant achievements per role):**\n{json.dumps({'work_experience': work_history}, indent=2)}"
+        else:
+            profile_section = f"**User's Full Profile (for achievement selection):**\n{json.dumps(user_profile, indent=2)}"
+
         # Prepare the comprehensive prompt
         user_prompt = (
             f"**Ideal Candidate Profile:**\n{ideal_profile.model_dump_json(indent=2)}\n\n"
-            f"**User's Full Profile (for achievement selection):**\n{json.dumps(user_profile, indent=2)}\n\n"
+            f"{profile_section}\n\n"
             f"**Original Job Description (for keyword alignment):**\n{job_description}{keyword_injection}"
         )
         
-        response = client.chat.completions.create(
-            model=model_name,
-            response_model=GeneratedResume,  # Use full resume model to get work_experience
-            messages=[
-                {"role": "system", "content": WORK_EXPERIENCE_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            **api_parameters
-        )
+        messages = [
+            {"role": "system", "content": WORK_EXPERIENCE_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        if on_partial:
+            response = streamed_completion(client, model_name, GeneratedResume, messages, on_partial, **api_parameters)
+        else:
+            response = cached_completion(
+                client,
+                model=model_name,
+                response_model=GeneratedResume,  # Use full resume model to get work_experience
+                messages=messages,
+                **api_parameters
+            )
         
         return response.work_experience
         
     except Exception as e:
-        print(f"❌ Error building work experience: {str(e)}")
+        publish(session_path, "log", f"❌ Error building work experience: {str(e)}")
         raise
 
 
-def _build_skills(user_profile: dict, ideal_profile: IdealCandidateProfile, client: OpenAI, model_name: str, api_parameters: dict) -> List[GeneratedSkill]:
+def _build_skills(session_path: str, user_profile: dict, ideal_profile: IdealCandidateProfile, client: OpenAI, model_name: str, api_parameters: dict,
+                  on_partial: Optional[Callable[[Any], None]] = None) -> List[GeneratedSkill]:
     """
     Step 2: Builds the skills section based on user profile and ideal candidate requirements.
     """
@@ -124,24 +180,30 @@ def _build_skills(user_profile: dict, ideal_profile: IdealCandidateProfile, clie
             f"**User's Full Profile (for skill selection):**\n{json.dumps(user_profile, indent=2)}"
         )
         
-        response = client.chat.completions.create(
-            model=model_name,
-            response_model=GeneratedResume,  # Use full resume model to get skills
-            messages=[
-                {"role": "system", "content": SKILLS_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            **api_parameters
-        )
+        messages = [
+            {"role": "system", "content": SKILLS_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        if on_partial:
+            response = streamed_completion(client, model_name, GeneratedResume, messages, on_partial, **api_parameters)
+        else:
+            response = cached_completion(
+                client,
+                model=model_name,
+                response_model=GeneratedResume,  # Use full resume model to get skills
+                messages=messages,
+                **api_parameters
+            )
         
         return response.skills
         
     except Exception as e:
-        print(f"❌ Error building skills: {str(e)}")
+        publish(session_path, "log", f"❌ Error building skills: {str(e)}")
         raise
 
 
-def _build_summary(work_experience: List[GeneratedWorkExperience], skills: List[GeneratedSkill], ideal_profile: IdealCandidateProfile, client: OpenAI, model_name: str, api_parameters: dict) -> str:
+def _build_summary(session_path: str, work_experience: List[GeneratedWorkExperience], skills: List[GeneratedSkill], ideal_profile: IdealCandidateProfile, client: OpenAI, model_name: str, api_parameters: dict,
+                   on_partial: Optional[Callable[[Any], None]] = None) -> str:
     """
     Step 3: Writes the professional summary based on the already-built sections.
     """
@@ -157,23 +219,190 @@ def _build_summary(work_experience: List[GeneratedWorkExperience], skills: List[
             f"**Built Resume Sections (for synthesis):**\n{json.dumps(built_sections, indent=2)}"
         )
         
-        response = client.chat.completions.create(
-            model=model_name,
-            response_model=GeneratedResume,  # Use full resume model to get summary
-            messages=[
-                {"role": "system", "content": SUMMARY_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ],
-            **api_parameters
-        )
+        messages = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        if on_partial:
+            response = streamed_completion(client, model_name, GeneratedResume, messages, on_partial, **api_parameters)
+        else:
+            response = cached_completion(
+                client,
+                model=model_name,
+                response_model=GeneratedResume,  # Use full resume model to get summary
+                messages=messages,
+                **api_parameters
+            )
         
         return response.summary
         
     except Exception as e:
-        print(f"❌ Error building summary: {str(e)}")
+        publish(session_path, "log", f"❌ Error building summary: {str(e)}")
         raise
 
 
+# ============================================================================
+# STREAMING DRAFTS
+# ============================================================================
+
+DRAFT_FILE = "tailored_resume_draft.json"
+
+
+class DraftWriter:
+    """
+    Collects partial builder output in streaming mode. Each update replaces one section
+    (work_experience, skills or summary) of the draft; at most every `flush_interval`
+    seconds the whole draft is saved to tailored_resume_draft.json and published as a
+    "draft" event, which the review page renders while the pipeline is still running.
+    """
+
+    def __init__(self, session_path: str, flush_interval: float = 0.5):
+        self.session_path = session_path
+        self.path = os.path.join(session_path, DRAFT_FILE)
+        self.flush_interval = flush_interval
+        self._draft: Dict[str, Any] = {"summary": "", "work_experience": [], "skills": []}
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def section(self, name: str) -> Callable[[Any], None]:
+        """Returns an `on_partial` callback that copies `name` from each partial response."""
+        def update(partial: Any) -> None:
+            checkpoint(self.session_path)   # Raising here stops the stream of a cancelled step
+            value = getattr(partial, name, None)
+            if value is None:
+                return
+            with self._lock:
+                self._draft[name] = _to_plain(value)
+                if time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush()
+        return update
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._draft, f, indent=4)
+        os.replace(tmp_path, self.path)
+        publish(self.session_path, "draft", draft=dict(self._draft))
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value if item is not None]
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    return value
+
+
+# ============================================================================
+# ACHIEVEMENT PRESELECTION
+# ============================================================================
+
+class AchievementIndex:
+    """
+    Inverted index from normalized achievement tag to the achievements carrying it,
+    built once per user profile.
+
+    A query only scans the (small) tag vocabulary, then scores the achievements the
+    matching tags point to with `_calculate_tag_relevance_score`; untouched achievements
+    score zero without being looked at.
+    """
+
+    def __init__(self, user_profile: dict):
+        self.work_experience: List[dict] = user_profile.get("work_experience", [])
+        self.tags_by_achievement: Dict[Tuple[int, int], List[str]] = {}
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+
+        for job_index, job in enumerate(self.work_experience):
+            for achievement_index, achievement in enumerate(job.get("achievements") or []):
+                key = (job_index, achievement_index)
+                raw_tags = (achievement.get("tags") if isinstance(achievement, dict) else None) or []
+                # Tags that normalize to "" would be a substring of every skill, so they are dropped
+                tags = [tag for tag in (_normalize_tag(tag) for tag in raw_tags) if tag]
+                self.tags_by_achievement[key] = tags
+                for tag in set(tags):
+                    self.postings.setdefault(tag, []).append(key)
+
+    def rank(self, skills: List[str]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+        """Returns (relevance score, matched tag count) for every achievement hit by `skills`."""
+        normalized_skills = [skill for skill in (_normalize_tag(skill) for skill in skills) if skill]
+        matched_tags = [
+            tag for tag in self.postings
+            if any(skill in tag or tag in skill for skill in normalized_skills)
+        ]
+        hits: Dict[Tuple[int, int], int] = {}
+        for tag in matched_tags:
+            for key in self.postings[tag]:
+                hits[key] = hits.get(key, 0) + 1
+        return {
+            key: (_calculate_tag_relevance_score(self.tags_by_achievement[key], normalized_skills), count)
+            for key, count in hits.items()
+        }
+
+    def select(self, skills: List[str], top_k: int = 4) -> List[dict]:
+        """
+        Returns a copy of the work history keeping only the `top_k` best-matching achievements
+        per employer, in their original order. Quantified achievements win ties.
+        """
+        ranking = self.rank(skills)
+        selected_history = []
+        for job_index, job in enumerate(self.work_experience):
+            achievements = job.get("achievements") or []
+            if len(achievements) > top_k:
+                order = sorted(
+                    range(len(achievements)),
+                    key=lambda i: (
+                        ranking.get((job_index, i), (0.0, 0)),
+                        bool(re.search(r"\d", _achievement_text(achievements[i]))),
+                    ),
+                    reverse=True
+                )
+                keep = sorted(order[:top_k])
+                achievements = [achievements[i] for i in keep]
+            selected_history.append({**job, "achievements": achievements})
+        return selected_history
+
+
+_achievement_indexes: "OrderedDict[str, AchievementIndex]" = OrderedDict()
+_achievement_indexes_lock = threading.Lock()
+MAX_CACHED_INDEXES = 16
+
+
+def get_achievement_index(user_profile: dict) -> AchievementIndex:
+    """Returns the index for this exact profile content, building it on first use."""
+    key = hashlib.sha256(json.dumps(user_profile, sort_keys=True).encode("utf-8")).hexdigest()
+    with _achievement_indexes_lock:
+        index = _achievement_indexes.get(key)
+        if index is not None:
+            _achievement_indexes.move_to_end(key)
+            return index
+    index = AchievementIndex(user_profile)
+    with _achievement_indexes_lock:
+        _achievement_indexes[key] = index
+        while len(_achievement_indexes) > MAX_CACHED_INDEXES:
+            _achievement_indexes.popitem(last=False)
+    return index
+
+
+def _normalize_tag(tag: str) -> str:
+    """Lowercases and treats '-', '_' and '/' as spaces, so "data-modeling" matches "Data Modeling"."""
+    return " ".join(re.sub(r"[-_/]", " ", str(tag).lower()).split())
+
+
+def _achievement_text(achievement: Any) -> str:
+    return achievement.get("text", "") if isinstance(achievement, dict) else str(achievement)
+
+
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
@@ -181,7 +410,7 @@ def _build_summary(work_experience: List[GeneratedWorkExperience], skills: List[
 def _calculate_tag_relevance_score(achievement_tags: List[str], ideal_skills: List[str]) -> float:
     """
     Calculates how well an achievement's tags align with the ideal candidate profile.
-    This can be used for more sophisticated achievement selection logic in the future.
+    Used by AchievementIndex to rank achievements before the work experience step.
     """
     if not achievement_tags or not ideal_skills:
         return 0.0
@@ -0,0 +1,383 @@
+"""
+Session store service - one place that knows which artifacts a session has and what they contain
+Caches the directory manifest and parsed artifacts in memory, revalidated against file mtimes
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Local imports
+from config import CONFIG
+from models import ATSValidationResult
+
+# Logical artifact name -> file name inside the session directory
+ARTIFACTS = {
+    "job_posting": "job_posting.md",
+    "ideal_profile": "ideal_candidate_profile.json",
+    "legacy_analysis": "structured_job_data.json",
+    "user_profile": "user_profile.json",
+    "tailored_content": "tailored_resume_content.json",
+    "tailored_draft": "tailored_resume_draft.json",
+    "final_resume_data": "final_resume_data.json",
+    "pdf": "tailored_resume.pdf",
+    "ats_validation": "ats_validation.json",
+}
+ARTIFACT_NAMES = {file_name: name for name, file_name in ARTIFACTS.items()}
+
+# Files included in downloadable session bundles, minus in-progress working files
+BUNDLE_EXTENSIONS = (".md", ".json", ".pdf")
+BUNDLE_EXCLUDED = {ARTIFACTS["tailored_draft"]}
+
+# Pipeline stages, in order, with the artifact that marks each one as reached
+STAGES = [
+    ("job_listing", ("job_posting",)),
+    ("job_analysis", ("ideal_profile", "legacy_analysis")),
+    ("tailoring", ("tailored_content",)),
+    ("final", ("ats_validation",)),
+]
+
+
+class SessionNotFoundError(Exception):
+    """Raised when a session id is malformed or has no directory."""
+
+
+def shard_name(session_id: str, prefix_length: int) -> str:
+    """The shard directory a session lives in: a prefix of the hash of its id."""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:prefix_length]
+
+
+def shard_path(base_dir: str, session_id: str, prefix_length: Optional[int] = None) -> str:
+    """
+    Where a session directory belongs: `<base_dir>/<hash prefix>/<session_id>`, or directly
+    under `base_dir` when `prefix_length` is 0. Defaults to CONFIG["session_store"].
+    """
+    if prefix_length is None:
+        prefix_length = CONFIG.get("session_store", {}).get("shard_prefix_length", 2)
+    if not prefix_length:
+        return os.path.join(base_dir, session_id)
+    return os.path.join(base_dir, shard_name(session_id, prefix_length), session_id)
+
+
+@dataclass
+class ArtifactInfo:
+    path: str
+    mtime_ns: int
+    size: int
+
+
+@dataclass
+class SessionManifest:
+    """The artifacts present in one session directory, as of `dir_mtime_ns`."""
+    session_id: str
+    path: str
+    dir_mtime_ns: int
+    artifacts: Dict[str, ArtifactInfo] = field(default_factory=dict)
+    other_pdfs: Dict[str, ArtifactInfo] = field(default_factory=dict)
+    bundle_files: Dict[str, ArtifactInfo] = field(default_factory=dict)
+
+    def has(self, name: str) -> bool:
+        return name in self.artifacts
+
+    @property
+    def stage(self) -> str:
+        """The furthest pipeline stage whose artifact exists ("empty" if none)."""
+        reached = "empty"
+        for stage_name, markers in STAGES:
+            if any(marker in self.artifacts for marker in markers):
+                reached = stage_name
+        return reached
+
+    @property
+    def pdf(self) -> Optional[ArtifactInfo]:
+        """The generated PDF, falling back to any PDF in older or uploaded sessions."""
+        if "pdf" in self.artifacts:
+            return self.artifacts["pdf"]
+        return next(iter(sorted(self.other_pdfs.items())), (None, None))[1]
+
+
+class SessionStore:
+    """
+    Read-through cache over the session directories under `base_dir`.
+
+    Sessions are sharded into `<base_dir>/<hash prefix>/<session_id>` so no directory grows
+    past a few hundred entries; session ids (and so URLs) do not depend on the layout.
+    Sessions from the older flat layout are still found until `migrate()` moves them.
+
+    The manifest comes from a single scandir and is reused until the directory mtime
+    changes (files created, replaced or removed). Parsed artifacts are cached by path and
+    reused while the file's (mtime, size) is unchanged, so edits made by the pipeline or
+    by hand are picked up on the next access. Returned dicts are shared between
+    callers and must be treated as read-only.
+    """
+
+    def __init__(self, base_dir: str, max_cached_artifacts: int = 256, shard_prefix_length: int = 2):
+        self.base_dir = base_dir
+        self.max_cached_artifacts = max_cached_artifacts
+        self.shard_prefix_length = shard_prefix_length
+        self._paths: Dict[str, str] = {}
+        self._manifests: Dict[str, SessionManifest] = {}
+        self._artifacts: "OrderedDict[Tuple[str, str], Tuple[int, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------------
+    # Paths and manifests
+    # ------------------------------------------------------------------------
+
+    def session_path(self, session_id: str) -> str:
+        """Resolves a session id to its directory (which may not exist yet)."""
+        if not session_id or session_id != os.path.basename(session_id) or session_id.startswith("."):
+            raise SessionNotFoundError(f"Invalid session id: {session_id!r}")
+        path = self._paths.get(session_id)
+        if path is not None:
+            # Re-checked, since a migration in another process (`--migrate`) may have moved it
+            if os.path.isdir(path):
+                return path
+            with self._lock:
+                self._paths.pop(session_id, None)
+            self.invalidate(session_id)
+
+        path = shard_path(self.base_dir, session_id, self.shard_prefix_length)
+        if not os.path.isdir(path):
+            legacy_path = os.path.join(self.base_dir, session_id)
+            if path == legacy_path or not os.path.isdir(legacy_path):
+                return path
+            path = legacy_path
+        with self._lock:
+            self._paths[session_id] = path
+        return path
+
+    def create(self, session_id: str) -> str:
+        """Creates the directory for a new session and returns its path."""
+        path = self.session_path(session_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def artifact_path(self, session_id: str, name: str) -> str:
+        return os.path.join(self.session_path(session_id), ARTIFACTS[name])
+
+    def exists(self, session_id: str) -> bool:
+        try:
+            return os.path.isdir(self.session_path(session_id))
+        except SessionNotFoundError:
+            return False
+
+    def iter_sessions(self) -> Iterator[os.DirEntry]:
+        """Lazily yields the directory entry of every session (sharded or legacy), in no particular order."""
+        for entry in _scan_dirs(self.base_dir):
+            if self._is_shard(entry.name):
+                yield from _scan_dirs(entry.path)
+            else:
+                yield entry
+
+    def migrate(self) -> int:
+        """Moves sessions from the flat layout into their shards. Returns how many were moved."""
+        moved = 0
+        for entry in list(_scan_dirs(self.base_dir)):
+            if self._is_shard(entry.name):
+                continue
+            target = shard_path(self.base_dir, entry.name, self.shard_prefix_length)
+            if target == entry.path or os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.rename(entry.path, target)
+            with self._lock:
+                self._paths.pop(entry.name, None)
+            self.invalidate(entry.name)
+            moved += 1
+        return moved
+
+    def _is_shard(self, name: str) -> bool:
+        return bool(self.shard_prefix_length) and len(name) == self.shard_prefix_length and all(c in "0123456789abcdef" for c in name)
+
+    def manifest(self, session_id: str) -> SessionManifest:
+        path = self.session_path(session_id)
+        try:
+            dir_mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            raise SessionNotFoundError(f"Session {session_id} does not exist")
+
+        with self._lock:
+            cached = self._manifests.get(session_id)
+        if cached is not None and cached.path == path and cached.dir_mtime_ns == dir_mtime_ns:
+            return cached
+
+        manifest = SessionManifest(session_id=session_id, path=path, dir_mtime_ns=dir_mtime_ns)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                info = ArtifactInfo(path=entry.path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                name = ARTIFACT_NAMES.get(entry.name)
+                if name:
+                    manifest.artifacts[name] = info
+                elif entry.name.lower().endswith(".pdf"):
+                    manifest.other_pdfs[entry.name] = info
+                if entry.name.lower().endswith(BUNDLE_EXTENSIONS) and entry.name not in BUNDLE_EXCLUDED:
+                    manifest.bundle_files[entry.name] = info
+
+        with self._lock:
+            self._manifests[session_id] = manifest
+        return manifest
+
+    # ------------------------------------------------------------------------
+    # Typed accessors
+    # ------------------------------------------------------------------------
+
+    def job_posting(self, session_id: str) -> Optional[str]:
+        return self._read(session_id, "job_posting", "text", lambda raw: raw)
+
+    def ideal_profile(self, session_id: str) -> Optional[dict]:
+        return self._read_json(session_id, "ideal_profile")
+
+    def analysis_data(self, session_id: str) -> Optional[dict]:
+        """The ideal candidate profile, or the legacy structured job data for older sessions."""
+        data = self.ideal_profile(session_id)
+        return data if data is not None else self._read_json(session_id, "legacy_analysis")
+
+    def user_profile(self, session_id: str) -> Optional[dict]:
+        return self._read_json(session_id, "user_profile")
+
+    def tailored_content(self, session_id: str) -> Optional[dict]:
+        return self._read_json(session_id, "tailored_content")
+
+    def final_resume_data(self, session_id: str) -> Optional[dict]:
+        return self._read_json(session_id, "final_resume_data")
+
+    def ats_validation(self, session_id: str) -> Optional[ATSValidationResult]:
+        return self._read(session_id, "ats_validation", "model", ATSValidationResult.model_validate_json)
+
+    def pretty_json(self, session_id: str, name: str) -> Optional[str]:
+        """A JSON artifact re-serialized with indent=4 for the editors, cached with the file."""
+        return self._read(session_id, name, "pretty", lambda raw: json.dumps(json.loads(raw), indent=4))
+
+    def pdf_path(self, session_id: str) -> Optional[str]:
+        pdf = self.manifest(session_id).pdf
+        return pdf.path if pdf else None
+
+    def bundle_files(self, session_id: str) -> List[Tuple[str, ArtifactInfo]]:
+        """
+        The (file name, info) pairs that go into the session bundle, sorted by name.
+        Files are re-stat'ed, since rewriting a file in place does not change the
+        directory mtime that keeps the manifest cached.
+        """
+        files = []
+        for file_name, info in sorted(self.manifest(session_id).bundle_files.items()):
+            try:
+                stat = os.stat(info.path)
+            except FileNotFoundError:
+                continue
+            files.append((file_name, ArtifactInfo(path=info.path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)))
+        return files
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def write_text(self, session_id: str, name: str, content: str) -> str:
+        path = self.artifact_path(session_id, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.invalidate(session_id, name)
+        return path
+
+    def write_json(self, session_id: str, name: str, data: Any) -> str:
+        return self.write_text(session_id, name, json.dumps(data, indent=4))
+
+    def delete(self, session_id: str) -> None:
+        """Removes a session directory and everything cached for it."""
+        shutil.rmtree(self.session_path(session_id))
+        with self._lock:
+            self._paths.pop(session_id, None)
+        self.invalidate(session_id)
+
+    def invalidate(self, session_id: str, name: Optional[str] = None) -> None:
+        """Drops cached state for one artifact (or the whole session when `name` is None)."""
+        with self._lock:
+            self._manifests.pop(session_id, None)
+            for key in [key for key in self._artifacts if key[0] == session_id and (name is None or key[1].startswith(f"{name}:"))]:
+                del self._artifacts[key]
+
+    # ------------------------------------------------------------------------
+    # Cache internals
+    # ------------------------------------------------------------------------
+
+    def _read_json(self, session_id: str, name: str) -> Optional[dict]:
+        return self._read(session_id, name, "json", json.loads)
+
+    def _read(self, session_id: str, name: str, kind: str, parse: Callable[[str], Any]) -> Optional[Any]:
+        """Returns `parse(file contents)`, reusing the cached value while the file is unchanged."""
+        path = self.artifact_path(session_id, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        key = (session_id, f"{name}:{kind}")
+        with self._lock:
+            cached = self._artifacts.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._artifacts.move_to_end(key)
+                return cached[2]
+
+        with open(path, "r", encoding="utf-8") as f:
+            value = parse(f.read())
+
+        with self._lock:
+            self._artifacts[key] = (stat.st_mtime_ns, stat.st_size, value)
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > self.max_cached_artifacts:
+                self._artifacts.popitem(last=False)
+        return value
+
+
+def _scan_dirs(path: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.name.startswith(".") and entry.is_dir():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+# ============================================================================
+# MODULE-LEVEL STORE
+# ============================================================================
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Returns the process-wide session store for CONFIG["output_base_dir"]."""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                store_config = CONFIG.get("session_store", {})
+                _session_store = SessionStore(
+                    CONFIG["output_base_dir"],
+                    max_cached_artifacts=store_config.get("max_cached_artifacts", 256),
+                    shard_prefix_length=store_config.get("shard_prefix_length", 2)
+                )
+    return _session_store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session directory maintenance.")
+    parser.add_argument("--migrate", action="store_true", help="Move sessions from the flat layout into hash-prefix shards")
+    args = parser.parse_args()
+
+    store = get_session_store()
+    if args.migrate:
+        print(f"📁 Migrated {store.migrate()} session(s) into shards under {store.base_dir}")
+    else:
+        print(f"📁 {sum(1 for _ in store.iter_sessions())} session(s) under {store.base_dir}")
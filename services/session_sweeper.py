@@ -0,0 +1,262 @@
+"""
+Session sweeper service - background cleanup of old session directories
+Keeps a last-access index of sessions and enforces age and total-size quotas with LRU eviction
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional
+
+# Local imports
+from config import CONFIG
+from services.session_store import get_session_store, SessionStore, SessionNotFoundError
+from services.job_queue import get_job_queue
+
+INDEX_FILE = ".session_index.json"   # Hidden, so the store never mistakes it for a session
+
+
+@dataclass
+class SessionUsage:
+    last_access: float
+    size: Optional[int] = None   # Bytes on disk; None until (re)measured
+
+
+class SessionSweeper:
+    """
+    Deletes sessions that have not been accessed for `max_age_days`, then the least
+    recently accessed ones until the tree is under `max_total_mb`.
+
+    Work is split into small ticks so a large tree never stalls the process: each tick
+    scans at most `batch_size` directory entries (resuming where the last tick stopped),
+    measures at most `batch_size` sessions and deletes at most `batch_size`. Sessions with
+    queued or running jobs, or accessed within `min_idle_minutes`, are never deleted.
+    The size quota is only enforced once a full scan has seen every session.
+    """
+
+    def __init__(self, store: SessionStore, max_age_days: float = 30, max_total_mb: Optional[float] = None,
+                 interval_seconds: float = 60, batch_size: int = 200, min_idle_minutes: float = 10):
+        self.store = store
+        self.base_dir = store.base_dir
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024) if max_total_mb else None
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        self.min_idle_seconds = min_idle_minutes * 60
+
+        self._sessions: Dict[str, SessionUsage] = {}
+        self._lock = threading.Lock()
+        self._scan: Optional[Iterator[os.DirEntry]] = None
+        self._scan_started = 0.0
+        self._scan_seen: set = set()
+        self._full_scan_done = False
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._load_index()
+
+    # ------------------------------------------------------------------------
+    # Access tracking
+    # ------------------------------------------------------------------------
+
+    def touch(self, session_id: str) -> None:
+        """Records an access; the session's size is re-measured on a later tick."""
+        with self._lock:
+            self._sessions[session_id] = SessionUsage(last_access=time.time())
+            self._dirty = True
+
+    def total_size(self) -> int:
+        with self._lock:
+            return sum(usage.size or 0 for usage in self._sessions.values())
+
+    # ------------------------------------------------------------------------
+    # Sweeping
+    # ------------------------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="session-sweeper", daemon=True)
+            self._thread.start()
+        print(f"🧹 Session sweeper started for {self.base_dir}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def tick(self) -> List[str]:
+        """Does one bounded slice of work. Returns the ids of sessions deleted."""
+        self._scan_step()
+        self._measure_step()
+        removed = self._evict_step()
+        self._save_index()
+        return removed
+
+    def sweep(self) -> List[str]:
+        """Runs ticks until a full scan completes and nothing more is evicted."""
+        removed = []
+        self._scan = None
+        self._full_scan_done = False
+        while True:
+            removed_now = self.tick()
+            removed.extend(removed_now)
+            if self._full_scan_done and self._scan is None and not removed_now and not self._unmeasured():
+                return removed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ Session sweeper tick failed: {e}")
+            # Keep going quickly while a scan or measurement backlog is in progress
+            busy = self._scan is not None or self._unmeasured()
+            self._stop.wait(1.0 if busy else self.interval_seconds)
+
+    def _scan_step(self) -> None:
+        """Registers sessions on disk the index does not know and forgets ones that are gone."""
+        if self._scan is None:
+            self._scan = self.store.iter_sessions()
+            self._scan_started = time.time()
+            self._scan_seen = set()
+
+        for _ in range(self.batch_size):
+            entry = next(self._scan, None)
+            if entry is None:
+                break
+            self._scan_seen.add(entry.name)
+            with self._lock:
+                if entry.name not in self._sessions:
+                    # Unknown sessions count as last accessed when their directory last changed
+                    self._sessions[entry.name] = SessionUsage(last_access=entry.stat().st_mtime)
+                    self._dirty = True
+        else:
+            return
+
+        # Scan finished: drop index entries for directories removed by other means
+        with self._lock:
+            for session_id, usage in list(self._sessions.items()):
+                if session_id not in self._scan_seen and usage.last_access < self._scan_started:
+                    del self._sessions[session_id]
+                    self._dirty = True
+        self._scan = None
+        self._full_scan_done = True
+
+    def _measure_step(self) -> None:
+        with self._lock:
+            pending = [session_id for session_id, usage in self._sessions.items() if usage.size is None][:self.batch_size]
+        for session_id in pending:
+            size = _directory_size(self.store.session_path(session_id))
+            with self._lock:
+                if session_id in self._sessions:
+                    self._sessions[session_id].size = size
+                    self._dirty = True
+
+    def _evict_step(self) -> List[str]:
+        now = time.time()
+        with self._lock:
+            by_age = sorted(self._sessions.items(), key=lambda item: item[1].last_access)
+            total = sum(usage.size or 0 for usage in self._sessions.values())
+
+        over_quota = self.max_total_bytes is not None and self._full_scan_done and total > self.max_total_bytes
+        victims = []
+        for session_id, usage in by_age:
+            if len(victims) >= self.batch_size:
+                break
+            idle = now - usage.last_access
+            too_old = self.max_age_seconds is not None and idle > self.max_age_seconds
+            if not too_old and not over_quota:
+                break   # Sorted oldest first, so nothing later is eligible either
+            if idle < self.min_idle_seconds or get_job_queue().status(session_id)["active"]:
+                continue
+            victims.append(session_id)
+            total -= usage.size or 0
+            over_quota = over_quota and total > self.max_total_bytes
+
+        removed = []
+        for session_id in victims:
+            try:
+                self.store.delete(session_id)
+                print(f"🗑️ Cleaned up old session: {session_id}")
+            except (FileNotFoundError, SessionNotFoundError):
+                pass
+            except Exception as e:
+                print(f"⚠️ Could not remove {session_id}: {e}")
+                continue
+            with self._lock:
+                self._sessions.pop(session_id, None)
+                self._dirty = True
+            removed.append(session_id)
+        return removed
+
+    def _unmeasured(self) -> bool:
+        with self._lock:
+            return any(usage.size is None for usage in self._sessions.values())
+
+    # ------------------------------------------------------------------------
+    # Index persistence
+    # ------------------------------------------------------------------------
+
+    def _index_path(self) -> str:
+        return os.path.join(self.base_dir, INDEX_FILE)
+
+    def _load_index(self) -> None:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self._sessions = {session_id: SessionUsage(**usage) for session_id, usage in raw.items()}
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            self._sessions = {}
+
+    def _save_index(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {session_id: asdict(usage) for session_id, usage in self._sessions.items()}
+            self._dirty = False
+        os.makedirs(self.base_dir, exist_ok=True)
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self._index_path())
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                total += os.lstat(os.path.join(root, file_name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+# ============================================================================
+# MODULE-LEVEL SWEEPER
+# ============================================================================
+
+_session_sweeper: Optional[SessionSweeper] = None
+_session_sweeper_lock = threading.Lock()
+
+
+def get_session_sweeper() -> Optional[SessionSweeper]:
+    """Returns the process-wide sweeper (call start() to run it), or None when CONFIG["session_sweeper"]["enabled"] is off."""
+    global _session_sweeper
+    sweeper_config = CONFIG.get("session_sweeper", {})
+    if not sweeper_config.get("enabled", True):
+        return None
+    if _session_sweeper is None:
+        with _session_sweeper_lock:
+            if _session_sweeper is None:
+                _session_sweeper = SessionSweeper(
+                    get_session_store(),
+                    max_age_days=sweeper_config.get("max_age_days", 30),
+                    max_total_mb=sweeper_config.get("max_total_mb"),
+                    interval_seconds=sweeper_config.get("interval_seconds", 60),
+                    batch_size=sweeper_config.get("batch_size", 200),
+                    min_idle_minutes=sweeper_config.get("min_idle_minutes", 10),
+                )
+    return _session_sweeper
@@ -0,0 +1,31 @@
+"""
+Shared helpers for the standalone test scripts - named checks and the summary block
+The summary exits with status 1 when any check failed, so CI and shell loops notice
+"""
+
+import sys
+
+_failed = []
+
+
+def check(name: str, condition, detail="") -> bool:
+    """Prints one named check with its result (and optional detail); failures are remembered."""
+    print(f"\n{name}")
+    if detail:
+        print(f"  Detail:   {detail}")
+    if condition:
+        print("  Result:   ✅ PASSED")
+    else:
+        print("  Result:   ❌ FAILED")
+        _failed.append(name)
+    return bool(condition)
+
+
+def summary() -> None:
+    """Prints the test summary and exits non-zero if any check failed."""
+    print("\n--- Test Summary ---")
+    if not _failed:
+        print("✅ All tests passed successfully!")
+        return
+    print(f"❌ Some tests failed: {', '.join(_failed)}")
+    sys.exit(1)
@@ -0,0 +1,56 @@
+# python tests/achievement_index_test.py
+
+import os
+import sys
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.resume_tailor import AchievementIndex, get_achievement_index
+from tests._check import check, summary
+
+USER_PROFILE = {
+    "work_experience": [
+        {
+            "company": "Acme Analytics",
+            "position": "Data Analyst",
+            "achievements": [
+                {"text": "Organized the annual team offsite.", "tags": ["event-planning"]},
+                {"text": "Built Tableau dashboards used by 40 managers.", "tags": ["tableau", "data-visualization"]},
+                {"text": "Automated reporting with Python, saving 10 hours a week.", "tags": ["python", "automation"]},
+                {"text": "Mentored two junior analysts.", "tags": ["leadership", "mentoring"]},
+            ]
+        },
+        {
+            "company": "Small Shop",
+            "position": "Associate",
+            "achievements": [
+                {"text": "Handled customer questions.", "tags": ["customer-service"]},
+            ]
+        }
+    ]
+}
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Achievement Index Tests ---")
+    index = AchievementIndex(USER_PROFILE)
+    check("Normalizes tags into the index", "data visualization" in index.postings, sorted(index.postings))
+
+    selected = index.select(["Python", "Data Visualization"], top_k=2)
+    texts = [a["text"] for a in selected[0]["achievements"]]
+    check("Keeps only the top-k matching achievements", len(texts) == 2 and "Organized the annual team offsite." not in texts, texts)
+    check("Preserves original achievement order", texts == [
+        "Built Tableau dashboards used by 40 managers.",
+        "Automated reporting with Python, saving 10 hours a week."
+    ], texts)
+    check("Leaves roles under the limit untouched", selected[1]["achievements"] == USER_PROFILE["work_experience"][1]["achievements"])
+    check("Does not modify the source profile", len(USER_PROFILE["work_experience"][0]["achievements"]) == 4)
+    check("Reuses the index for the same profile", get_achievement_index(USER_PROFILE) is get_achievement_index(dict(USER_PROFILE)))
+
+    blank_tags = AchievementIndex({"work_experience": [{"achievements": [{"text": "Filed reports.", "tags": ["--", " ", "_/_"]}]}]})
+    check("Drops tags that normalize to nothing", not blank_tags.postings and not blank_tags.rank(["Python"]), blank_tags.postings)
+
+    summary()
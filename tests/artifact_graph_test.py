@@ -0,0 +1,65 @@
+# python tests/artifact_graph_test.py
+
+import os
+import sys
+import tempfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.artifact_graph import StepInputs, invalidate
+from tests._check import check, summary
+
+
+def write(session_path, name, content):
+    with open(os.path.join(session_path, name), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def build_analysis(session_path, params):
+    """Stands in for the analysis step: writes its output, then records the build."""
+    inputs = StepInputs(session_path, "analysis", params)
+    write(session_path, "ideal_candidate_profile.json", '{"title": "Analyst"}')
+    inputs.record()
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Artifact Graph Tests ---")
+    params = {"model": "gpt-test", "prompt": "Analyze"}
+
+    with tempfile.TemporaryDirectory() as session_path:
+        write(session_path, "job_posting.md", "# Data Analyst")
+        check("Never-built outputs are stale", StepInputs(session_path, "analysis", params).changed() == ["output"])
+
+        build_analysis(session_path, params)
+        check("Unchanged inputs are up to date", StepInputs(session_path, "analysis", params).is_up_to_date())
+
+        check("Changed params are stale", StepInputs(session_path, "analysis", {**params, "model": "gpt-other"}).changed() == ["params"])
+
+        write(session_path, "job_posting.md", "# Senior Data Analyst")
+        check("Changed input files are stale", StepInputs(session_path, "analysis", params).changed() == ["job_posting.md"])
+
+        build_analysis(session_path, params)
+        write(session_path, "ideal_candidate_profile.json", '{"title": "Edited by hand"}')
+        check("Hand-edited outputs are stale", StepInputs(session_path, "analysis", params).changed() == ["output"])
+
+        build_analysis(session_path, params)
+        os.remove(os.path.join(session_path, "ideal_candidate_profile.json"))
+        check("Deleted outputs are stale", StepInputs(session_path, "analysis", params).changed() == ["output"])
+
+        build_analysis(session_path, params)
+        invalidate(session_path, "analysis")
+        check("invalidate() forces a rebuild", not StepInputs(session_path, "analysis", params).is_up_to_date())
+
+        extra_file = os.path.join(session_path, "template.html")
+        write(session_path, "template.html", "<p>v1</p>")
+        inputs = StepInputs(session_path, "analysis", params, extra_files=[extra_file])
+        write(session_path, "ideal_candidate_profile.json", "{}")
+        inputs.record()
+        write(session_path, "template.html", "<p>v2</p>")
+        check("Changed external files are stale", StepInputs(session_path, "analysis", params, extra_files=[extra_file]).changed() == [os.path.abspath(extra_file)])
+
+    summary()
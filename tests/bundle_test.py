@@ -0,0 +1,64 @@
+# python tests/bundle_test.py
+
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import CONFIG
+from services.session_store import get_session_store
+from services.bundle import session_bundle
+from tests._check import check, summary
+
+SESSION_ID = "251017120000_bundle_test_0a1b2c3d"
+FILES = {
+    "job_posting.md": b"# Data Analyst\n" * 200,
+    "tailored_resume_content.json": b'{"summary": "Analyst"}',
+    "tailored_resume.pdf": b"%PDF-1.4 not really a pdf",
+    "tailored_resume_draft.json": b'{"summary": "Anal"}',
+}
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Session Bundle Tests ---")
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        CONFIG["output_base_dir"] = base_dir
+        store = get_session_store()
+        session_path = store.create(SESSION_ID)
+        for file_name, content in FILES.items():
+            with open(os.path.join(session_path, file_name), "wb") as f:
+                f.write(content)
+
+        etag, body = session_bundle(SESSION_ID)
+        data = b"".join(body)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            check("Streams a valid zip archive", archive.testzip() is None)
+            names = sorted(archive.namelist())
+            check("Bundles session files but not the streaming draft", names == ["job_posting.md", "tailored_resume.pdf", "tailored_resume_content.json"], names)
+            check("Preserves file contents", all(archive.read(name) == FILES[name] for name in names))
+            compression = {info.filename: info.compress_type for info in archive.infolist()}
+            check("Stores PDFs and deflates text files", compression["tailored_resume.pdf"] == zipfile.ZIP_STORED
+                  and compression["job_posting.md"] == zipfile.ZIP_DEFLATED, compression)
+
+        cached_etag, cached_body = session_bundle(SESSION_ID)
+        check("Keeps the same ETag while the session is unchanged", cached_etag == etag)
+        check("Serves an unchanged session from the cache", isinstance(cached_body, list) and b"".join(cached_body) == data)
+
+        with open(os.path.join(session_path, "tailored_resume_content.json"), "wb") as f:
+            f.write(b'{"summary": "Senior Analyst"}')
+        new_etag, new_body = session_bundle(SESSION_ID)
+        with zipfile.ZipFile(io.BytesIO(b"".join(new_body))) as archive:
+            updated = archive.read("tailored_resume_content.json")
+        check("Changes the ETag and contents when a file is rewritten", new_etag != etag and updated == b'{"summary": "Senior Analyst"}', new_etag)
+
+        store.create("251017120000_empty_session_deadbeef")
+        check("Returns None for sessions without bundle files", session_bundle("251017120000_empty_session_deadbeef") is None)
+
+    summary()
@@ -0,0 +1,41 @@
+# python tests/event_bus_test.py
+
+import os
+import sys
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.events import EventBus
+from tests._check import check, summary
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Event Bus Tests ---")
+    bus = EventBus(history_per_session=3, max_sessions=2)
+
+    first = bus.publish("session_a", "stage_start", stage="scrape")
+    second = bus.publish("session_a", "stage_finish", stage="scrape")
+    bus.publish("session_b", "log", message="other session")
+    check("Keeps a per-session history in publish order", [e["id"] for e in bus.history("session_a")] == [first["id"], second["id"]])
+    check("Replays only events after Last-Event-ID", [e["id"] for e in bus.history("session_a", after_id=first["id"])] == [second["id"]])
+
+    stream = bus.stream("session_a", after_id=first["id"], heartbeat=0.05)
+    replayed = next(stream)
+    live = bus.publish("session_a", "stage_start", stage="analysis")
+    received = next(stream)
+    check("Streams missed events first, then live ones", replayed["id"] == second["id"] and received["id"] == live["id"], (replayed["id"], received["id"]))
+    check("Yields None as a heartbeat when nothing happens", next(stream) is None)
+    stream.close()
+    check("Unsubscribes when the stream is closed", "session_a" not in bus._subscribers)
+
+    for index in range(5):
+        bus.publish("session_a", "log", message=f"line {index}")
+    check("Bounds the history of each session", len(bus.history("session_a")) == 3, len(bus.history("session_a")))
+
+    bus.publish("session_c", "log", message="newest session")
+    check("Forgets the least recently active session past max_sessions", bus.history("session_b") == [] and bus.history("session_a") != [])
+
+    summary()
@@ -0,0 +1,81 @@
+# python tests/job_queue_test.py
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import CONFIG
+from services.events import stage
+from services.job_queue import get_job_queue, QueueFullError
+from tests._check import check, summary
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def state(job_queue, session_id):
+    jobs = job_queue.status(session_id)["jobs"]
+    return jobs[0]["state"] if jobs else None
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Job Queue Tests ---")
+    CONFIG["job_queue"].update({"workers": 1, "max_jobs_per_session": 1})
+    job_queue = get_job_queue()
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        # One worker, held busy by session A's first stage until `release` is set
+        session_path = os.path.join(base_dir, "240101000000_job_a")
+        os.makedirs(session_path)
+        output_path = os.path.join(session_path, "step_two.json")
+        in_step_one = threading.Event()
+        release = threading.Event()
+
+        def two_step_job():
+            with stage(session_path, "step_one"):
+                in_step_one.set()
+                release.wait(5)
+            with stage(session_path, "step_two"):
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write("{}")
+
+        job_queue.submit("240101000000_job_a", "tailoring", two_step_job)
+        check("Starts the job on a worker", in_step_one.wait(5))
+
+        try:
+            job_queue.submit("240101000000_job_a", "pdf", lambda: None)
+            rejected = False
+        except QueueFullError:
+            rejected = True
+        check("Rejects a second job for a session at its cap", rejected)
+
+        job_queue.submit("240101000000_job_b", "pdf", lambda: None)
+        check("Queues jobs of other sessions behind the busy worker", state(job_queue, "240101000000_job_b") == "queued")
+
+        check("Cancels a queued job outright", job_queue.cancel("240101000000_job_b") and state(job_queue, "240101000000_job_b") == "cancelled")
+
+        check("Flags a running job when it is cancelled", job_queue.cancel("240101000000_job_a") and job_queue.cancel_requested("240101000000_job_a"))
+        release.set()
+        finished = wait_for(lambda: state(job_queue, "240101000000_job_a") not in ("queued", "running"))
+        check("Stops a cancelled job at its next stage", finished and state(job_queue, "240101000000_job_a") == "cancelled", job_queue.status("240101000000_job_a")["jobs"][0])
+        check("Never writes the output of stages after the cancel", not os.path.exists(output_path))
+
+        job = job_queue.submit("240101000000_job_a", "pdf", lambda: None)
+        check("Accepts new jobs once the session's job has stopped",
+              wait_for(lambda: state(job_queue, "240101000000_job_a") == "succeeded"), job.id)
+
+    summary()
@@ -0,0 +1,72 @@
+# python tests/llm_cache_test.py
+
+import os
+import sys
+import tempfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pydantic import BaseModel
+
+from config import CONFIG
+from services.llm_cache import cached_completion, get_llm_cache
+from tests._check import check, summary
+
+
+class Answer(BaseModel):
+    text: str
+
+
+class StubCompletions:
+    """Stands in for instructor's chat.completions: counts calls and echoes the prompt."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, response_model, messages, **api_parameters):
+        self.calls += 1
+        return response_model(text=f"{messages[-1]['content']} #{self.calls}")
+
+
+class StubClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": StubCompletions()})()
+
+
+MESSAGES = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hello"}]
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running LLM Cache Tests ---")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        CONFIG["llm_cache"]["enabled"] = True
+        CONFIG["llm_cache"]["cache_dir"] = cache_dir
+        client = StubClient()
+        completions = client.chat.completions
+
+        first = cached_completion(client, "model-a", Answer, MESSAGES, temperature=0.2)
+        second = cached_completion(client, "model-a", Answer, MESSAGES, temperature=0.2)
+        check("Calls the API once for identical requests", completions.calls == 1, completions.calls)
+        check("Returns the cached, validated response on a hit", isinstance(second, Answer) and second == first, second)
+
+        cached_completion(client, "model-b", Answer, MESSAGES, temperature=0.2)
+        check("Keys on the model", completions.calls == 2, completions.calls)
+
+        cached_completion(client, "model-a", Answer, MESSAGES, temperature=0.7)
+        check("Keys on the API parameters", completions.calls == 3, completions.calls)
+
+        cached_completion(client, "model-a", Answer, [MESSAGES[0], {"role": "user", "content": "Hello!"}], temperature=0.2)
+        check("Keys on the message content", completions.calls == 4, completions.calls)
+
+        stats = get_llm_cache().stats()
+        check("Counts hits and misses", stats["hits"] == 1 and stats["misses"] == 4, stats)
+
+        CONFIG["llm_cache"]["enabled"] = False
+        cached_completion(client, "model-a", Answer, MESSAGES, temperature=0.2)
+        check("Always calls the API when the cache is disabled", completions.calls == 5, completions.calls)
+
+    summary()
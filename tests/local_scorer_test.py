@@ -0,0 +1,51 @@
+# python tests/local_scorer_test.py
+
+import os
+import sys
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.local_scorer import extract_keywords, score_text
+from tests._check import check, summary
+
+JOB_POSTING = """
+## Senior Data Analyst
+
+We are looking for a Senior Data Analyst to join our analytics team.
+
+**Responsibilities**
+- Build Tableau dashboards for marketing performance reporting.
+- Write SQL queries and Python scripts to automate reporting.
+- Partner with stakeholders to define marketing performance KPIs.
+
+**Requirements**
+- 5+ years of SQL and Python experience.
+- Experience with Tableau dashboards and data visualization.
+- Strong stakeholder management skills.
+"""
+
+STRONG_RESUME = (
+    "Senior analyst who built Tableau dashboards for marketing performance, automated reporting "
+    "with SQL and Python, and led stakeholder management for KPI definition and data visualization."
+)
+
+WEAK_RESUME = "Retail associate experienced in customer service, cash handling and inventory."
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Local ATS Scorer Tests ---")
+    keywords = extract_keywords(JOB_POSTING, top_k=10)
+    check("Extracts repeated skills as keywords", {"sql", "python", "tableau dashboard"} <= set(keywords), list(keywords))
+    check("Drops stopword-only phrases", not any(k in keywords for k in ("experience", "the", "and")), list(keywords))
+
+    strong = score_text(JOB_POSTING, STRONG_RESUME)
+    weak = score_text(JOB_POSTING, WEAK_RESUME)
+    check("Strong resume outscores weak resume", strong.match_score > weak.match_score, f"{strong.match_score} vs {weak.match_score}")
+    check("Weak resume lists missing keywords", "sql" in weak.missing_keywords, weak.missing_keywords)
+    check("Scoring is deterministic", score_text(JOB_POSTING, STRONG_RESUME) == strong)
+    check("Empty posting scores zero", score_text("", STRONG_RESUME).match_score == 0)
+
+    summary()
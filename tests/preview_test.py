@@ -0,0 +1,70 @@
+# python tests/preview_test.py
+
+import json
+import os
+import sys
+import tempfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import CONFIG
+from tests._check import check, summary
+
+SESSION_ID = "251017120000_preview_test_0a1b2c3d"
+USER_PROFILE = {"personal_info": {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com"}}
+IDEAL_PROFILE = {"top_technical_skills": ["Python"], "top_soft_skills": ["Communication"], "experience_summary": "Data Analyst"}
+TAILORED_CONTENT = {
+    "summary": "Analyst who <b>ships</b> dashboards.",
+    "work_experience": [{"company": "Acme", "position": "Analyst", "date": "2020 - 2024", "description": ["Built Tableau dashboards."]}],
+    "skills": [{"category": "Tools", "entries": ["Python", "SQL"]}],
+    "target_role": "Data Analyst",
+}
+
+
+def snapshot(path):
+    """File names with their sizes and mtimes, to detect any write."""
+    return sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns) for entry in os.scandir(path))
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Live Preview Tests ---")
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        CONFIG["output_base_dir"] = base_dir
+        os.environ.setdefault("OPENAI_API_KEY", "unused-by-these-tests")
+        import app as roboresume
+        from services.session_store import get_session_store
+
+        session_path = get_session_store().create(SESSION_ID)
+        for file_name, content in (("user_profile.json", USER_PROFILE), ("ideal_candidate_profile.json", IDEAL_PROFILE)):
+            with open(os.path.join(session_path, file_name), "w", encoding="utf-8") as f:
+                json.dump(content, f)
+        before = snapshot(session_path)
+
+        client = roboresume.app.test_client()
+        response = client.post(f"/preview/{SESSION_ID}", json=TAILORED_CONTENT)
+        html = response.get_data(as_text=True)
+        check("Returns the rendered resume as HTML", response.status_code == 200 and response.mimetype == "text/html"
+              and "Built Tableau dashboards." in html and "Lovelace" in html, response.status_code)
+        check("Inlines the stylesheet", "<style>" in html)
+        check("Escapes user content", "<b>ships</b>" not in html and "&lt;b&gt;ships&lt;/b&gt;" in html)
+        from services.pdf_generator import _assemble_final_resume_builder, _job_data_from_analysis
+        from services.render_engine import get_render_engine
+        resume_data = _assemble_final_resume_builder(USER_PROFILE, TAILORED_CONTENT, _job_data_from_analysis(IDEAL_PROFILE), CONFIG["pdf_config"])
+        pdf_html = get_render_engine().render_html(resume_data, CONFIG["pdf_config"])
+        check("Leaves the PDF markup unescaped", "<b>ships</b>" in pdf_html)
+        check("Sandboxes the response", "sandbox" in response.headers.get("Content-Security-Policy", ""), response.headers.get("Content-Security-Policy"))
+        check("Writes nothing to the session", snapshot(session_path) == before)
+
+        response = client.post(f"/preview/{SESSION_ID}", data=json.dumps(TAILORED_CONTENT), content_type="text/plain")
+        check("Rejects bodies that are not JSON", response.status_code == 415, response.status_code)
+        response = client.post(f"/preview/{SESSION_ID}", data="[1, 2]", content_type="application/json")
+        check("Rejects JSON that is not an object", response.status_code == 400, response.status_code)
+        response = client.post("/preview/251017120000_missing_session_deadbeef", json=TAILORED_CONTENT)
+        check("Returns 404 for unknown sessions", response.status_code == 404, response.status_code)
+
+    summary()
@@ -0,0 +1,109 @@
+# python tests/rate_limiter_test.py
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import httpx
+
+from services.rate_limiter import RateLimiter, TokenBucket, OK, THROTTLED
+from services.openai_client import RateLimitedAsyncTransport, _RetryPolicy, estimate_request_tokens
+from tests._check import check, summary
+
+
+class FlakyUpstream(httpx.AsyncBaseTransport):
+    """Answers 429 with a short Retry-After `failures` times, then 200."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    async def handle_async_request(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return httpx.Response(429, headers={"retry-after-ms": "20"}, request=request)
+        return httpx.Response(200, json={"ok": True}, headers={"x-ratelimit-remaining-tokens": "50"}, request=request)
+
+
+class StreamingUpstream(httpx.AsyncBaseTransport):
+    """Answers 200 at once, then streams the body in a few delayed chunks."""
+
+    async def handle_async_request(self, request):
+        async def chunks():
+            for index in range(3):
+                await asyncio.sleep(0.01)
+                yield f"data: {index}\n\n".encode()
+        return httpx.Response(200, stream=ChunkedStream(chunks()), request=request)
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Response body fed from an async generator, as a network read would be."""
+
+    def __init__(self, iterator):
+        self.iterator = iterator
+
+    async def __aiter__(self):
+        async for chunk in self.iterator:
+            yield chunk
+
+
+async def main(check):
+    bucket = TokenBucket(600)   # 10 per second
+    await bucket.take(600)
+    started = time.monotonic()
+    await bucket.take(2)
+    waited = time.monotonic() - started
+    check("Token bucket paces requests once its burst is spent", 0.15 <= waited < 0.6, f"{waited:.2f}s")
+
+    limiter = RateLimiter(initial_concurrency=8, cooldown_seconds=60)
+    await limiter.acquire(0)
+    await limiter.release(THROTTLED)
+    await limiter.acquire(0)
+    await limiter.release(THROTTLED)
+    check("A burst of 429s halves the concurrency limit once", limiter.limit == 4, limiter.stats())
+    await limiter.acquire(0)
+    await limiter.release(OK)
+    check("Successes raise the limit additively", limiter.limit == 4.25, limiter.stats())
+
+    limiter = RateLimiter(tokens_per_minute=100000, initial_concurrency=2)
+    upstream = FlakyUpstream(failures=2)
+    transport = RateLimitedAsyncTransport(limiter, upstream, _RetryPolicy(max_retries=3, backoff_base=0.01))
+    async with httpx.AsyncClient(transport=transport) as client:
+        response = await client.post("https://api.test/v1/chat/completions", json={"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100})
+    check("Retries 429s with backoff until the request succeeds", response.status_code == 200 and upstream.calls == 3, upstream.calls)
+    check("Adopts the server's remaining token quota", limiter.tokens.tokens <= 51, limiter.stats())
+    check("Releases every concurrency slot", limiter.in_flight == 0, limiter.stats())
+
+    limiter = RateLimiter(initial_concurrency=2)
+    transport = RateLimitedAsyncTransport(limiter, StreamingUpstream(), _RetryPolicy(max_retries=0))
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("POST", "https://api.test/v1/chat/completions", json={"stream": True}) as response:
+            held_at_headers = limiter.in_flight
+            chunks = []
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                if len(chunks) == 1:
+                    held_mid_stream = limiter.in_flight
+            body = b"".join(chunks)
+        released = limiter.in_flight
+    check("Holds the slot while a streamed response is open", held_at_headers == 1 and held_mid_stream == 1, (held_at_headers, held_mid_stream))
+    check("Releases the slot when the stream closes", released == 0 and body.count(b"data:") == 3, released)
+
+    request = httpx.Request("POST", "https://api.test", content=json.dumps({"messages": [{"role": "user", "content": "x" * 400}], "max_tokens": 100}))
+    check("Estimates request tokens from prompt size and max_tokens", estimate_request_tokens(request) == 200, estimate_request_tokens(request))
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Rate Limiter Tests ---")
+
+    asyncio.run(main(check))
+
+    summary()
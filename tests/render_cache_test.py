@@ -0,0 +1,81 @@
+# python tests/render_cache_test.py
+
+import os
+import sys
+import tempfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.disk_cache import DiskCache
+from services.render_cache import RenderCache
+from tests._check import check, summary
+
+RESUME = {"first_name": "Ada", "last_name": "Lovelace", "summary": "Analyst"}
+
+
+def write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Render Cache Tests ---")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        template_path = os.path.join(workdir, "resume_template.html")
+        css_path = os.path.join(workdir, "resume_styles.css")
+        write(template_path, "<h1>{{ resume.first_name }}</h1>")
+        write(css_path, "h1 { color: black; }")
+        pdf_config = {
+            "template_path": template_path,
+            "css_path": css_path,
+            "layout": {"section_order": ["summary", "work_experience"]},
+        }
+
+        key = RenderCache.render_key(RESUME, pdf_config)
+        check("Gives identical inputs the same key", RenderCache.render_key(dict(RESUME), dict(pdf_config)) == key)
+        check("Changes the key with the resume data", RenderCache.render_key({**RESUME, "summary": "Engineer"}, pdf_config) != key)
+        check("Changes the key with the layout", RenderCache.render_key(RESUME, {**pdf_config, "layout": {"section_order": ["work_experience", "summary"]}}) != key)
+
+        write(template_path, "<h2>{{ resume.first_name }}</h2>")
+        template_key = RenderCache.render_key(RESUME, pdf_config)
+        check("Changes the key when the template is edited", template_key != key)
+
+        write(css_path, "h1 { color: navy; }")
+        check("Changes the key when the stylesheet is edited", RenderCache.render_key(RESUME, pdf_config) not in (key, template_key))
+
+        cache = RenderCache(os.path.join(workdir, "cache"), max_entries=2)
+        target = os.path.join(workdir, "tailored_resume.pdf")
+        check("Misses before anything is stored", not cache.copy_to(key, target) and not os.path.exists(target))
+
+        rendered = os.path.join(workdir, "rendered.pdf")
+        write(rendered, "%PDF-1.4 first")
+        cache.store(key, rendered)
+        write(rendered, "%PDF-1.4 overwritten by a later render")
+        with open(target, "w", encoding="utf-8"):
+            pass
+        hit = cache.copy_to(key, target)
+        with open(target, "r", encoding="utf-8") as f:
+            copied = f.read()
+        check("Copies stored PDFs out on a hit, unaffected by later renders", hit and copied == "%PDF-1.4 first", copied)
+
+        for extra_key in ("b" * 64, "c" * 64):
+            cache.store(extra_key, rendered)
+        entries = sorted(name for name in os.listdir(cache.cache_dir) if name.endswith(".pdf"))
+        check("Evicts least recently used entries past max_entries", len(entries) == 2, entries)
+
+        stats = cache.stats()
+        check("Counts hits and misses", stats["hits"] == 1 and stats["misses"] == 1, stats)
+
+        try:
+            DiskCache(os.path.join(workdir, "expiring"), ttl_seconds=60).set_bytes(key, b"%PDF")
+            refused = False
+        except ValueError:
+            refused = True
+        check("Refuses bytes entries in caches with a TTL", refused)
+
+    summary()
@@ -0,0 +1,66 @@
+# python tests/render_pool_test.py
+
+import os
+import sys
+import time
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.render_pool import RenderPool, RenderTimeoutError
+from tests._check import check, summary
+
+WARMED = False
+
+
+def warm():
+    global WARMED
+    WARMED = True
+
+
+def task(value):
+    """Stands in for a render: reports the worker's pid and whether the initializer ran."""
+    if value == "fail":
+        raise ValueError("bad resume data")
+    if value == "hang":
+        time.sleep(30)
+    return os.getpid(), WARMED
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Render Pool Tests ---")
+    pool = RenderPool(processes=1, max_renders_per_worker=2, max_rss_mb=None, render_timeout=10, initializer=warm)
+    try:
+        first_pid, warmed = pool.run(task, "ok")
+        check("Runs tasks in a separate, warmed-up process", first_pid != os.getpid() and warmed, first_pid)
+
+        second_pid, _ = pool.run(task, "ok")
+        third_pid, _ = pool.run(task, "ok")
+        check("Reuses a worker, then recycles it after max renders", first_pid == second_pid != third_pid, (first_pid, second_pid, third_pid))
+
+        try:
+            pool.run(task, "fail")
+            error = None
+        except ValueError as e:
+            error = e
+        check("Re-raises the task's exception in the caller", str(error) == "bad resume data", repr(error))
+
+        pool.render_timeout = 1
+        started = time.monotonic()
+        try:
+            pool.run(task, "hang")
+            timed_out = False
+        except RenderTimeoutError:
+            timed_out = True
+        check("Kills a render that runs past its timeout", timed_out and time.monotonic() - started < 5, f"{time.monotonic() - started:.1f}s")
+
+        pool.render_timeout = 10
+        replacement_pid, _ = pool.run(task, "ok")
+        check("Replaces the killed worker", replacement_pid not in (first_pid, third_pid) and pool.worker_count() == 1, replacement_pid)
+    finally:
+        pool.shutdown()
+
+    summary()
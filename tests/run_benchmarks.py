@@ -0,0 +1,341 @@
+# python tests/run_benchmarks.py
+# python tests/run_benchmarks.py --sizes 10,100,1000 --iterations 20 --save tests/test_output/bench_baseline.json
+# python tests/run_benchmarks.py --baseline tests/test_output/bench_baseline.json
+
+"""
+Offline benchmark suite for the non-LLM parts of the pipeline.
+
+Generates synthetic user profiles (10 to 1000 achievements) and job postings, then times
+PDF rendering, JSON IO, prompt construction (against a stubbed OpenAI client), bundle
+zip/unzip and ATS text extraction/scoring. Reports p50/p95/p99 latency and throughput per
+benchmark and profile size, and can compare against a saved baseline to catch regressions.
+No network access or API key is needed.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import CONFIG
+from models import IdealCandidateProfile, GeneratedResume, ATSValidationResult, ATSNarrative
+
+# Benchmarks must never reuse cached LLM responses or skip steps as up to date
+CONFIG["llm_cache"]["enabled"] = False
+CONFIG["incremental"]["enabled"] = False
+
+from services.resume_tailor import _build_work_experience, _build_skills, _build_summary, get_achievement_index
+from services.resume_scorer import score_resume, build_resume_text, _extract_pdf_text
+from services.bundle import iter_zip
+
+# ============================================================================
+# SYNTHETIC DATA GENERATORS
+# ============================================================================
+
+SKILL_VOCABULARY = [
+    "python", "sql", "tableau", "data-visualization", "machine-learning", "forecasting", "a/b-testing",
+    "stakeholder-management", "leadership", "strategy", "market-analysis", "automation", "etl", "aws",
+    "docker", "budgeting", "crm", "segmentation", "attribution", "product-analytics", "mentoring",
+    "negotiation", "client-facing", "project-management", "digital-transformation", "excel", "statistics",
+]
+ACTION_VERBS = ["Led", "Built", "Automated", "Designed", "Launched", "Optimized", "Delivered", "Analyzed", "Scaled", "Negotiated"]
+OBJECTS = [
+    "a customer churn model", "the quarterly forecasting process", "self-serve marketing dashboards",
+    "a pricing experiment program", "the data warehouse migration", "an attribution framework",
+    "a vendor consolidation initiative", "the onboarding analytics funnel", "a CRM rollout", "executive KPI reporting",
+]
+OUTCOMES = [
+    "reducing manual work by {n}%", "increasing conversion by {n}%", "saving ${n}K annually",
+    "cutting report turnaround by {n}%", "growing pipeline by {n}%", "improving forecast accuracy by {n}%",
+]
+
+
+def generate_user_profile(n_achievements: int, seed: int = 0, achievements_per_role: int = 10) -> dict:
+    """A deterministic user_profile.json with `n_achievements` tagged achievements spread over roles."""
+    rng = random.Random(seed)
+    work_experience = []
+    remaining = n_achievements
+    role_index = 0
+    while remaining > 0:
+        count = min(achievements_per_role, remaining)
+        work_experience.append({
+            "company": f"Company {role_index + 1}",
+            "position": rng.choice(["Data Analyst", "Senior Analyst", "Analytics Manager", "Consultant", "Director, Insights"]),
+            "date": f"{2024 - role_index * 2} – {2026 - role_index * 2}",
+            "location": rng.choice(["Calgary, AB", "Toronto, ON", "Remote"]),
+            "achievements": [
+                {
+                    "text": f"{rng.choice(ACTION_VERBS)} {rng.choice(OBJECTS)}, {rng.choice(OUTCOMES).format(n=rng.randint(5, 80))}.",
+                    "tags": rng.sample(SKILL_VOCABULARY, rng.randint(2, 5))
+                }
+                for _ in range(count)
+            ]
+        })
+        remaining -= count
+        role_index += 1
+
+    return {
+        "personal_info": {
+            "first_name": "Sam",
+            "last_name": "Example",
+            "email": "sam@example.com",
+            "phone_number": "555-0100",
+            "location": "Calgary, AB",
+            "linkedin_url": "https://www.linkedin.com/in/example"
+        },
+        "work_experience": work_experience,
+        "projects": [],
+        "education": [{"school": "University of Calgary", "degree": "B.Comm", "date": "2014"}],
+        "skills": [{"category": "Technical", "entries": sorted({tag for job in work_experience for a in job["achievements"] for tag in a["tags"]})}]
+    }
+
+
+def generate_job_posting(n_bullets: int, seed: int = 0) -> str:
+    """A deterministic markdown job posting with `n_bullets` responsibility/requirement bullets."""
+    rng = random.Random(seed)
+    lines = ["## Senior Data Analyst", "", "We are hiring an analyst to help our growth team make better decisions.", "", "**Responsibilities**"]
+    for i in range(n_bullets):
+        if i == n_bullets // 2:
+            lines += ["", "**Requirements**"]
+        skill = rng.choice(SKILL_VOCABULARY).replace("-", " ")
+        lines.append(f"- {rng.choice(ACTION_VERBS)} {rng.choice(OBJECTS)} using {skill} and {rng.choice(SKILL_VOCABULARY).replace('-', ' ')}.")
+    return "\n".join(lines) + "\n"
+
+
+def generate_ideal_profile(seed: int = 0) -> IdealCandidateProfile:
+    rng = random.Random(seed)
+    return IdealCandidateProfile(
+        top_technical_skills=[skill.replace("-", " ") for skill in rng.sample(SKILL_VOCABULARY, 6)],
+        top_soft_skills=["leadership", "stakeholder management", "communication"],
+        experience_summary="5+ years of analytics experience supporting marketing and growth teams."
+    )
+
+
+def generate_tailored_content(user_profile: dict, bullets_per_role: int = 3) -> dict:
+    """What the builder would save to tailored_resume_content.json: a few bullets for every role."""
+    return {
+        "summary": "Analytics leader who turns messy data into decisions, with a track record of automation and growth.",
+        "work_experience": [
+            {
+                "company": job["company"],
+                "position": job["position"],
+                "date": job["date"],
+                "location": job["location"],
+                "description": [a["text"] for a in job["achievements"][:bullets_per_role]],
+                "technologies": []
+            }
+            for job in user_profile["work_experience"]
+        ],
+        "education": user_profile["education"],
+        "skills": user_profile["skills"],
+        "projects": [],
+        "target_role": "Senior Data Analyst"
+    }
+
+
+# ============================================================================
+# STUBBED OPENAI CLIENT
+# ============================================================================
+
+class _StubCompletions:
+    """Returns canned instructor responses instantly and records how much prompt text it was sent."""
+
+    CANNED = {
+        GeneratedResume: {
+            "summary": "Stub summary.",
+            "work_experience": [{"company": "Company 1", "position": "Analyst", "date": "2024", "description": ["Stub bullet."]}],
+            "skills": [{"category": "Technical", "entries": ["python", "sql"]}],
+            "target_role": "Analyst"
+        },
+        ATSValidationResult: {"match_score": 50, "matching_keywords": [], "missing_keywords": [], "summary": "Stub."},
+        ATSNarrative: {"summary": "Stub narrative."},
+    }
+
+    def __init__(self):
+        self.prompt_chars = 0
+
+    def create(self, model, response_model, messages, **kwargs):
+        self.prompt_chars += sum(len(message["content"]) for message in messages)
+        return response_model.model_validate(self.CANNED[response_model])
+
+
+class StubClient:
+    def __init__(self):
+        self.completions = _StubCompletions()
+        self.chat = self
+
+
+# ============================================================================
+# BENCHMARK HARNESS
+# ============================================================================
+
+def measure(func: Callable[[], object], iterations: int, warmup: int = 1) -> List[float]:
+    """Runs `func` `warmup + iterations` times and returns the timed durations in seconds."""
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    samples_ms = np.array(durations) * 1000
+    return {
+        "n": len(durations),
+        "mean_ms": round(float(samples_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(samples_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(samples_ms, 99)), 3),
+        "max_ms": round(float(samples_ms.max()), 3),
+        "ops_per_s": round(len(durations) / sum(durations), 2) if sum(durations) > 0 else 0.0,
+    }
+
+
+def _load_pdf_generator():
+    """WeasyPrint needs native Pango libraries; PDF benchmarks are skipped where they are missing."""
+    try:
+        import weasyprint  # noqa: F401  (render_engine only imports it on first layout)
+        from services import pdf_generator
+        return pdf_generator
+    except Exception as e:
+        print(f"⚠️ Skipping PDF benchmarks (WeasyPrint unavailable: {e})")
+        return None
+
+
+def run_benchmarks(sizes: List[int], iterations: int, posting_bullets: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    pdf_generator = _load_pdf_generator()
+    pdf_config = CONFIG["pdf_config"]
+    CONFIG["ats_scoring"]["mode"] = "local"
+
+    for size in sizes:
+        print(f"\n📦 Profile with {size} achievements")
+        workdir = tempfile.mkdtemp(prefix=f"roboresume_bench_{size}_")
+        session_path = os.path.join(workdir, "session")
+        os.makedirs(session_path)
+        try:
+            user_profile = generate_user_profile(size, seed=size)
+            job_posting = generate_job_posting(posting_bullets, seed=size)
+            ideal_profile = generate_ideal_profile(seed=size)
+            tailored_content = generate_tailored_content(user_profile)
+
+            user_profile_path = os.path.join(session_path, "user_profile.json")
+            with open(os.path.join(session_path, "job_posting.md"), "w", encoding="utf-8") as f:
+                f.write(job_posting)
+            with open(os.path.join(session_path, "ideal_candidate_profile.json"), "w", encoding="utf-8") as f:
+                f.write(ideal_profile.model_dump_json(indent=4))
+            with open(os.path.join(session_path, "tailored_resume_content.json"), "w", encoding="utf-8") as f:
+                json.dump(tailored_content, f, indent=4)
+
+            def record(name: str, func: Callable[[], object], runs: int = iterations):
+                results[f"{name}[{size}]"] = stats = summarize(measure(func, runs))
+                print(f"  {name:<24} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  {stats['ops_per_s']:>9.1f} ops/s")
+
+            # --- JSON IO ---
+            def json_roundtrip():
+                with open(user_profile_path, "w", encoding="utf-8") as f:
+                    json.dump(user_profile, f, indent=4)
+                with open(user_profile_path, "r", encoding="utf-8") as f:
+                    json.load(f)
+            record("json_io", json_roundtrip)
+
+            # --- Prompt construction against the stub client ---
+            client = StubClient()
+            keywords = ["python", "sql"]
+            get_achievement_index(user_profile)  # Built once per profile, like the app
+            record("prompt_work_experience", lambda: _build_work_experience(session_path, user_profile, ideal_profile, job_posting, client, "stub", {}, keywords))
+            print(f"  {'':<24} {client.completions.prompt_chars // (iterations + 1):,} prompt chars per work experience call")
+            record("prompt_skills", lambda: _build_skills(session_path, user_profile, ideal_profile, client, "stub", {}))
+            work_experience = GeneratedResume.model_validate(_StubCompletions.CANNED[GeneratedResume]).work_experience
+            record("prompt_summary", lambda: _build_summary(session_path, work_experience, [], ideal_profile, client, "stub", {}))
+
+            # --- PDF rendering ---
+            if pdf_generator is not None:
+                final_resume_data = pdf_generator.prepare_final_resume_data(session_path, user_profile_path, pdf_config)
+                record("create_pdf", lambda: pdf_generator._create_pdf_from_data(final_resume_data, session_path, pdf_config, os.path.join(session_path, "tailored_resume.pdf")), max(1, iterations // 4))
+            else:
+                final_resume_data = {**user_profile["personal_info"], **tailored_content}
+
+            # --- ATS text extraction and local scoring ---
+            record("resume_text_build", lambda: build_resume_text(final_resume_data, pdf_config))
+            if os.path.exists(os.path.join(session_path, "tailored_resume.pdf")):
+                record("pdf_text_extraction", lambda: _extract_pdf_text(session_path))
+            record("score_resume_local", lambda: score_resume(session_path, client, "stub", resume_data=final_resume_data))
+
+            # --- Bundle zip/unzip ---
+            zip_path = os.path.join(workdir, "bundle.zip")
+            extract_path = os.path.join(workdir, "extracted")
+
+            def bundle_roundtrip():
+                bundle_files = sorted((name, os.path.join(session_path, name)) for name in os.listdir(session_path)
+                                      if name.endswith((".md", ".json", ".pdf")))
+                with open(zip_path, "wb") as f:
+                    for chunk in iter_zip(bundle_files):
+                        f.write(chunk)
+                with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                    zip_ref.extractall(extract_path)
+            record("bundle_zip_unzip", bundle_roundtrip)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Returns a message for every benchmark whose p50 grew by more than `tolerance` (e.g. 0.25 = 25%)."""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if not previous or previous["p50_ms"] <= 0:
+            continue
+        change = stats["p50_ms"] / previous["p50_ms"] - 1
+        if change > tolerance:
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.2f} ms -> {stats['p50_ms']:.2f} ms (+{change:.0%})")
+    return regressions
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the non-LLM pipeline components on synthetic data.")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated achievement counts per synthetic profile")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per benchmark (PDF rendering uses a quarter)")
+    parser.add_argument("--posting-bullets", type=int, default=30, help="Bullets in each synthetic job posting")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown versus the baseline")
+    args = parser.parse_args()
+
+    print("--- Running Offline Benchmarks ---")
+    results = run_benchmarks([int(size) for size in args.sizes.split(",") if size.strip()], args.iterations, args.posting_bullets)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"\n💾 Results saved to: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        print("\n--- Baseline Comparison ---")
+        if regressions:
+            for message in regressions:
+                print(f"❌ {message}")
+            sys.exit(1)
+        print("✅ No regressions beyond tolerance.")
@@ -0,0 +1,58 @@
+# python tests/session_store_test.py
+
+import os
+import sys
+import tempfile
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.session_store import SessionStore, SessionNotFoundError, shard_name
+from tests._check import check, summary
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Session Store Tests ---")
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        store = SessionStore(base_dir, shard_prefix_length=2)
+
+        new_path = store.create("251017120000_job_analysis_0a1b2c3d")
+        expected = os.path.join(base_dir, shard_name("251017120000_job_analysis_0a1b2c3d", 2), "251017120000_job_analysis_0a1b2c3d")
+        check("Creates new sessions inside their hash-prefix shard", new_path == expected, new_path)
+
+        legacy_path = os.path.join(base_dir, "240101000000_old_session_deadbeef")
+        os.makedirs(legacy_path)
+        with open(os.path.join(legacy_path, "job_posting.md"), "w", encoding="utf-8") as f:
+            f.write("# Legacy posting")
+        check("Resolves sessions left in the flat layout", store.session_path("240101000000_old_session_deadbeef") == legacy_path)
+        check("Reads artifacts from legacy sessions", store.job_posting("240101000000_old_session_deadbeef") == "# Legacy posting")
+
+        ids = sorted(entry.name for entry in store.iter_sessions())
+        check("Enumerates sharded and legacy sessions", ids == ["240101000000_old_session_deadbeef", "251017120000_job_analysis_0a1b2c3d"], ids)
+
+        moved = store.migrate()
+        migrated_path = store.session_path("240101000000_old_session_deadbeef")
+        check("Migrates flat sessions into shards", moved == 1 and not os.path.exists(legacy_path) and os.path.dirname(os.path.dirname(migrated_path)) == base_dir.rstrip(os.sep), migrated_path)
+        check("Keeps session ids and contents stable after migration", store.job_posting("240101000000_old_session_deadbeef") == "# Legacy posting")
+        check("Migration is idempotent", store.migrate() == 0)
+
+        other_legacy_path = os.path.join(base_dir, "240102000000_other_session_feedface")
+        os.makedirs(other_legacy_path)
+        with open(os.path.join(other_legacy_path, "job_posting.md"), "w", encoding="utf-8") as f:
+            f.write("# Other posting")
+        store.job_posting("240102000000_other_session_feedface")  # Caches the flat path
+        SessionStore(base_dir, shard_prefix_length=2).migrate()     # Like `--migrate` run while the server is up
+        check("Follows sessions migrated by another process", store.job_posting("240102000000_other_session_feedface") == "# Other posting"
+              and store.session_path("240102000000_other_session_feedface") != other_legacy_path)
+
+        try:
+            store.session_path("..")
+            rejected = False
+        except SessionNotFoundError:
+            rejected = True
+        check("Rejects path-like session ids", rejected)
+
+    summary()
@@ -0,0 +1,58 @@
+# python tests/session_sweeper_test.py
+
+import os
+import sys
+import tempfile
+import time
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.session_store import SessionStore
+from services.session_sweeper import SessionSweeper
+from tests._check import check, summary
+
+DAY = 86400
+
+
+def make_session(base_dir, session_id, size, age_days):
+    path = os.path.join(base_dir, session_id)
+    os.makedirs(path)
+    with open(os.path.join(path, "job_posting.md"), "wb") as f:
+        f.write(b"x" * size)
+    stamp = time.time() - age_days * DAY
+    os.utime(path, (stamp, stamp))
+
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    print("--- Running Session Sweeper Tests ---")
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        make_session(base_dir, "ancient", 1000, age_days=40)
+        make_session(base_dir, "old", 1000, age_days=5)
+        make_session(base_dir, "older", 1000, age_days=6)
+        make_session(base_dir, "fresh", 1000, age_days=1)
+
+        store = SessionStore(base_dir)
+        sweeper = SessionSweeper(store, max_age_days=30, max_total_mb=2500 / (1024 * 1024), batch_size=1, min_idle_minutes=0)
+        sweeper.touch("older")   # Accessed just now, so it is the most recently used
+
+        removed = sweeper.sweep()
+        remaining = sorted(os.listdir(base_dir))
+        check("Deletes sessions past the age limit", "ancient" in removed, removed)
+        check("Evicts least recently used sessions until under the size quota", removed == ["ancient", "old"], removed)
+        check("Keeps recently accessed sessions", remaining == [".session_index.json", "fresh", "older"], remaining)
+        check("Tracks the remaining total size", sweeper.total_size() == 2000, sweeper.total_size())
+
+        reloaded = SessionSweeper(store, max_age_days=30)
+        check("Persists the last-access index", sorted(reloaded._sessions) == ["fresh", "older"], sorted(reloaded._sessions))
+
+        guarded = SessionSweeper(store, max_age_days=0.5, min_idle_minutes=10)
+        guarded.touch("fresh")
+        removed = guarded.sweep()
+        check("Never deletes sessions used within the idle grace period", removed == [] and "fresh" in os.listdir(base_dir), removed)
+
+    summary()
@@ -0,0 +1,74 @@
+# python tests/url_canonicalizer_test.py
+
+import os
+import sys
+
+# This block adds the project's root directory to Python's search path.
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils import canonicalize_job_url
+
+# --- Test Cases ---
+if __name__ == "__main__":
+    test_cases = [
+        {
+            "name": "Workopolis search URL (delegates to the Workopolis rule)",
+            "input": "https://www.workopolis.com/search?q=mckinsey&job=4yNUscJPyZGwDf829xk0bCSMFkKqkUxD3Cw3",
+            "expected": "https://www.workopolis.com/jobsearch/viewjob/4yNUscJPyZGwDf829xk0bCSMFkKqkUxD3Cw3"
+        },
+        {
+            "name": "LinkedIn slugged view URL with tracking params",
+            "input": "https://WWW.LinkedIn.com/jobs/view/senior-analyst-at-acme-123456789/?trk=public_jobs&refId=abc",
+            "expected": "https://www.linkedin.com/jobs/view/123456789"
+        },
+        {
+            "name": "LinkedIn search URL with currentJobId",
+            "input": "https://www.linkedin.com/jobs/search/?currentJobId=123456789&keywords=python",
+            "expected": "https://www.linkedin.com/jobs/view/123456789"
+        },
+        {
+            "name": "Indeed search URL with vjk job key",
+            "input": "https://ca.indeed.com/jobs?q=python&l=Calgary&vjk=abc123def&utm_source=newsletter",
+            "expected": "https://ca.indeed.com/viewjob?jk=abc123def"
+        },
+        {
+            "name": "Generic URL: host case, default port, fragment, utm params, param order",
+            "input": "https://Careers.Example.com:443//jobs/42/?utm_medium=email&b=2&a=1#apply",
+            "expected": "https://careers.example.com/jobs/42?a=1&b=2"
+        },
+        {
+            "name": "Equivalent generic URLs canonicalize identically",
+            "input": "https://careers.example.com/jobs/42?a=1&b=2&gclid=xyz",
+            "expected": "https://careers.example.com/jobs/42?a=1&b=2"
+        },
+        {
+            "name": "Empty string input",
+            "input": "",
+            "expected": ""
+        }
+    ]
+
+    print("--- Running URL Canonicalizer Tests ---")
+    all_passed = True
+    for i, test in enumerate(test_cases):
+        print(f"\nTest {i+1}: {test['name']}")
+        print(f"  Input:    {test['input']}")
+
+        actual_output = canonicalize_job_url(test['input'])
+
+        print(f"  Expected: {test['expected']}")
+        print(f"  Actual:   {actual_output}")
+
+        if actual_output == test['expected']:
+            print("  Result:   ✅ PASSED")
+        else:
+            print("  Result:   ❌ FAILED")
+            all_passed = False
+
+    print("\n--- Test Summary ---")
+    if all_passed:
+        print("✅ All tests passed successfully!")
+    else:
+        print("❌ Some tests failed.")
@@ -4,13 +4,16 @@ Shared utility functions for RoboResume
 
 import os
 import re
-import shutil
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
-from urllib.parse import urlparse, parse_qs
-import glob
-import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+# Local imports
+from services.session_store import shard_path
+from services.events import cancel_scope
 
 
 def sanitize_for_path(text: str, max_len: int = 50, style: str = 'descriptive') -> str:
@@ -46,32 +49,12 @@ def create_session_directory(output_base_dir: str, company: str, position: str)
     
     unique_folder_name = f"{datestamp}_{safe_company}_{safe_position}_{os.urandom(4).hex()}"
 
-    session_path = os.path.join(output_base_dir, unique_folder_name)
+    session_path = shard_path(output_base_dir, unique_folder_name)
     os.makedirs(session_path, exist_ok=True)
     print(f"📁 Session directory created: {session_path}")
     return unique_folder_name
 
 
-def cleanup_old_sessions(base_dir: str, days: int = 30) -> None:
-    """Remove sessions older than specified days."""
-    if not os.path.exists(base_dir):
-        return
-        
-    cutoff = datetime.now() - timedelta(days=days)
-    
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path):
-            # Check if directory is older than cutoff
-            dir_time = datetime.fromtimestamp(os.path.getctime(item_path))
-            if dir_time < cutoff:
-                try:
-                    shutil.rmtree(item_path)
-                    print(f"🗑️ Cleaned up old session: {item}")
-                except Exception as e:
-                    print(f"⚠️ Could not remove {item}: {e}")
-
-
 def ensure_directory_exists(directory_path: str) -> None:
     """Ensure a directory exists, create if not."""
     os.makedirs(directory_path, exist_ok=True)
@@ -100,25 +83,122 @@ def transform_workopolis_url(url: str) -> str:
     except Exception:
         return url
 
-def create_session_zip(session_path: str, zip_path: str) -> Optional[str]:
+# --------------------------------------------------------------------------
+# Job URL Canonicalization
+# --------------------------------------------------------------------------
+
+# Query parameters that only track the click source and never change the posting
+TRACKING_QUERY_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "refid", "referer", "referrer", "trk", "trackingid", "tk", "vjs", "lipi",
+}
+
+# Host suffix -> function that maps a parsed-and-cleaned URL to its canonical job URL
+URL_CANONICALIZERS: Dict[str, Callable[[str], str]] = {}
+
+
+def register_url_canonicalizer(host_suffix: str):
+    """Decorator that registers a job-board specific canonicalizer for a host suffix."""
+    def decorator(func: Callable[[str], str]) -> Callable[[str], str]:
+        URL_CANONICALIZERS[host_suffix] = func
+        return func
+    return decorator
+
+
+def canonicalize_job_url(url: str) -> str:
     """
-    Creates a zip archive of the session's important files (.md, .json, .pdf).
+    Normalizes a job posting URL so that equivalent links map to the same string.
+    Lowercases scheme and host, drops default ports, fragments, tracking params and
+    trailing slashes, sorts the remaining query, then applies any job-board rule.
     """
     try:
-        files_to_zip = []
-        for extension in ["*.md", "*.json", "*.pdf"]:
-            files_to_zip.extend(glob.glob(os.path.join(session_path, extension)))
-
-        if not files_to_zip:
-            return None
-
-        with zipfile.ZipFile(zip_path, 'w') as zipf:
-            for file in files_to_zip:
-                # Add file to zip, using just the filename as the archive name
-                zipf.write(file, os.path.basename(file))
-        
-        return zip_path
-    except Exception as e:
-        print(f"Error creating zip file: {e}")
-        return None
+        if not url:
+            return url
+
+        parsed = urlparse(url.strip())
+        if not parsed.netloc:
+            return url
+
+        scheme = (parsed.scheme or "https").lower()
+        host = (parsed.hostname or "").lower()
+        if parsed.port and not ((scheme == "http" and parsed.port == 80) or (scheme == "https" and parsed.port == 443)):
+            host = f"{host}:{parsed.port}"
+
+        query_pairs = [
+            (key, value)
+            for key, values in parse_qs(parsed.query, keep_blank_values=False).items()
+            for value in values
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_QUERY_PARAMS
+        ]
+        path = re.sub(r"/{2,}", "/", parsed.path or "/")
+        if len(path) > 1:
+            path = path.rstrip("/")
+
+        cleaned = urlunparse((scheme, host, path, "", urlencode(sorted(query_pairs)), ""))
+
+        for host_suffix, canonicalizer in URL_CANONICALIZERS.items():
+            bare_host = host.split(":")[0]
+            if bare_host == host_suffix or bare_host.endswith("." + host_suffix):
+                return canonicalizer(cleaned)
+        return cleaned
+
+    except Exception:
+        return url
+
+
+@register_url_canonicalizer("workopolis.com")
+def _canonicalize_workopolis(url: str) -> str:
+    return transform_workopolis_url(url)
+
+
+@register_url_canonicalizer("linkedin.com")
+def _canonicalize_linkedin(url: str) -> str:
+    """Collapses /jobs/view/<slug>-<id> and ?currentJobId=<id> links to /jobs/view/<id>."""
+    parsed = urlparse(url)
+    job_id = parse_qs(parsed.query).get("currentJobId", [None])[0]
+    if not job_id:
+        match = re.search(r"/jobs/view/(?:[^/]*-)?(\d+)$", parsed.path)
+        job_id = match.group(1) if match else None
+    if job_id:
+        return f"https://www.linkedin.com/jobs/view/{job_id}"
+    return url
+
+
+@register_url_canonicalizer("indeed.com")
+def _canonicalize_indeed(url: str) -> str:
+    """Collapses Indeed search/rc links carrying a job key to the viewjob page."""
+    parsed = urlparse(url)
+    query_params = parse_qs(parsed.query)
+    job_key = (query_params.get("jk") or query_params.get("vjk") or [None])[0]
+    if job_key:
+        return f"{parsed.scheme}://{parsed.netloc}/viewjob?jk={job_key}"
+    return url
 
+
+def run_concurrently(*steps: Callable[[], Any]) -> Tuple[Any, ...]:
+    """
+    Runs independent pipeline steps on worker threads and returns their results in order.
+
+    The first failure is re-raised immediately. Steps that are still running cannot be
+    interrupted mid-call (an LLM request in flight completes), but they are marked as
+    cancelled: their next `checkpoint` (a stage start, a streamed partial, or just before
+    an output is written) raises StepCancelled, so they never write results after the
+    error has been raised. Their results are discarded.
+    """
+    cancel_event = threading.Event()
+
+    def run_step(step: Callable[[], Any]) -> Any:
+        with cancel_scope(cancel_event):
+            return step()
+
+    executor = ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="pipeline-step")
+    try:
+        futures = [executor.submit(run_step, step) for step in steps]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            if future in done and future.exception() is not None:
+                cancel_event.set()
+                raise future.exception()
+        return tuple(future.result() for future in futures)
+    finally:
+        executor.shutdown(wait=False)